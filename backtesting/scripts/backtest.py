@@ -10,6 +10,9 @@ Usage:
     
     # Phase 3: Grade results
     python backtest.py --grade --run-id latest
+
+    # Re-run forecasts from recorded LLM responses (no API spend)
+    python backtest.py --run --config baseline --llm-cache replay
 """
 import argparse
 import asyncio
@@ -43,6 +46,14 @@ from cache import (
 from news import exa_search_raw
 from grading import grade_forecast, calculate_aggregate_scores, generate_report
 from config import RESEARCH_MODEL, FORECAST_MODEL
+from llm_clients import close_llm_clients
+from exa_client import close_exa_client, get_exa_cost_stats
+from exa_cache import get_exa_cache_stats
+from cost_ledger import close_cost_ledger, summarize_costs
+from llm_hedging import get_hedging_stats
+from tools.executor import get_tool_stats, shutdown_tool_pools
+from tools.result_cache import get_tool_cache_stats
+from llm_cache import CACHE_MODES, set_cache_mode, get_cache_stats
 
 
 RUNS_DIR = Path(__file__).resolve().parent.parent / "data" / "runs"
@@ -172,17 +183,13 @@ async def collect_backtest_data(
     sampled = sample_balanced_by_type(all_questions, n_questions)
     print(f"[Backtest] Sampled {len(sampled)} questions balanced by type")
     
-    collected = []
-    
-    for i, post in enumerate(sampled):
+    async def collect_one(i: int, post: dict) -> dict:
         question = extract_question_for_backtest(post)
         question_id = question["question_id"]
         
         if skip_cached and is_cached(question_id):
             print(f"[{i+1}/{len(sampled)}] Skipping cached: {question['title'][:50]}...")
-            cached = load_search_cache(question_id)
-            collected.append(cached)
-            continue
+            return load_search_cache(question_id)
         
         print(f"[{i+1}/{len(sampled)}] Collecting: {question['title'][:50]}...")
         
@@ -199,7 +206,7 @@ async def collect_backtest_data(
         
         # Run search with date filter
         try:
-            search_results = exa_search_raw(
+            search_results = await exa_search_raw(
                 query=question["title"],
                 num_results=10,
                 end_published_date=search_cutoff
@@ -225,14 +232,14 @@ async def collect_backtest_data(
             }
         )
         
-        collected.append({
+        return {
             "question_id": question_id,
             "search_results": search_results,
             "metadata": question
-        })
-        
-        # Brief pause to avoid rate limits
-        await asyncio.sleep(0.5)
+        }
+    
+    # Searches overlap; exa_client caps how many are in flight and retries 429s
+    collected = list(await asyncio.gather(*[collect_one(i, post) for i, post in enumerate(sampled)]))
     
     print(f"[Backtest] Collected data for {len(collected)} questions")
     return collected
@@ -606,20 +613,48 @@ async def main():
     parser.add_argument("--run-name", type=str, default="backtest_1", help="Name for the run folder")
     parser.add_argument("--forecast-model", type=str, help="Override forecasting model")
     parser.add_argument("--research-model", type=str, help="Override research model")
+    parser.add_argument(
+        "--llm-cache",
+        choices=CACHE_MODES,
+        help="LLM response cache mode (default: config.LLM_CACHE_MODE). "
+             "Use 'record' once, then 'replay' to iterate on CDF/extraction code for free."
+    )
     
     args = parser.parse_args()
+
+    if args.llm_cache:
+        set_cache_mode(args.llm_cache)
     
     if args.collect:
-        await collect_backtest_data(args.tournament, args.limit)
+        try:
+            await collect_backtest_data(args.tournament, args.limit)
+        finally:
+            await close_exa_client()
+            print(f"[Backtest] Exa usage: {get_exa_cost_stats()}")
+            print(f"[Backtest] Exa search cache: {get_exa_cache_stats()}")
     
     elif args.run:
-        await run_backtest(
-            config_name=args.config, 
-            limit=args.limit, 
-            run_name=args.run_name,
-            forecast_model=args.forecast_model,
-            research_model=args.research_model
-        )
+        try:
+            await run_backtest(
+                config_name=args.config, 
+                limit=args.limit, 
+                run_name=args.run_name,
+                forecast_model=args.forecast_model,
+                research_model=args.research_model
+            )
+        finally:
+            shutdown_tool_pools()
+            await close_cost_ledger()
+            await close_llm_clients()
+            await close_exa_client()
+            print(f"[Backtest] LLM cache: {get_cache_stats()}")
+            costs = summarize_costs()
+            print(f"[Backtest] LLM cost: ${costs['total_cost']:.4f} over {costs['calls']} calls")
+            print(f"[Backtest] Hedging/fallback stats: {get_hedging_stats()['counts']}")
+            print(f"[Backtest] Tool execution stats: {get_tool_stats()}")
+            print(f"[Backtest] Tool result cache: {get_tool_cache_stats()}")
+            print(f"[Backtest] Exa usage: {get_exa_cost_stats()}")
+            print(f"[Backtest] Exa search cache: {get_exa_cache_stats()}")
     
     elif args.grade:
         grade_backtest_run(args.run_id, run_name=args.run_name)
@@ -0,0 +1,189 @@
+"""
+Benchmark CDF fitting methods on real forecasts.
+
+Replays every "Extracted Percentile_values" set found in the numeric forecasts
+of backtesting/data/runs/*/results/*.json through generate_continuous_cdf with
+each fit method, and reports time per CDF, how far the final CDF lands from
+the forecast percentiles, and how often the fit gave up and fell back to
+interpolation. A second table compares one generate_continuous_cdfs call per
+question (all of its samples batched) with a generate_continuous_cdf call per
+sample.
+
+Usage:
+    python backtesting/scripts/bench_cdf_fit.py
+    python backtesting/scripts/bench_cdf_fit.py --repeat 20
+"""
+import argparse
+import ast
+import copy
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add root and src to sys.path
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+sys.path.append(str(ROOT_DIR / "src"))
+os.environ.setdefault("OPENROUTER_API_KEY", "unused")
+
+import cdf_fitting
+from forecasting import generate_continuous_cdf, generate_continuous_cdfs, generate_cdf_locations
+
+RUNS_DIR = Path(__file__).resolve().parent.parent / "data" / "runs"
+PERCENTILES_PATTERN = re.compile(r"Extracted Percentile_values: (\{[^}]*\})")
+
+
+def load_cases() -> list[dict]:
+    """(percentile_values, scaling) for every numeric sample in the stored runs."""
+    cases = []
+    for path in sorted(RUNS_DIR.glob("*/results/*.json")):
+        if path.name.endswith(".grades.json"):
+            continue
+        with open(path) as f:
+            run = json.load(f)
+        for forecast in run.get("forecasts", []):
+            details = forecast.get("question_details") or {}
+            scaling = details.get("scaling") or {}
+            if forecast.get("question_type") != "numeric" or scaling.get("range_min") is None:
+                continue
+            for match in PERCENTILES_PATTERN.findall(forecast.get("comment_preview") or ""):
+                try:
+                    percentile_values = ast.literal_eval(match)
+                except (ValueError, SyntaxError):
+                    continue
+                if not percentile_values:
+                    continue
+                cases.append({
+                    "question_id": forecast.get("question_id"),
+                    "percentile_values": percentile_values,
+                    "open_upper_bound": details.get("open_upper_bound", True),
+                    "open_lower_bound": details.get("open_lower_bound", True),
+                    "upper_bound": scaling["range_max"],
+                    "lower_bound": scaling["range_min"],
+                    "zero_point": scaling.get("zero_point"),
+                })
+    return cases
+
+
+def fit_error(case: dict, cdf: list[float]) -> float:
+    """Largest |CDF(value) - percentile| over the forecast percentiles inside the range."""
+    xaxis = generate_cdf_locations(case["lower_bound"], case["upper_bound"], case["zero_point"])
+    errors = [
+        abs(np.interp(value, xaxis, cdf) - float(percentile) / 100)
+        for percentile, value in case["percentile_values"].items()
+        if case["lower_bound"] < value < case["upper_bound"] and 0 < float(percentile) < 100
+    ]
+    return max(errors) if errors else 0.0
+
+
+def bench(method: str, cases: list[dict], repeat: int) -> dict:
+    fallbacks = 0
+    interpolate = cdf_fitting.interpolate_cdf
+
+    def counting_interpolate(*args, **kwargs):
+        nonlocal fallbacks
+        fallbacks += 1
+        return interpolate(*args, **kwargs)
+
+    times, errors = [], []
+    cdf_fitting.interpolate_cdf = counting_interpolate
+    try:
+        for case in cases:
+            args = (
+                "numeric", case["open_upper_bound"], case["open_lower_bound"],
+                case["upper_bound"], case["lower_bound"], case["zero_point"],
+            )
+            start = time.perf_counter()
+            for _ in range(repeat):
+                cdf = generate_continuous_cdf(copy.deepcopy(case["percentile_values"]), *args, fit_method=method)
+            times.append((time.perf_counter() - start) / repeat)
+            errors.append(fit_error(case, cdf))
+    finally:
+        cdf_fitting.interpolate_cdf = interpolate
+
+    return {
+        "method": method,
+        "mean_ms": 1000 * float(np.mean(times)),
+        "p95_ms": 1000 * float(np.percentile(times, 95)),
+        "median_error": float(np.median(errors)),
+        "mean_error": float(np.mean(errors)),
+        "p95_error": float(np.percentile(errors, 95)),
+        "max_error": float(np.max(errors)),
+        "fallback_rate": fallbacks / (len(cases) * repeat),
+    }
+
+
+def bench_batched(method: str, cases: list[dict], repeat: int) -> dict:
+    """Seconds per sample when each question's samples are fit one by one vs batched."""
+    by_question: dict = {}
+    for case in cases:
+        key = (case["question_id"], case["upper_bound"], case["lower_bound"], case["zero_point"],
+               case["open_upper_bound"], case["open_lower_bound"])
+        by_question.setdefault(key, []).append(case)
+
+    single = batched = 0.0
+    max_diff = 0.0
+    for group in by_question.values():
+        first = group[0]
+        args = (
+            "numeric", first["open_upper_bound"], first["open_lower_bound"],
+            first["upper_bound"], first["lower_bound"], first["zero_point"],
+        )
+        start = time.perf_counter()
+        for _ in range(repeat):
+            one_by_one = [
+                generate_continuous_cdf(copy.deepcopy(case["percentile_values"]), *args, fit_method=method)
+                for case in group
+            ]
+        single += time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeat):
+            together = generate_continuous_cdfs(
+                [copy.deepcopy(case["percentile_values"]) for case in group], *args, fit_method=method
+            )
+        batched += time.perf_counter() - start
+        max_diff = max(max_diff, float(np.max(np.abs(together - np.array(one_by_one)))))
+
+    samples = len(cases) * repeat
+    return {
+        "method": method,
+        "questions": len(by_question),
+        "single_ms": 1000 * single / samples,
+        "batched_ms": 1000 * batched / samples,
+        "max_diff": max_diff,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CDF fit methods on stored backtest forecasts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per forecast")
+    parser.add_argument("--methods", nargs="+", default=list(cdf_fitting.FIT_METHODS))
+    args = parser.parse_args()
+
+    cases = load_cases()
+    questions = len({case["question_id"] for case in cases})
+    print(f"Loaded {len(cases)} numeric percentile sets from {questions} questions\n")
+
+    print(f"{'method':<10} {'mean ms':>9} {'p95 ms':>9} {'med err':>9} {'mean err':>9} {'p95 err':>9} {'max err':>9} {'fallback':>9}")
+    for method in args.methods:
+        r = bench(method, cases, args.repeat)
+        print(
+            f"{r['method']:<10} {r['mean_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['median_error']:>9.4f} {r['mean_error']:>9.4f} "
+            f"{r['p95_error']:>9.4f} {r['max_error']:>9.4f} {r['fallback_rate']:>8.1%}"
+        )
+
+    print(f"\n{'method':<10} {'questions':>9} {'single ms':>10} {'batch ms':>10} {'max diff':>10}  (per sample)")
+    for method in args.methods:
+        r = bench_batched(method, cases, args.repeat)
+        print(
+            f"{r['method']:<10} {r['questions']:>9} {r['single_ms']:>10.3f} {r['batched_ms']:>10.3f} {r['max_diff']:>10.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import json
-import math
 import sys
 from pathlib import Path
 
@@ -8,6 +7,8 @@ ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(ROOT_DIR))
 sys.path.append(str(ROOT_DIR / "src"))
 
+from question_grid import GRID_POINTS, question_grid
+
 results_dir = Path(__file__).resolve().parent.parent / "data" / "results"
 grades_path = results_dir / 'run_20260105_192050_honest_50_fixed_dates.grades.json'
 run_path = results_dir / 'run_20260105_192050_honest_50_fixed_dates.json'
@@ -36,24 +37,24 @@ for g in grades:
         
         if comm_cdf and range_min is not None and range_max is not None:
             res = g['resolution']
-            res_norm = (res - range_min) / (range_max - range_min)
-            print(f"Res Norm: {res_norm}")
-            
-            idx_float = res_norm * 200
-            idx_low = int(math.floor(idx_float))
-            idx_high = int(math.ceil(idx_float))
-            print(f"Indices: {idx_low}, {idx_high}")
-            
-            if 0 <= idx_low < 201 and 0 <= idx_high < 201:
+            grid = question_grid(range_min, range_max, scaling.get('zero_point'))
+            print(f"Res Position: {grid.position_of(res)}")
+
+            if range_min <= res <= range_max and len(comm_cdf) == GRID_POINTS:
+                idx_low = grid.index_of(res)
+                idx_high = min(idx_low + 1, GRID_POINTS - 1)
+                print(f"Indices: {idx_low}, {idx_high}")
+
                 p_low = comm_cdf[idx_low]
                 p_high = comm_cdf[idx_high]
                 print(f"Probs: {p_low}, {p_high}")
                 print(f"Delta P: {p_high - p_low}")
-                
-                delta_x = (idx_high - idx_low) * (range_max - range_min) / 200.0
+
+                delta_x = grid.locations[idx_high] - grid.locations[idx_low]
                 print(f"Delta X: {delta_x}")
                 if delta_x > 0:
                     print(f"Density: {(p_high - p_low) / delta_x}")
+                print(f"Normalized Density: {grid.normalized_density(comm_cdf, res)}")
             else:
                 print("Indices out of range")
         break
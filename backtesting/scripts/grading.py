@@ -18,6 +18,8 @@ ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(ROOT_DIR))
 sys.path.append(str(ROOT_DIR / "src"))
 
+from question_grid import question_grid
+
 # Minimum PDF value (sharper floor for 200 bins)
 MIN_PDF = 0.0001
 
@@ -184,33 +186,11 @@ def generate_naive_cdf(n_points: int = 201, tail_prob: float = 0.05) -> list[flo
     return [tail_prob + (1 - 2 * tail_prob) * i / (n_points - 1) for i in range(n_points)]
 
 
-def get_normalized_density(cdf: list[float], resolution: float, range_min: float, range_max: float) -> float:
-    """Estimate normalized PDF density (0-1 space) at resolution point from 201-point CDF."""
-    if not cdf or len(cdf) != 201 or resolution is None:
-        return 0.0
-    if range_max <= range_min:
-        return 0.0
-
-    # Normalize resolution to [0, 1]
-    res_norm = (resolution - range_min) / (range_max - range_min)
-    res_norm = max(0.0, min(1.0, res_norm))
-
-    # Grid index (0 to 200)
-    idx = res_norm * 200
-    i = int(round(idx))
-    
-    # Use a small window for stability (3 points)
-    low = max(0, i - 1)
-    high = min(200, i + 1)
-    if high == low: return 0.0
-    
-    dp = cdf[high] - cdf[low]
-    # Corresponding range in unit-less normalized space
-    dx_norm = (high - low) / 200.0
-    
-    # Normalized density (PDF height in unit-range space)
-    # Uniform distribution = 1.0, Max = 200.0
-    return dp / dx_norm if dx_norm > 0 else 0.0
+def get_normalized_density(
+    cdf: list[float], resolution: float, range_min: float, range_max: float, zero_point: float = None
+) -> float:
+    """Estimate normalized PDF density (0-1 grid space) at resolution point from 201-point CDF."""
+    return question_grid(range_min, range_max, zero_point).normalized_density(cdf, resolution)
 
 
 # ========================= GRADING FUNCTIONS =========================
@@ -263,15 +243,9 @@ def grade_multiple_choice_forecast(forecast: dict, resolution: str, community_fo
     return result
 
 
-def get_resolution_idx(resolution: float, range_min: float, range_max: float) -> int:
-    """Calculate resolution index for a continuous question."""
-    if resolution <= range_min:
-        return 0
-    elif resolution >= range_max:
-        return 200
-    else:
-        step = (range_max - range_min) / 200
-        return min(200, max(0, int((resolution - range_min) / step)))
+def get_resolution_idx(resolution: float, range_min: float, range_max: float, zero_point: float = None) -> int:
+    """Calculate resolution index for a continuous question (log-scaled grid when zero_point is set)."""
+    return question_grid(range_min, range_max, zero_point).index_of(resolution)
 
 
 def grade_numeric_forecast(
@@ -279,13 +253,14 @@ def grade_numeric_forecast(
     resolution: float,
     range_min: float,
     range_max: float,
-    community_cdf: list[float] = None
+    community_cdf: list[float] = None,
+    zero_point: float = None,
 ) -> dict:
     """Grade a numeric/continuous forecast with all score types."""
     if not cdf or len(cdf) != 201:
         return {"error": f"Invalid CDF length: {len(cdf) if cdf else 0}"}
     
-    resolution_idx = get_resolution_idx(resolution, range_min, range_max)
+    resolution_idx = get_resolution_idx(resolution, range_min, range_max, zero_point)
     
     # CRPS and baselines
     forecast_crps = calculate_crps(cdf, resolution_idx)
@@ -296,7 +271,7 @@ def grade_numeric_forecast(
     skill_score = 1 - (forecast_crps / baseline_crps) if baseline_crps > 0 else 0
     
     # Calculate normalized densities for table reporting (not used directly for Peer score math, but helpful)
-    our_norm_den = get_normalized_density(cdf, resolution, range_min, range_max)
+    our_norm_den = get_normalized_density(cdf, resolution, range_min, range_max, zero_point)
     
     result = {
         "question_type": "numeric",
@@ -312,7 +287,7 @@ def grade_numeric_forecast(
     }
     
     if community_cdf and len(community_cdf) == 201:
-        comm_norm_den = get_normalized_density(community_cdf, resolution, range_min, range_max)
+        comm_norm_den = get_normalized_density(community_cdf, resolution, range_min, range_max, zero_point)
         result["community_forecast"] = community_cdf
         result["community_density_norm"] = comm_norm_den
         result["peer_score"] = peer_score_continuous(cdf, community_cdf, resolution_idx)
@@ -366,7 +341,8 @@ def grade_forecast(
             resolution_value,
             scaling.get("range_min", 0),
             scaling.get("range_max", 100),
-            community
+            community,
+            scaling.get("zero_point"),
         )
     
     elif question_type == "multiple_choice":
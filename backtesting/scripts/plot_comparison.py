@@ -89,7 +89,8 @@ def main():
             title=f"Comparison: {fc.get('title', 'Question')[:60]}...",
             save_path=plot_path,
             community_cdf=comm_cdf,
-            extra_cdfs=extra_cdfs
+            extra_cdfs=extra_cdfs,
+            zero_point=scaling.get("zero_point"),
         )
         num_plotted += 1
         print(f"  [{num_plotted}/17] Plotted QID {qid}")
@@ -69,7 +69,8 @@ for i, g in enumerate(num_grades, 1):
             range_max=range_max,
             title=f"Q{i}: {title[:30]}...",
             save_path=save_path,
-            community_cdf=comm if (comm and len(comm) == 201) else None
+            community_cdf=comm if (comm and len(comm) == 201) else None,
+            zero_point=scaling.get('zero_point'),
         )
     except Exception as e:
         print(f"Error plotting {i}: {e}")
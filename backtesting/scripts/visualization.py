@@ -7,9 +7,17 @@ Generates:
 - Summary statistics
 """
 import json
+import sys
 from pathlib import Path
 from typing import Optional
 
+# Add root and src to sys.path
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+sys.path.append(str(ROOT_DIR / "src"))
+
+from question_grid import question_grid
+
 try:
     import matplotlib.pyplot as plt
     import matplotlib
@@ -68,7 +76,8 @@ def plot_pdf(
     title: str = "Probability Density",
     save_path: Optional[Path] = None,
     community_cdf: list[float] = None,
-    extra_cdfs: dict[str, list[float]] = None # label -> cdf
+    extra_cdfs: dict[str, list[float]] = None, # label -> cdf
+    zero_point: float = None,
 ) -> Optional[Path]:
     """
     Plot a PDF (probability density) with the resolution point marked.
@@ -82,6 +91,7 @@ def plot_pdf(
         title: Plot title
         save_path: Where to save the plot
         community_cdf: Optional community CDF for comparison
+        zero_point: Question zero_point (log-scaled grid) if any
     
     Returns:
         Path to saved plot, or None if matplotlib unavailable
@@ -98,7 +108,8 @@ def plot_pdf(
     
     # Interpolate to 1000 points for smoother plotting
     import numpy as np
-    x_201 = np.linspace(range_min, range_max, 201)
+    grid = question_grid(range_min, range_max, zero_point)
+    x_201 = grid.locations
     x_1000 = np.linspace(range_min, range_max, 1000)
     our_pdf_interp = np.interp(x_1000, x_201, our_pdf)
     
@@ -126,7 +137,7 @@ def plot_pdf(
     ax.axvline(x=resolution, color='red', linestyle='--', linewidth=2.5, label=f'Resolution: {resolution:.4g}')
     
     # Find density at resolution point and mark it
-    res_idx = min(200, max(0, int((resolution - range_min) / (range_max - range_min) * 200)))
+    res_idx = grid.index_of(resolution)
     our_density_at_res = our_pdf[res_idx]
     ax.scatter([resolution], [our_density_at_res], color='red', s=150, zorder=5, edgecolors='black', linewidths=1)
     ax.annotate(f'Density = {our_density_at_res:.3f}', 
@@ -161,10 +172,11 @@ def plot_cdf(
     range_max: float,
     title: str = "CDF Visualization",
     save_path: Optional[Path] = None,
-    community_cdf: list[float] = None
+    community_cdf: list[float] = None,
+    zero_point: float = None,
 ) -> Optional[Path]:
     """Alias for plot_pdf - now plots density instead of CDF."""
-    return plot_pdf(cdf, resolution, range_min, range_max, title, save_path, community_cdf)
+    return plot_pdf(cdf, resolution, range_min, range_max, title, save_path, community_cdf, zero_point=zero_point)
 
 
 def plot_score_comparison(grades: list[dict], save_path: Optional[Path] = None) -> Optional[Path]:
@@ -419,7 +431,8 @@ def generate_all_plots(grades: list[dict], forecasts: list[dict] = None, plots_d
                 range_max=scaling.get("range_max", 100),
                 title=fc.get("title", "Numeric Question")[:60] + "...",
                 save_path=plot_path,
-                community_cdf=comm_cdf
+                community_cdf=comm_cdf,
+                zero_point=scaling.get("zero_point"),
             )
             
             if result:
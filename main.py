@@ -33,10 +33,10 @@ from config import (
     ACTIVE_TOURNAMENTS,
 )
 from metaculus_api import (
-    get_open_question_ids_from_tournament,
-    get_post_details,
-    post_question_prediction,
-    post_question_comment,
+    get_open_question_ids_from_tournament_async,
+    get_open_questions_from_tournament,
+    get_post_async,
+    post_store,
     create_forecast_payload,
     forecast_is_already_made,
 )
@@ -45,6 +45,18 @@ from forecasting import (
     get_numeric_gpt_prediction,
     get_multiple_choice_gpt_prediction,
 )
+from llm_clients import close_llm_clients
+from exa_client import close_exa_client, get_exa_cost_stats
+from metaculus_client import close_metaculus_client, get_metaculus_client_stats
+from submission_queue import submit_forecast, submit_comment, close_submission_queue, get_submission_stats
+from exa_cache import get_exa_cache_stats, prune_exa_cache
+from llm_scheduler import question_scope
+from checkpoints import QuestionCheckpoint, checkpoint_scope, prune_checkpoints
+from question_scheduler import schedule_questions
+from llm_hedging import get_hedging_stats
+from tools.executor import get_tool_stats, shutdown_tool_pools
+from tools.result_cache import get_tool_cache_stats
+from cost_ledger import flush_cost_ledger, close_cost_ledger, get_ledger_entries, summarize_costs
 
 
 def save_question_record(tournament_id: str, result: dict, forecast: any, comment: str) -> None:
@@ -110,7 +122,7 @@ async def forecast_individual_question(
     """
     Forecast a single question and optionally submit to Metaculus.
     """
-    post_details = get_post_details(post_id)
+    post_details = await get_post_async(post_id)
     question_details = post_details["question"]
     title = question_details["title"]
     question_type = question_details["type"]
@@ -131,32 +143,46 @@ async def forecast_individual_question(
         options = question_details["options"]
         summary_of_forecast += f"options: {options}\n"
 
+    # Stage outputs from an earlier, interrupted run of this question (see checkpoints.py)
+    checkpoint = QuestionCheckpoint(post_id, question_details)
+    resuming = checkpoint.has_pending_work()
+
     if (
         forecast_is_already_made(post_details)
         and skip_previously_forecasted_questions
+        and not resuming
     ):
         summary_of_forecast += f"Skipped: Forecast already made\n"
         result["status"] = "Skipped (Already Made)"
         return result
 
-    if question_type == "binary":
-        forecast, comment, trace = await get_binary_gpt_prediction(
-            question_details, num_runs_per_question
-        )
-    elif question_type == "numeric" or question_type == "date":
-        # Numeric and Date questions use the same handler now
-        forecast, comment, trace = await get_numeric_gpt_prediction(
-            question_details, num_runs_per_question
-        )
-        if trace.get("exa_cost", 0) > 0:
-            summary_of_forecast += f"Exa Cost: ${trace['exa_cost']:.4f}\n"
-            
-    elif question_type == "multiple_choice":
-        forecast, comment, trace = await get_multiple_choice_gpt_prediction(
-            question_details, num_runs_per_question
-        )
-    else:
-        raise ValueError(f"Unknown question type: {question_type}")
+    if resuming:
+        print(f"[Checkpoint] Post {post_id}: resuming after {checkpoint.completed_stages()}")
+
+    async def predict() -> list:
+        if question_type == "binary":
+            return list(await get_binary_gpt_prediction(
+                question_details, num_runs_per_question
+            ))
+        elif question_type == "numeric" or question_type == "date":
+            # Numeric and Date questions use the same handler now
+            return list(await get_numeric_gpt_prediction(
+                question_details, num_runs_per_question
+            ))
+        elif question_type == "multiple_choice":
+            return list(await get_multiple_choice_gpt_prediction(
+                question_details, num_runs_per_question
+            ))
+        else:
+            raise ValueError(f"Unknown question type: {question_type}")
+
+    # Rank this question's LLM calls by start order so earlier questions
+    # finish end to end instead of every question's research going first
+    with question_scope(label=str(post_id)), checkpoint_scope(checkpoint):
+        forecast, comment, trace = await checkpoint.run("forecast", predict)
+
+    if question_type in ("numeric", "date") and trace.get("exa_cost", 0) > 0:
+        summary_of_forecast += f"Exa Cost: ${trace['exa_cost']:.4f}\n"
 
     result["trace"] = trace
 
@@ -170,9 +196,20 @@ async def forecast_individual_question(
         summary_of_forecast += f"Forecast: {forecast}\n"
 
     if submit_prediction:
-        forecast_payload = create_forecast_payload(forecast, question_type)
-        post_question_prediction(question_id, forecast_payload)
-        post_question_comment(post_id, comment)
+        # Both go through batched/concurrent queues shared by every question
+        # (see submission_queue.py) and return once posted
+        async def submit() -> bool:
+            forecast_payload = create_forecast_payload(forecast, question_type)
+            await submit_forecast(question_id, forecast_payload)
+            return True
+
+        async def post_comment() -> bool:
+            await submit_comment(post_id, comment)
+            return True
+
+        # Saved separately so a failed comment does not resubmit the forecast
+        await checkpoint.run("submit", submit)
+        await checkpoint.run("comment", post_comment)
         summary_of_forecast += "Posted: Forecast was posted to Metaculus.\n"
         result["status"] = "Forecasted & Posted"
     else:
@@ -183,6 +220,9 @@ async def forecast_individual_question(
         save_question_record(tournament_id, result, forecast, comment)
     except Exception as e:
         print(f"Error saving local record for {title}: {e}")
+    else:
+        # Every stage is done; the tombstone stops any later resume
+        checkpoint.complete()
 
     result["forecast"] = str(forecast)[:100] + "..." if len(str(forecast)) > 100 else str(forecast)
     return result
@@ -233,6 +273,7 @@ async def forecast_questions(
         # We still want to write the summary even if some failed
         # raise RuntimeError(error_message)
 
+    await flush_cost_ledger()
     generate_github_summary(forecast_summaries, open_question_id_post_id, logs_dir)
 
 
@@ -244,6 +285,8 @@ def generate_github_summary(results: list, question_info: list, logs_dir: Path)
     forecasted = sum(1 for res in results if not isinstance(res, Exception) and "Forecasted" in res["status"])
     skipped = sum(1 for res in results if not isinstance(res, Exception) and "Skipped" in res["status"])
     errors = sum(1 for res in results if isinstance(res, Exception))
+    # Call flush_cost_ledger() first so background stats collection has finished
+    costs = summarize_costs()
 
     summary_lines = [
         "## 🤖 Metaculus Bot Run Summary",
@@ -254,11 +297,12 @@ def generate_github_summary(results: list, question_info: list, logs_dir: Path)
         f"| **New Forecasts Made** | {forecasted} ✅ |",
         f"| **Sorted/Skipped** | {skipped} ⏭️ |",
         f"| **Errors Encountered** | {errors} {'❌' if errors > 0 else '✅'} |",
+        f"| **LLM Cost** | ${costs['total_cost']:.4f} ({costs['calls']} calls) |",
         "",
         "### Detailed Results",
         "",
-        "| Question | Type | Status | Forecast Preview |",
-        "| :--- | :--- | :--- | :--- |",
+        "| Question | Type | Status | Forecast Preview | Cost |",
+        "| :--- | :--- | :--- | :--- | :--- |",
     ]
 
     for info, res in zip(question_info, results):
@@ -273,7 +317,23 @@ def generate_github_summary(results: list, question_info: list, logs_dir: Path)
             status = res["status"]
             forecast = f"`{res['forecast']}`"
 
-        summary_lines.append(f"| [{title}]({url}) | {info[1] if isinstance(res, Exception) else res['type']} | {status} | {forecast} |")
+        question_cost = summarize_costs(get_ledger_entries(question=str(info[1])))["total_cost"]
+        summary_lines.append(f"| [{title}]({url}) | {info[1] if isinstance(res, Exception) else res['type']} | {status} | {forecast} | ${question_cost:.4f} |")
+
+    if costs["by_model"]:
+        summary_lines += [
+            "",
+            "### LLM Cost by Model",
+            "",
+            "| Model | Calls | Tokens | Cost |",
+            "| :--- | :--- | :--- | :--- |",
+        ]
+        for model, model_costs in sorted(costs["by_model"].items()):
+            summary_lines.append(
+                f"| {model} | {model_costs['calls']} | {model_costs['tokens']:,} | ${model_costs['total_cost']:.4f} |"
+            )
+        if costs["pending"] or costs["failed"]:
+            summary_lines.append(f"\n_{costs['pending']} pending and {costs['failed']} failed stat lookups not included._")
 
     with open(logs_dir / "summary.md", "w", encoding="utf-8") as f:
         f.write("\n".join(summary_lines))
@@ -283,6 +343,9 @@ def generate_github_summary(results: list, question_info: list, logs_dir: Path)
     
     with open(logs_dir / "error_count.txt", "w", encoding="utf-8") as f:
         f.write(str(errors))
+
+    with open(logs_dir / "cost_ledger.json", "w", encoding="utf-8") as f:
+        json.dump(get_ledger_entries(), f, indent=2, default=str)
         
     print(f"\nWritten summary to {logs_dir / 'summary.md'}")
     print(f"Forecasts: {forecasted}, Errors: {errors}, Skipped: {skipped}")
@@ -310,12 +373,13 @@ async def run_bot(args, logs_dir):
         
         for tournament_id in ACTIVE_TOURNAMENTS:
             print(f"Checking tournament: {tournament_id}")
-            tournament_questions = get_open_question_ids_from_tournament(tournament_id=tournament_id)
+            tournament_questions = await get_open_question_ids_from_tournament_async(tournament_id=tournament_id)
             
             if SKIP_PREVIOUSLY_FORECASTED_QUESTIONS:
                 needs_forecast_count = 0
                 for question_id, post_id, title in tournament_questions:
-                    post_details = get_post_details(post_id)
+                    # Served from the listing above unless a field is missing
+                    post_details = await get_post_async(post_id)
                     if not forecast_is_already_made(post_details):
                         needs_forecast_count += 1
                 total_needs_forecast += needs_forecast_count
@@ -356,46 +420,37 @@ async def run_bot(args, logs_dir):
              all_forecast_summaries.extend(results)
              all_question_info.extend([(qid, pid, "Example") for qid, pid in EXAMPLE_QUESTIONS])
         else:
+            print(f"\n{'='*20} Processing Tournaments: {ACTIVE_TOURNAMENTS} {'='*20}")
             for tournament_id in ACTIVE_TOURNAMENTS:
-                print(f"\n{'='*20} Processing Tournament: {tournament_id} {'='*20}")
-                
                 # Ensure the tournament directory exists early, even if no forecasts are made
                 tournament_dir = ROOT_DIR / str(tournament_id)
                 tournament_dir.mkdir(exist_ok=True)
-                
-                # Fetch questions for this specific tournament
-                tournament_questions = get_open_question_ids_from_tournament(tournament_id=tournament_id)
-                print(f"Found {len(tournament_questions)} open questions in {tournament_id}")
-                
-                if not tournament_questions:
-                    continue
-
-                # Run forecasting for this tournament
-                forecast_tasks = [
-                    forecast_individual_question(
-                        qid,
-                        pid,
-                        SUBMIT_PREDICTION,
-                        NUM_RUNS_PER_QUESTION,
-                        SKIP_PREVIOUSLY_FORECASTED_QUESTIONS,
-                        tournament_id=tournament_id,
-                    )
-                    for qid, pid, title in tournament_questions
-                ]
-                
-                results = await asyncio.gather(*forecast_tasks, return_exceptions=True)
-                
-                # Print results for this tournament
-                for qinfo, res in zip(tournament_questions, results):
-                    if isinstance(res, Exception):
-                        print(f"Error in {qinfo[0]}: {res}")
-                    else:
-                        print(f"Status for {res['title']}: {res['status']}")
-
-                all_forecast_summaries.extend(results)
-                all_question_info.extend(tournament_questions)
+
+            # One deadline-ordered queue across tournaments, QUESTION_WORKERS at a time
+            # (see question_scheduler.py); results arrive as questions finish
+            def forecast_scheduled(question):
+                return forecast_individual_question(
+                    question.question_id,
+                    question.post_id,
+                    SUBMIT_PREDICTION,
+                    NUM_RUNS_PER_QUESTION,
+                    SKIP_PREVIOUSLY_FORECASTED_QUESTIONS,
+                    tournament_id=question.tournament_id,
+                )
+
+            async for question, res in schedule_questions(
+                ACTIVE_TOURNAMENTS, get_open_questions_from_tournament, forecast_scheduled
+            ):
+                if isinstance(res, Exception):
+                    print(f"Error in {question.question_id}: {res}")
+                else:
+                    print(f"Status for {res['title']}: {res['status']}")
+
+                all_forecast_summaries.append(res)
+                all_question_info.append((question.question_id, question.post_id, question.title))
 
         print("\n", "#" * 100, "\nForecast Summaries (All Tournaments)\n", "#" * 100)
+        await flush_cost_ledger()
         # Final output reporting
         should_fail = generate_github_summary(all_forecast_summaries, all_question_info, logs_dir)
         return should_fail
@@ -417,8 +472,27 @@ if __name__ == "__main__":
     logs_dir = ROOT_DIR / "logs"
     logs_dir.mkdir(exist_ok=True)
 
+    async def run_bot_and_close_clients():
+        try:
+            return await run_bot(args, logs_dir)
+        finally:
+            print(f"[Metaculus] Post store: {post_store.stats}, client: {get_metaculus_client_stats()}")
+            await close_submission_queue()
+            print(f"[Metaculus] Submissions: {get_submission_stats()}")
+            print(f"[LLM] Hedging/fallback stats: {get_hedging_stats()['counts']}")
+            print(f"[Tools] Execution stats: {get_tool_stats()}")
+            print(f"[Tools] Result cache: {get_tool_cache_stats()}")
+            print(f"[Exa] Usage: {get_exa_cost_stats()}")
+            print(f"[Exa] Search cache: {get_exa_cache_stats()} ({prune_exa_cache()} expired entries pruned)")
+            print(f"[Checkpoint] Pruned {prune_checkpoints()} stale question checkpoints")
+            shutdown_tool_pools()
+            await close_cost_ledger()
+            await close_llm_clients()
+            await close_exa_client()
+            await close_metaculus_client()
+
     print("Starting BOT")
-    should_fail = asyncio.run(run_bot(args, logs_dir))
+    should_fail = asyncio.run(run_bot_and_close_clients())
     
     if should_fail:
         print("\n❌ FAILURE: No forecasts were posted and errors occurred!")
@@ -0,0 +1,289 @@
+"""
+Fit a continuous distribution through forecast percentiles and evaluate its
+CDF on a question's x-axis.
+
+Methods (config.CDF_FIT_METHOD):
+
+- "metalog": Keelin's metalog, a quantile function that is linear in its
+  coefficients,
+
+      Q(y) = a1 + a2*L + a3*(y-0.5)*L + a4*(y-0.5) + a5*(y-0.5)**2 + ...
+      L = ln(y / (1-y))
+
+  so fitting it to (value, probability) pairs is one least-squares solve
+  (weighted by the local density, so misses count in probability terms).
+  Closed question bounds use the log / logit-bounded variants so no mass
+  falls outside them. The most terms (up to METALOG_MAX_TERMS) that give a
+  monotonic quantile function are used; two terms (a logistic) always do
+  when the data is increasing. The CDF is read off Q on a dense probability
+  grid with np.interp.
+- "skewnorm": Nelder-Mead fit of a skew-normal's CDF (the original method;
+  hundreds of scipy CDF evaluations per fit, and it can fail to converge).
+
+When a fit is not possible the percentiles are interpolated with PCHIP, or
+linearly without scipy. When a forecast is exactly a parametric distribution
+(the get_parametric_cdf tool's), distribution_cdf() evaluates it directly
+instead of fitting. fit_cdfs() takes every run's pairs for a question at
+once and returns one CDF per row; metalog runs that share percentile levels
+are solved together.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from config import CDF_FIT_METHOD, METALOG_MAX_TERMS
+
+try:
+    from scipy.interpolate import PchipInterpolator
+    from scipy.optimize import minimize
+    from scipy.stats import skewnorm
+except ImportError:  # scipy is optional: metalog and linear interpolation need only NumPy
+    PchipInterpolator = minimize = skewnorm = None
+
+FIT_METHODS = ("metalog", "skewnorm")
+
+# Probabilities Q is evaluated at to invert it: uniform in logit space, so the
+# tails (down to ~1e-6) are resolved as finely as the body
+_DENSE_LOGIT = np.linspace(-14.0, 14.0, 2001)
+DENSE_Y = 1.0 / (1.0 + np.exp(-_DENSE_LOGIT))
+
+
+def metalog_basis(y: np.ndarray, terms: int) -> np.ndarray:
+    """Design matrix (len(y), terms) of the metalog quantile function at probabilities y."""
+    y = np.asarray(y, dtype=float)
+    logit = np.log(y / (1.0 - y))
+    centered = y - 0.5
+    columns = [np.ones_like(y), logit, centered * logit, centered]
+    for j in range(5, terms + 1):
+        power = (j - 1) // 2
+        columns.append(centered**power if j % 2 else centered**power * logit)
+    return np.stack(columns[:terms], axis=-1)
+
+
+_DENSE_BASIS = metalog_basis(DENSE_Y, max(METALOG_MAX_TERMS, 2))
+
+
+def _to_z(x: np.ndarray, lower: Optional[float], upper: Optional[float]) -> np.ndarray:
+    """Values to the space the metalog is linear in (log / logit for bounded sides)."""
+    if lower is not None and upper is not None:
+        return np.log((x - lower) / (upper - x))
+    if lower is not None:
+        return np.log(x - lower)
+    if upper is not None:
+        return -np.log(upper - x)
+    return x
+
+
+def _from_z(z: np.ndarray, lower: Optional[float], upper: Optional[float]) -> np.ndarray:
+    if lower is not None or upper is not None:
+        z = np.clip(z, -700.0, 700.0)  # exp overflow; those points are on the bound anyway
+    if lower is not None and upper is not None:
+        return lower + (upper - lower) / (1.0 + np.exp(-z))
+    if lower is not None:
+        return lower + np.exp(z)
+    if upper is not None:
+        return upper - np.exp(-z)
+    return z
+
+
+@dataclass(frozen=True)
+class MetalogFit:
+    """Fitted metalog; lower/upper are set for the bounded variants."""
+    coefficients: np.ndarray
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+
+    def quantile(self, y: np.ndarray) -> np.ndarray:
+        return _from_z(metalog_basis(y, len(self.coefficients)) @ self.coefficients, self.lower, self.upper)
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        """CDF at x, by interpolating Q over DENSE_Y."""
+        dense_x = _from_z(_DENSE_BASIS[:, : len(self.coefficients)] @ self.coefficients, self.lower, self.upper)
+        return np.interp(x, dense_x, DENSE_Y)
+
+
+def _probability_weights(z: np.ndarray, probs: np.ndarray) -> np.ndarray:
+    """
+    Local dp/dz at each pair, so that a least-squares miss in z is weighted like
+    the same miss in probability. Without it a far-out point (an open-bound
+    anchor at the range edge) dominates the fit and the body of the
+    distribution is lost.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        density = np.gradient(probs, z)
+    valid = np.isfinite(density) & (density > 0)
+    if not valid.any():
+        return np.ones_like(z)
+    return np.where(valid, density, density[valid].min())
+
+
+def _fit_points(values, probs, lower: Optional[float], upper: Optional[float]) -> tuple[np.ndarray, np.ndarray]:
+    """The pairs a metalog is fit to: those at probability 0 or 1, or on a bound, pin the support, not the shape."""
+    values = np.asarray(values, dtype=float)
+    probs = np.asarray(probs, dtype=float)
+    keep = (probs > 0) & (probs < 1)
+    if lower is not None:
+        keep &= values > lower
+    if upper is not None:
+        keep &= values < upper
+    return values[keep], probs[keep]
+
+
+def fit_metalogs(
+    points: list[tuple],
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+    max_terms: int = METALOG_MAX_TERMS,
+) -> list[Optional[MetalogFit]]:
+    """
+    Least-squares metalogs for many (values, probs) pair sets at once, with
+    None where no monotonic fit exists.
+
+    Sets with the same probabilities (runs answering the same percentiles)
+    share a design matrix, so each group is solved as one stacked
+    pseudo-inverse per term count rather than one lstsq per set.
+    """
+    fits: list[Optional[MetalogFit]] = [None] * len(points)
+    groups: dict[tuple, list[int]] = {}
+    prepared = []
+    for i, (values, probs) in enumerate(points):
+        values, probs = _fit_points(values, probs, lower, upper)
+        prepared.append((_to_z(values, lower, upper), probs))
+        if len(values) >= 2:
+            groups.setdefault(tuple(probs), []).append(i)
+
+    for probs_key, members in groups.items():
+        probs = np.array(probs_key)
+        z = np.stack([prepared[i][0] for i in members])  # (sets, pairs)
+        weights = np.stack([_probability_weights(prepared[i][0], probs) for i in members])
+        pending = np.arange(len(members))
+        for terms in range(min(max_terms, len(probs)), 1, -1):
+            weighted_basis = weights[pending, :, None] * metalog_basis(probs, terms)  # (sets, pairs, terms)
+            coefficients = np.einsum(
+                "skp,sp->sk", np.linalg.pinv(weighted_basis), weights[pending] * z[pending]
+            )
+            monotonic = np.all(np.diff(_DENSE_BASIS[:, :terms] @ coefficients.T, axis=0) > 0, axis=0)
+            for row in np.flatnonzero(monotonic):
+                fits[members[pending[row]]] = MetalogFit(coefficients[row], lower, upper)
+            pending = pending[~monotonic]
+            if not len(pending):
+                break
+    return fits
+
+
+def fit_metalog(
+    values: np.ndarray,
+    probs: np.ndarray,
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+    max_terms: int = METALOG_MAX_TERMS,
+) -> Optional[MetalogFit]:
+    """Least-squares metalog through (value, probability) pairs, or None if no monotonic fit exists."""
+    return fit_metalogs([(values, probs)], lower, upper, max_terms)[0]
+
+
+def _fit_skewnorm(values: np.ndarray, probs: np.ndarray, cdf_xaxis: np.ndarray) -> np.ndarray:
+    if skewnorm is None:
+        raise ValueError("scipy is not installed")
+
+    # Use median as loc, IQR-based scale, start with 0 skew
+    initial_loc = values[len(values) // 2]
+    if len(values) >= 4:
+        iqr = values[3 * len(values) // 4] - values[len(values) // 4]
+        initial_scale = max(iqr / 1.35, 0.01)  # 1.35 ≈ IQR of standard normal
+    else:
+        initial_scale = max((values[-1] - values[0]) / 4, 0.01)
+
+    def loss_fn(params):
+        """Squared error between target and fitted CDF values."""
+        loc, scale, alpha = params
+        if scale <= 0:
+            return 1e10
+        try:
+            return np.sum((skewnorm.cdf(values, alpha, loc=loc, scale=scale) - probs) ** 2)
+        except Exception:
+            return 1e10
+
+    result = minimize(
+        loss_fn,
+        x0=[initial_loc, initial_scale, 0.0],
+        method="Nelder-Mead",
+        options={"maxiter": 500, "xatol": 1e-6},
+    )
+    if not (result.success or result.fun < 0.1):  # Accept if error is small
+        raise ValueError("Distribution fitting did not converge well")
+    fit_loc, fit_scale, fit_alpha = result.x
+    return skewnorm.cdf(cdf_xaxis, fit_alpha, loc=fit_loc, scale=max(fit_scale, 0.01))
+
+
+def interpolate_cdf(values: np.ndarray, probs: np.ndarray, cdf_xaxis: np.ndarray) -> np.ndarray:
+    """PCHIP through the pairs (extrapolated), or linear and flat beyond them without scipy."""
+    if PchipInterpolator is None:
+        return np.interp(cdf_xaxis, values, probs)
+    if len(values) >= 2:
+        return PchipInterpolator(values, probs, extrapolate=True)(cdf_xaxis)
+    return np.full(len(cdf_xaxis), probs[0] if len(probs) > 0 else 0.5)
+
+
+def distribution_cdf(distribution: dict, cdf_xaxis) -> np.ndarray:
+    """
+    Exact CDF at cdf_xaxis of a parametric distribution as reported by the
+    get_parametric_cdf tool ({"family": "skewnorm", "alpha", "loc", "scale"}).
+    """
+    if distribution.get("family") != "skewnorm":
+        raise ValueError(f"Unsupported distribution family: {distribution.get('family')}")
+    if skewnorm is None:
+        raise ValueError("scipy is not installed")
+    return skewnorm.cdf(
+        np.asarray(cdf_xaxis, dtype=float),
+        distribution["alpha"],
+        loc=distribution["loc"],
+        scale=distribution["scale"],
+    )
+
+
+def fit_cdfs(
+    points: list[tuple],
+    cdf_xaxis,
+    method: str = CDF_FIT_METHOD,
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Raw CDFs, shape (len(points), len(cdf_xaxis)), from (values, probs) pair
+    sets sorted by value, all on one question's axis. lower/upper are closed
+    question bounds (metalog keeps its mass inside them). The result still
+    needs forecasting.enforce_cdf_constraints().
+    """
+    if method not in FIT_METHODS:
+        raise ValueError(f"Unknown CDF fit method: {method}. Options: {FIT_METHODS}")
+    cdf_xaxis = np.asarray(cdf_xaxis, dtype=float)
+    points = [(np.asarray(values, dtype=float), np.asarray(probs, dtype=float)) for values, probs in points]
+    cdfs = np.empty((len(points), len(cdf_xaxis)))
+
+    fits = fit_metalogs(points, lower, upper) if method == "metalog" else [None] * len(points)
+    for i, ((values, probs), fit) in enumerate(zip(points, fits)):
+        if fit is not None:
+            cdfs[i] = fit.cdf(cdf_xaxis)
+            continue
+        if method == "skewnorm":
+            try:
+                cdfs[i] = _fit_skewnorm(values, probs, cdf_xaxis)
+                continue
+            except Exception:
+                pass
+        cdfs[i] = interpolate_cdf(values, probs, cdf_xaxis)
+    return cdfs
+
+
+def fit_cdf(
+    values,
+    probs,
+    cdf_xaxis,
+    method: str = CDF_FIT_METHOD,
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+) -> np.ndarray:
+    """fit_cdfs() for a single set of pairs."""
+    return fit_cdfs([(values, probs)], cdf_xaxis, method, lower, upper)[0]
@@ -0,0 +1,182 @@
+"""
+Resumable per-question pipeline stages.
+
+A question goes through search -> tool_loop -> synthesis -> forecast -> submit
+-> comment, then its record is written. Each stage's output is saved as a JSON
+artifact under
+
+    CHECKPOINT_DIR/<post_id>/<content_hash>/<stage>.json
+
+so when a later stage fails (a comment that will not post, a crash in the
+record writer) the next cron run picks up after the last completed stage
+instead of paying for research and forecasting again. content_hash covers the
+question text, so an edited question starts over. Checkpoints live under
+logs/ (carried between runs on the bot-data branch) and are ignored after
+CHECKPOINT_MAX_AGE_HOURS so a stale forecast is never resumed. Once the
+record is written, complete() removes the stage artifacts and leaves a
+completed.json tombstone. Any artifact saved before the tombstone is
+ignored, so artifacts brought back from an older bot-data commit cannot
+make a finished question look half-done and get it posted again.
+
+Research and forecasting code calls checkpoint_stage(), which is a plain
+pass-through unless a checkpoint_scope() is active (backtests and the test
+script run without one).
+"""
+import contextvars
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from config import CHECKPOINT_ENABLED, CHECKPOINT_DIR, CHECKPOINT_MAX_AGE_HOURS
+
+STAGES = ("search", "tool_loop", "synthesis", "forecast", "submit", "comment")
+COMPLETED = "completed"  # Tombstone file name, written by complete()
+
+_active: contextvars.ContextVar[Optional["QuestionCheckpoint"]] = contextvars.ContextVar(
+    "active_checkpoint", default=None
+)
+
+
+def question_content_hash(question_details: dict) -> str:
+    """Hash of the fields that shape research and the forecast."""
+    fields = {
+        key: question_details.get(key)
+        for key in ("title", "type", "resolution_criteria", "description", "fine_print", "options", "scaling")
+    }
+    canonical = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class QuestionCheckpoint:
+    """Stage artifacts for one version of one question."""
+
+    def __init__(self, post_id: int, question_details: dict):
+        self.post_id = post_id
+        self.content_hash = question_content_hash(question_details)
+        self.path = Path(CHECKPOINT_DIR) / str(post_id) / self.content_hash
+
+    def _stage_path(self, stage: str) -> Path:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown checkpoint stage: {stage}. Options: {STAGES}")
+        return self.path / f"{stage}.json"
+
+    @staticmethod
+    def _read(path: Path) -> Optional[dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _write(path: Path, output: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "output": output}, f, default=str)
+        os.replace(tmp, path)
+
+    def completed_at(self) -> Optional[float]:
+        """When complete() last ran for this version of the question, if ever."""
+        entry = self._read(self.path / f"{COMPLETED}.json")
+        return entry["saved_at"] if entry else None
+
+    def load(self, stage: str) -> Optional[Any]:
+        """Saved output of stage, or None if it has not completed (or is stale, or predates complete())."""
+        if not CHECKPOINT_ENABLED:
+            return None
+        entry = self._read(self._stage_path(stage))
+        if entry is None:
+            return None
+        if time.time() - entry["saved_at"] > CHECKPOINT_MAX_AGE_HOURS * 3600:
+            return None
+        completed_at = self.completed_at()
+        if completed_at is not None and entry["saved_at"] <= completed_at:
+            return None
+        return entry["output"]
+
+    def save(self, stage: str, output: Any) -> None:
+        if not CHECKPOINT_ENABLED:
+            return
+        self._write(self._stage_path(stage), output)
+
+    def completed_stages(self) -> list[str]:
+        return [stage for stage in STAGES if self.load(stage) is not None]
+
+    def has_pending_work(self) -> bool:
+        """True if an earlier run got partway through this question."""
+        return bool(self.completed_stages())
+
+    async def run(self, stage: str, compute: Callable[[], Union[Any, Awaitable[Any]]]) -> Any:
+        """Return stage's saved output, or compute (sync or async) and save it."""
+        saved = self.load(stage)
+        if saved is not None:
+            print(f"[Checkpoint] Post {self.post_id}: resuming from saved '{stage}' stage")
+            return saved
+        output = compute()
+        if inspect.isawaitable(output):
+            output = await output
+        self.save(stage, output)
+        return output
+
+    def complete(self) -> None:
+        """
+        Mark the question done: remove every checkpoint for this post (all
+        content versions) and leave the completed tombstone for this one.
+        """
+        if not CHECKPOINT_ENABLED:
+            return
+        shutil.rmtree(self.path.parent, ignore_errors=True)
+        self._write(self.path / f"{COMPLETED}.json", True)
+
+
+@contextmanager
+def checkpoint_scope(checkpoint: QuestionCheckpoint):
+    """Make checkpoint_stage() calls inside the block save to checkpoint."""
+    token = _active.set(checkpoint)
+    try:
+        yield checkpoint
+    finally:
+        _active.reset(token)
+
+
+async def checkpoint_stage(stage: str, compute: Callable[[], Union[Any, Awaitable[Any]]]) -> Any:
+    """Run compute through the active checkpoint, or directly if there is none."""
+    checkpoint = _active.get()
+    if checkpoint is not None:
+        return await checkpoint.run(stage, compute)
+    output = compute()
+    if inspect.isawaitable(output):
+        output = await output
+    return output
+
+
+def prune_checkpoints() -> int:
+    """Delete checkpoint directories older than CHECKPOINT_MAX_AGE_HOURS."""
+    root = Path(CHECKPOINT_DIR)
+    if not root.exists():
+        return 0
+    cutoff = time.time() - CHECKPOINT_MAX_AGE_HOURS * 3600
+    removed = 0
+    for version_dir in root.glob("*/*"):
+        # saved_at rather than mtime: a git checkout of bot-data resets mtimes
+        saved_at = []
+        for f in version_dir.glob("*.json"):
+            try:
+                with open(f, "r", encoding="utf-8") as fh:
+                    saved_at.append(json.load(fh)["saved_at"])
+            except (OSError, KeyError, json.JSONDecodeError):
+                continue
+        if not saved_at or max(saved_at) < cutoff:
+            shutil.rmtree(version_dir, ignore_errors=True)
+            removed += 1
+    for post_dir in root.iterdir():
+        if post_dir.is_dir() and not any(post_dir.iterdir()):
+            post_dir.rmdir()
+    return removed
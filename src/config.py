@@ -3,7 +3,6 @@ Configuration and constants for the Metaculus forecasting bot.
 This file contains settings that rarely change.
 """
 import os
-import asyncio
 import dotenv
 
 dotenv.load_dotenv()
@@ -16,6 +15,27 @@ SKIP_PREVIOUSLY_FORECASTED_QUESTIONS = True
 GET_NEWS = True  # Set to True to enable EXA research
 USE_SMART_SEARCHER = False  # Set to True to use forecasting-tools SmartSearcher instead of pure Exa search
 USE_TOOLS = True  # Set to True to enable agentic tool-calling during research
+QUESTION_WORKERS = 8  # Questions forecast at once across all tournaments (see question_scheduler.py)
+
+# Adaptive sampling: draw forecast runs in waves and stop once the aggregate
+# (median probability / median CDF / mean MC vector) is stable under bootstrap.
+# NUM_RUNS_PER_QUESTION is the hard cap on runs when this is enabled.
+ADAPTIVE_SAMPLING = False
+ADAPTIVE_MIN_RUNS = 2  # Runs drawn before the first convergence check
+ADAPTIVE_WAVE_SIZE = 2  # Runs drawn per additional wave
+ADAPTIVE_BOOTSTRAP_SAMPLES = 500
+# Stop when the bootstrap std of the aggregate (worst point/option) is below this
+ADAPTIVE_TOLERANCE = {
+    "binary": 0.02,
+    "numeric": 0.02,
+    "multiple_choice": 0.03,
+}
+
+# Distribution fitted through a numeric forecast's percentiles (see cdf_fitting.py):
+# "metalog" is one linear least-squares solve; "skewnorm" is the older
+# Nelder-Mead skew-normal fit, kept as an option. Both fall back to PCHIP.
+CDF_FIT_METHOD = "metalog"
+METALOG_MAX_TERMS = 6  # Terms tried first; fewer are used if the fit is not monotonic
 
 # ========================= API KEYS =========================
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
@@ -27,6 +47,40 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # For EXA Smart Searcher
 # Supported providers: "openrouter", "metaculus_proxy"
 LLM_PROVIDER = "openrouter"
 
+# Shared connection pool used by every LLM client (see llm_clients.py)
+LLM_HTTP2 = True  # Multiplex requests over HTTP/2 (h2 comes with httpx[http2]; HTTP/1.1 without it)
+LLM_MAX_CONNECTIONS = 100  # Upper bound on open sockets per provider
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20  # Idle connections kept warm between calls
+LLM_KEEPALIVE_EXPIRY = 60.0  # Seconds an idle connection stays in the pool
+LLM_CONNECT_TIMEOUT = 10.0  # Seconds to establish a connection
+LLM_REQUEST_TIMEOUT = 600.0  # Seconds to wait on a single read
+
+# On-disk LLM response cache (see llm_cache.py)
+# Modes: "off", "read_through", "record", "replay"
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "off")
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backtesting", "data", "llm_cache.sqlite"),
+)
+LLM_CACHE_MAX_BYTES = 2 * 1024**3  # LRU eviction kicks in above this size (2 GB)
+
+# Background cost ledger for OpenRouter generation stats (see cost_ledger.py)
+COST_LEDGER_BATCH_SIZE = 20  # Generation ids fetched per batch
+COST_LEDGER_BATCH_DELAY = 2.0  # Seconds to gather a batch; also lets OpenRouter finalise stats
+COST_LEDGER_MAX_RETRIES = 4  # Stats usually 404 for a moment after a generation finishes
+
+# Multi-sample forecasting when NUM_RUNS_PER_QUESTION > 1 (see llm.call_llm_samples)
+#   "auto"         - one request with `n` where the model supports it, else prefix caching
+#   "n"            - always one request with the `n` parameter
+#   "prefix_cache" - one warm-up request, then the remaining samples concurrently
+#                    against the provider's cached prompt prefix
+#   "off"          - independent requests for every sample
+MULTI_SAMPLE_MODE = "auto"
+N_PARAM_MODEL_PREFIXES = ("openai/",)  # OpenRouter models that honour `n`
+# Models that only cache a prompt prefix when it carries an explicit cache_control
+# breakpoint (OpenAI, Grok and DeepSeek cache long prefixes automatically)
+PROMPT_CACHE_CONTROL_PREFIXES = ("anthropic/", "google/gemini")
+
 # ========================= MODE SELECTION =========================
 #Toggle between EXPENSIVE (high quality) and CHEAP (cost-effective) mode
 EXPENSIVE_MODE = False  # Set to True for premium models, False for budget models
@@ -87,10 +141,91 @@ else:
 # ========================= METACULUS API =========================
 AUTH_HEADERS = {"headers": {"Authorization": f"Token {METACULUS_TOKEN}"}}
 API_BASE_URL = "https://www.metaculus.com/api"
+LISTING_PAGE_SIZE = 50  # Posts per /posts/ page
+LISTING_MAX_CONCURRENCY = 4  # Pages fetched at once once the total count is known
+
+# Shared async client (see metaculus_client.py)
+METACULUS_MAX_CONNECTIONS = 10
+METACULUS_REQUEST_TIMEOUT = 60.0
+METACULUS_MAX_RETRIES = 3  # Retries on 429s, 5xx and connection errors (POSTs: only 429 + Retry-After and connect errors)
+METACULUS_RETRY_BASE_DELAY = 1.0  # Seconds; doubles per retry, with jitter (Retry-After wins)
+# Forecast/comment submission (see submission_queue.py)
+SUBMIT_BATCH_SIZE = 20  # Forecasts posted per /questions/forecast/ request
+SUBMIT_BATCH_DELAY = 2.0  # Seconds a batch waits for more forecasts after its first
+SUBMIT_MAX_RETRIES = 2  # Retries of a single forecast on 5xx/timeouts (comments are posted once)
+SUBMIT_RETRY_BASE_DELAY = 2.0  # Seconds; doubles per retry, with jitter
+COMMENT_MAX_CONCURRENCY = 4  # Comments posted at once
+# ETag/Last-Modified validators and bodies for /posts/{id}/, kept on the bot-data branch
+METACULUS_HTTP_CACHE_DIR = os.getenv(
+    "METACULUS_HTTP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "metaculus_cache"),
+)
 
 # ========================= RATE LIMITING =========================
-CONCURRENT_REQUESTS_LIMIT = 5
-llm_rate_limiter = asyncio.Semaphore(CONCURRENT_REQUESTS_LIMIT)
+# Per provider/model budgets for the LLM scheduler (see llm_scheduler.py).
+# Keys are matched as prefixes of "<provider>/<model>" (longest match wins) and
+# override "default" field by field.
+#   rpm             - requests per minute
+#   tpm             - prompt tokens per minute (estimated before sending)
+#   max_concurrency - requests in flight at once
+LLM_RATE_LIMITS = {
+    "default": {"rpm": 60, "tpm": 400_000, "max_concurrency": 5},
+    "openrouter/x-ai/": {"rpm": 120, "tpm": 2_000_000, "max_concurrency": 10},
+    "openrouter/anthropic/": {"rpm": 50, "tpm": 400_000, "max_concurrency": 5},
+    "metaculus_proxy/": {"rpm": 30, "tpm": 200_000, "max_concurrency": 3},
+}
+LLM_MAX_RETRIES = 2  # Retries on 429s, connection errors and 5xx (handled by the scheduler)
+CHARS_PER_TOKEN = 4  # Rough prompt-size estimate used for the tpm bucket
+
+# Tail-latency protection (see llm_hedging.py)
+LLM_CALL_DEADLINE = 300.0  # Seconds an admitted request may run (queueing excluded) before the cascade moves on
+LLM_HEDGING = True  # Fire a duplicate request when the first one is slower than usual
+HEDGE_PERCENTILE = 95  # Hedge once an admitted call outlives this percentile of recent latencies for its model
+HEDGE_MIN_DELAY = 20.0  # Never hedge earlier than this many seconds
+HEDGE_MIN_SAMPLES = 8  # Latencies needed for a model before hedging kicks in
+# Ordered fallbacks tried when a model errors or misses its deadline (OpenRouter only)
+FALLBACK_MODELS = {
+    "anthropic/claude-opus-4.5": ["anthropic/claude-sonnet-4.5"],
+    "x-ai/grok-4.1-fast": ["google/gemini-2.5-flash"],
+}
+
+# Exa search/crawl client (see exa_client.py)
+EXA_MAX_CONCURRENCY = 8  # Exa requests in flight at once across all questions
+EXA_MAX_RETRIES = 3  # Retries on 429s, 5xx and connection errors
+EXA_RETRY_BASE_DELAY = 1.0  # Seconds; doubles per retry, with jitter
+EXA_REQUEST_TIMEOUT = 60.0
+
+# Persistent Exa search cache (see exa_cache.py). Lives under logs/ so the
+# workflow carries it between cron runs on the bot-data branch.
+EXA_CACHE_ENABLED = os.getenv("EXA_CACHE_ENABLED", "true").lower() == "true"
+EXA_CACHE_DIR = os.getenv(
+    "EXA_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "exa_cache"),
+)
+EXA_CACHE_TTL_LIVE = 6 * 3600  # Searches whose window reaches the present
+EXA_CACHE_TTL_SETTLED = 30 * 86400  # Searches ending further back than EXA_CACHE_SETTLED_DAYS
+EXA_CACHE_SETTLED_DAYS = 3  # Age of an end date after which results stop changing
+
+# ========================= CHECKPOINTS =========================
+# Per-question stage artifacts so a failed run resumes where it stopped
+# (see checkpoints.py). Lives under logs/ so it is kept on the bot-data branch.
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+CHECKPOINT_DIR = os.getenv(
+    "CHECKPOINT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "checkpoints"),
+)
+CHECKPOINT_MAX_AGE_HOURS = 24  # Older checkpoints are stale; the question is redone from scratch
+
+# ========================= TOOL EXECUTION =========================
+# Wall-clock budget for all tool calls of one tool-loop turn (per-tool budgets
+# are BaseTool.timeout_seconds). Tools still running are cancelled and reported
+# to the model as timed out.
+TOOL_ITERATION_BUDGET = 120.0
+
+# Worker pools for tools whose BaseTool.execution is "thread" (blocking I/O such
+# as yfinance, fredapi, pytrends, requests) or "process" (CPU-heavy simulation)
+TOOL_THREAD_POOL_SIZE = 16
+TOOL_PROCESS_POOL_SIZE = 2
 
 # ========================= TOURNAMENT IDS =========================
 Q4_2024_AI_BENCHMARKING_ID = 32506
@@ -0,0 +1,167 @@
+"""
+Per-run cost ledger for OpenRouter generations.
+
+LLM calls hand their generation id to record_generation() and return
+immediately. A background task batches the ids, waits a moment for OpenRouter
+to finalise the numbers, then fetches /generation stats concurrently with
+retries and writes them into the ledger - so cost tracking never sits on the
+critical path of a forecast.
+
+Each entry is tagged with the scheduler lane and question label active when
+the call was made (see llm_scheduler.question_scope), so reports can break
+cost down per question or per phase. Call flush_cost_ledger() before reading
+the ledger at the end of a run.
+"""
+import asyncio
+import random
+import time
+from typing import Optional
+
+from config import (
+    OPENROUTER_API_KEY,
+    COST_LEDGER_BATCH_SIZE,
+    COST_LEDGER_BATCH_DELAY,
+    COST_LEDGER_MAX_RETRIES,
+)
+from llm_clients import get_openrouter_http_client
+from llm_scheduler import current_lane, current_question_label
+
+GENERATION_URL = "https://openrouter.ai/api/v1/generation"
+
+_entries: list[dict] = []
+# Background worker state, bound to the event loop that started it
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_queue: Optional[asyncio.Queue] = None
+_worker: Optional[asyncio.Task] = None
+
+
+def record_generation(generation_id: Optional[str], model: str = "", provider: str = "openrouter") -> None:
+    """Queue a generation for stats collection. Never blocks."""
+    if not generation_id or provider != "openrouter":
+        return
+    entry = {
+        "generation_id": generation_id,
+        "provider": provider,
+        "model": model,
+        "lane": current_lane(),
+        "question": current_question_label(),
+        "timestamp": time.time(),
+        "status": "pending",
+    }
+    _entries.append(entry)
+    _ensure_worker().put_nowait(entry)
+
+
+def _ensure_worker() -> asyncio.Queue:
+    global _loop, _queue, _worker
+    loop = asyncio.get_running_loop()
+    if _loop is not loop or _worker is None or _worker.done():
+        _loop = loop
+        _queue = asyncio.Queue()
+        _worker = loop.create_task(_run_worker(_queue))
+    return _queue
+
+
+async def _run_worker(queue: asyncio.Queue) -> None:
+    while True:
+        batch = [await queue.get()]
+        # Gather whatever else arrives during the delay, up to the batch size
+        await asyncio.sleep(COST_LEDGER_BATCH_DELAY)
+        while len(batch) < COST_LEDGER_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            await asyncio.gather(*[_collect(entry) for entry in batch])
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+async def _collect(entry: dict) -> None:
+    """Fetch stats for one generation into its ledger entry, retrying until ready."""
+    headers = {"Authorization": f"Bearer {OPENROUTER_API_KEY}"}
+    error = None
+    for attempt in range(COST_LEDGER_MAX_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(min(30.0, 2 ** attempt) * (0.5 + random.random()))
+        try:
+            client = get_openrouter_http_client()
+            response = await client.get(
+                GENERATION_URL, params={"id": entry["generation_id"]}, headers=headers, timeout=10.0
+            )
+        except Exception as e:
+            error = str(e)
+            continue
+        if response.status_code == 200:
+            data = response.json().get("data", {})
+            entry.update({
+                "status": "ok",
+                "native_tokens_prompt": data.get("native_tokens_prompt", 0) or 0,
+                "native_tokens_completion": data.get("native_tokens_completion", 0) or 0,
+                "total_cost": data.get("total_cost", 0.0) or 0.0,
+                "model": data.get("model") or entry["model"],
+                "usage": data.get("usage", {}),
+            })
+            return
+        error = f"HTTP {response.status_code}"
+        if response.status_code not in (404, 429) and response.status_code < 500:
+            break
+    entry.update({"status": "failed", "error": error})
+    print(f"[Cost Ledger] Could not fetch stats for {entry['generation_id']}: {error}")
+
+
+async def flush_cost_ledger(timeout: float = 60.0) -> None:
+    """Wait for queued generations to be collected (up to timeout seconds)."""
+    if _queue is None or _loop is not asyncio.get_running_loop():
+        return
+    try:
+        await asyncio.wait_for(_queue.join(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pending = sum(1 for e in _entries if e["status"] == "pending")
+        print(f"[Cost Ledger] Flush timed out with {pending} generation(s) still pending")
+
+
+async def close_cost_ledger(timeout: float = 60.0) -> None:
+    """Flush, then stop the background worker."""
+    global _worker
+    await flush_cost_ledger(timeout)
+    if _worker is not None and _loop is asyncio.get_running_loop():
+        _worker.cancel()
+        try:
+            await _worker
+        except asyncio.CancelledError:
+            pass
+    _worker = None
+
+
+def get_ledger_entries(question: Optional[str] = None, lane: Optional[str] = None) -> list[dict]:
+    """Ledger entries recorded so far, optionally filtered by question label or lane."""
+    return [
+        dict(e) for e in _entries
+        if (question is None or e["question"] == question)
+        and (lane is None or e["lane"] == lane)
+    ]
+
+
+def summarize_costs(entries: Optional[list[dict]] = None) -> dict:
+    """Totals overall and per model for a list of ledger entries (default: all)."""
+    entries = _entries if entries is None else entries
+    summary = {
+        "calls": len(entries),
+        "pending": sum(1 for e in entries if e["status"] == "pending"),
+        "failed": sum(1 for e in entries if e["status"] == "failed"),
+        "tokens_prompt": 0,
+        "tokens_completion": 0,
+        "total_cost": 0.0,
+        "by_model": {},
+    }
+    for e in entries:
+        model = summary["by_model"].setdefault(e["model"], {"calls": 0, "tokens": 0, "total_cost": 0.0})
+        model["calls"] += 1
+        if e["status"] != "ok":
+            continue
+        summary["tokens_prompt"] += e["native_tokens_prompt"]
+        summary["tokens_completion"] += e["native_tokens_completion"]
+        summary["total_cost"] += e["total_cost"]
+        model["tokens"] += e["native_tokens_prompt"] + e["native_tokens_completion"]
+        model["total_cost"] += e["total_cost"]
+    return summary
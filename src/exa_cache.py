@@ -0,0 +1,128 @@
+"""
+Persistent cache for Exa search results.
+
+The cron workflow re-runs every 20 minutes and re-checks the same questions, so
+news.exa_search_raw looks results up here before calling Exa. Entries are
+keyed on query, num_results and the published-date filters, stored as one JSON
+file each under EXA_CACHE_DIR (logs/exa_cache by default, which the workflow
+carries between runs on the bot-data branch), and expire by how recent the
+search window is:
+
+- no end date, or an end date within EXA_CACHE_SETTLED_DAYS: the results can
+  still change as news is published, so EXA_CACHE_TTL_LIVE applies
+- an end date further back (backtests, date-bounded searches): the results are
+  settled and kept for EXA_CACHE_TTL_SETTLED
+
+Call prune_exa_cache() at the end of a run to delete expired entries so the
+persisted directory stays small.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from config import (
+    EXA_CACHE_ENABLED,
+    EXA_CACHE_DIR,
+    EXA_CACHE_TTL_LIVE,
+    EXA_CACHE_TTL_SETTLED,
+    EXA_CACHE_SETTLED_DAYS,
+)
+
+_stats = {"hits": 0, "misses": 0, "writes": 0, "pruned": 0}
+
+
+def make_search_key(
+    query: str,
+    num_results: int,
+    end_published_date: Optional[str],
+    start_published_date: Optional[str],
+) -> str:
+    canonical = json.dumps(
+        {
+            "query": query.strip(),
+            "num_results": num_results,
+            "end_published_date": end_published_date,
+            "start_published_date": start_published_date,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def ttl_for(end_published_date: Optional[str]) -> float:
+    """Seconds a search with this end date stays fresh."""
+    if not end_published_date:
+        return EXA_CACHE_TTL_LIVE
+    try:
+        end = datetime.fromisoformat(end_published_date.replace("Z", "+00:00"))
+    except ValueError:
+        return EXA_CACHE_TTL_LIVE
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if datetime.now(timezone.utc) - end > timedelta(days=EXA_CACHE_SETTLED_DAYS):
+        return EXA_CACHE_TTL_SETTLED
+    return EXA_CACHE_TTL_LIVE
+
+
+def _path(key: str) -> Path:
+    return Path(EXA_CACHE_DIR) / f"{key}.json"
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """Return the cached results for key if present and unexpired, else None."""
+    if not EXA_CACHE_ENABLED:
+        return None
+    try:
+        with open(_path(key), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        _stats["misses"] += 1
+        return None
+    if entry.get("expires_at", 0) <= time.time():
+        _stats["misses"] += 1
+        return None
+    _stats["hits"] += 1
+    return entry["results"]
+
+
+def cache_put(key: str, results: Any, query: str, ttl: float) -> None:
+    """Write results under key; the file is swapped in atomically."""
+    if not EXA_CACHE_ENABLED:
+        return
+    path = _path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    entry = {"query": query, "created_at": now, "expires_at": now + ttl, "results": results}
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f, default=str)
+    os.replace(tmp, path)
+    _stats["writes"] += 1
+
+
+def prune_exa_cache() -> int:
+    """Delete expired or unreadable entries. Returns how many were removed."""
+    cache_dir = Path(EXA_CACHE_DIR)
+    if not cache_dir.exists():
+        return 0
+    now = time.time()
+    removed = 0
+    for path in cache_dir.glob("*.json"):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                expired = json.load(f).get("expires_at", 0) <= now
+        except (OSError, json.JSONDecodeError):
+            expired = True
+        if expired:
+            path.unlink(missing_ok=True)
+            removed += 1
+    _stats["pruned"] += removed
+    return removed
+
+
+def get_exa_cache_stats() -> dict:
+    return dict(_stats)
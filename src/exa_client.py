@@ -0,0 +1,129 @@
+"""
+Shared async Exa client.
+
+news.exa_search_raw and news.exa_crawl_urls (and through them the research
+pipeline, the search_web/crawl_urls tools and backtest data collection) all go
+through exa_call(), which:
+
+- reuses one AsyncExa client per event loop, backed by a pooled httpx client
+- caps the number of Exa requests in flight at EXA_MAX_CONCURRENCY
+- retries 429s, 5xx and connection errors with jittered exponential backoff
+- adds up the cost Exa reports for every response (see get_exa_cost_stats)
+
+Call close_exa_client() once at the end of a run to release the connections.
+"""
+import asyncio
+import random
+import re
+from collections import Counter
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from exa_py import AsyncExa
+
+from config import (
+    EXA_API_KEY,
+    EXA_MAX_CONCURRENCY,
+    EXA_MAX_RETRIES,
+    EXA_RETRY_BASE_DELAY,
+    EXA_REQUEST_TIMEOUT,
+)
+
+T = TypeVar("T")
+
+EXA_BASE_URL = "https://api.exa.ai"
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Client and semaphore are bound to the loop they were created on, like the
+# LLM clients in llm_clients.py
+_client: Optional[tuple[asyncio.AbstractEventLoop, AsyncExa]] = None
+_semaphore: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+_stats: Counter = Counter()
+
+
+def get_exa_client() -> AsyncExa:
+    """AsyncExa client sharing one httpx connection pool per event loop."""
+    global _client
+    loop = asyncio.get_running_loop()
+    if _client is not None and _client[0] is loop:
+        return _client[1]
+    exa = AsyncExa(api_key=EXA_API_KEY, api_base=EXA_BASE_URL)
+    # AsyncExa builds an unpooled client lazily; hand it ours instead
+    exa._client = httpx.AsyncClient(
+        base_url=EXA_BASE_URL,
+        headers=exa.headers,
+        limits=httpx.Limits(
+            max_connections=EXA_MAX_CONCURRENCY,
+            max_keepalive_connections=EXA_MAX_CONCURRENCY,
+        ),
+        timeout=httpx.Timeout(EXA_REQUEST_TIMEOUT),
+    )
+    _client = (loop, exa)
+    return exa
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore[0] is not loop:
+        _semaphore = (loop, asyncio.Semaphore(EXA_MAX_CONCURRENCY))
+    return _semaphore[1]
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    # exa_py surfaces HTTP errors as ValueError("Request failed with status code N: ...")
+    match = re.search(r"status code (\d{3})", str(error))
+    return bool(match) and int(match.group(1)) in RETRYABLE_STATUS
+
+
+def _response_cost(response) -> float:
+    cost = getattr(response, "cost_dollars", None)
+    return float(getattr(cost, "total", 0.0) or 0.0) if cost else 0.0
+
+
+async def exa_call(
+    operation: str,
+    request: Callable[[AsyncExa], Awaitable[T]],
+    max_retries: int = EXA_MAX_RETRIES,
+) -> T:
+    """
+    Run request(client) under the concurrency cap, retrying transient failures.
+    operation ("search", "crawl", ...) is only used for logs and stats.
+    """
+    exa = get_exa_client()
+    for attempt in range(max_retries + 1):
+        try:
+            async with _get_semaphore():
+                response = await request(exa)
+        except Exception as e:
+            if attempt == max_retries or not _is_retryable(e):
+                _stats[f"{operation}:failed"] += 1
+                raise
+            delay = EXA_RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5)
+            _stats["retries"] += 1
+            print(f"[Exa] {operation} failed ({e}), retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            await asyncio.sleep(delay)
+            continue
+        _stats[f"{operation}:calls"] += 1
+        _stats["total_cost"] += _response_cost(response)
+        return response
+    raise RuntimeError("unreachable")
+
+
+def get_exa_cost_stats() -> dict:
+    """Calls, failures and retries per operation plus total dollars spent."""
+    return dict(_stats, total_cost=_stats["total_cost"])
+
+
+async def close_exa_client() -> None:
+    """Close the pooled client. Safe to call more than once."""
+    global _client
+    entry, _client = _client, None
+    if entry is None or entry[0] is not asyncio.get_running_loop():
+        return
+    try:
+        await entry[1].client.aclose()
+    except Exception as e:
+        print(f"[Exa] Error closing client: {e}")
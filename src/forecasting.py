@@ -7,9 +7,24 @@ import datetime
 import re
 import numpy as np
 
-from llm import call_llm
+from llm import call_llm_samples, sample_mode_for
+from llm_scheduler import llm_lane
 from research_agent import run_research_agent, format_results_for_forecaster, run_research_pipeline
-from config import FORECAST_MODEL, FORECAST_TEMP, FORECAST_THINKING, USE_TOOLS
+from config import (
+    FORECAST_MODEL,
+    FORECAST_TEMP,
+    FORECAST_THINKING,
+    USE_TOOLS,
+    LLM_PROVIDER,
+    ADAPTIVE_SAMPLING,
+    ADAPTIVE_MIN_RUNS,
+    ADAPTIVE_WAVE_SIZE,
+    ADAPTIVE_BOOTSTRAP_SAMPLES,
+    ADAPTIVE_TOLERANCE,
+    CDF_FIT_METHOD,
+)
+from cdf_fitting import distribution_cdf, fit_cdfs
+from question_grid import question_grid
 from prompts import (
     BINARY_PROMPT_TEMPLATE,
     NUMERIC_PROMPT_TEMPLATE,
@@ -32,6 +47,44 @@ def detect_question_type(title: str) -> str:
     return "general"
 
 
+def bootstrap_spread(samples: np.ndarray, aggregate, n_boot: int = ADAPTIVE_BOOTSTRAP_SAMPLES) -> float:
+    """
+    Bootstrap standard deviation of an aggregate over runs.
+
+    samples has shape (runs, dims); aggregate is np.median or np.mean. Returns
+    the largest std across dims (e.g. the least settled CDF point).
+    """
+    runs = samples.shape[0]
+    rng = np.random.default_rng(0)
+    idx = rng.integers(0, runs, size=(n_boot, runs))
+    boot = aggregate(samples[idx], axis=1)  # (n_boot, dims)
+    return float(np.max(np.std(boot, axis=0)))
+
+
+async def sample_until_converged(draw, num_runs: int, question_type: str, to_vector, aggregate) -> list:
+    """
+    Draw forecast runs until the aggregate converges or num_runs is reached.
+
+    draw(start_index, n) returns n parsed runs; to_vector maps a run to the
+    values being aggregated. Without ADAPTIVE_SAMPLING all runs are drawn at once.
+    """
+    if not ADAPTIVE_SAMPLING or num_runs <= ADAPTIVE_MIN_RUNS:
+        return await draw(0, num_runs)
+
+    tolerance = ADAPTIVE_TOLERANCE[question_type]
+    runs = await draw(0, ADAPTIVE_MIN_RUNS)
+    while len(runs) < num_runs:
+        spread = bootstrap_spread(np.array([to_vector(r) for r in runs], dtype=float), aggregate)
+        if spread <= tolerance:
+            print(f"[Adaptive Sampling] Converged after {len(runs)}/{num_runs} runs (spread {spread:.4f})")
+            return runs
+        wave = min(ADAPTIVE_WAVE_SIZE, num_runs - len(runs))
+        print(f"[Adaptive Sampling] Spread {spread:.4f} > {tolerance} after {len(runs)} runs, drawing {wave} more")
+        runs += await draw(len(runs), wave)
+    print(f"[Adaptive Sampling] Hit cap of {num_runs} runs")
+    return runs
+
+
 # ========================= EXTRACTION FUNCTIONS =========================
 
 def extract_probability_from_response_as_percentage_not_decimal(
@@ -192,19 +245,91 @@ def extract_option_probabilities_from_response(forecast_text: str, options) -> l
         raise ValueError(f"Could not extract prediction from response: {forecast_text}")
 
 
+def adopted_parametric_distribution(percentile_values: dict, tool_calls: list[dict]) -> dict | None:
+    """
+    The distribution from the last get_parametric_cdf call, if the final answer
+    kept that call's percentiles (every value it shares with the tool output
+    within rounding), else None. An answer the forecaster adjusted is fit as usual.
+    """
+    for tc in reversed(tool_calls):
+        result = tc.get("result")
+        if tc.get("tool_name") != "get_parametric_cdf" or not result or "distribution" not in result:
+            continue
+        tool_percentiles = {int(key.lstrip("p")): value for key, value in result["percentiles"].items()}
+        shared = [p for p in percentile_values if p in tool_percentiles]
+        if len(shared) < 3:
+            return None
+        spread = result["distribution"]["scale"]
+        for p in shared:
+            tolerance = max(0.02 * spread, 0.005 * abs(tool_percentiles[p]))
+            if abs(percentile_values[p] - tool_percentiles[p]) > tolerance:
+                return None
+        return result["distribution"]
+    return None
+
+
 # ========================= CDF GENERATION =========================
 
-def generate_continuous_cdf(
+# Metaculus requires each CDF step to rise by at least 5e-05 and at most 0.2
+CDF_MIN_INCREMENT = 0.00006
+CDF_MAX_INCREMENT = 0.2
+
+
+def generate_cdf_locations(range_min: float, range_max: float, zero_point: float | None) -> np.ndarray:
+    """The 201 x-axis locations Metaculus evaluates a CDF at (the shared QuestionGrid's, read-only)."""
+    return question_grid(range_min, range_max, zero_point).locations
+
+
+def enforce_cdf_constraints(cdf, open_upper_bound: bool, open_lower_bound: bool) -> np.ndarray:
+    """
+    Project a raw CDF onto what Metaculus accepts: within [0.001, 0.999] on open
+    bounds ([0, 1] on closed ones), rising by at least CDF_MIN_INCREMENT and at
+    most CDF_MAX_INCREMENT per step. A 2-D array is treated as one CDF per row.
+
+    Each sequential pass "c[i] = max(c[i], c[i-1] + d)" is the same as a running
+    max of c[i] - i*d shifted back by i*d, so the passes are cumulative max/min.
+    """
+    cdf = np.array(cdf, dtype=float)
+    steps = np.arange(cdf.shape[-1])
+    min_cdf = 0.001 if open_lower_bound else 0.0
+    max_cdf = 0.999 if open_upper_bound else 1.0
+
+    # Scale linearly into bounds, preserving shape
+    current_min = cdf.min(axis=-1, keepdims=True)
+    current_max = cdf.max(axis=-1, keepdims=True)
+    out_of_bounds = (current_max > max_cdf) | (current_min < min_cdf)
+    if out_of_bounds.any():
+        scale_factor = (max_cdf - min_cdf) / (current_max - current_min + 1e-10)
+        cdf = np.where(out_of_bounds, min_cdf + (cdf - current_min) * scale_factor, cdf)
+
+    # Forward: rise by at least the minimum increment (strictly increasing)
+    cdf = np.maximum.accumulate(cdf - steps * CDF_MIN_INCREMENT, axis=-1) + steps * CDF_MIN_INCREMENT
+    # Forward: rise by no more than the maximum increment (excess spreads to later steps)
+    cdf = np.minimum.accumulate(cdf - steps * CDF_MAX_INCREMENT, axis=-1) + steps * CDF_MAX_INCREMENT
+
+    # Backward: if pushed past max_cdf, pin the last point and keep the minimum increment below it
+    overshoot = cdf[..., -1:] > max_cdf
+    if overshoot.any():
+        pinned = cdf.copy()
+        pinned[..., -1] = max_cdf
+        shifted = np.flip(pinned - steps * CDF_MIN_INCREMENT, axis=-1)
+        pinned = np.flip(np.minimum.accumulate(shifted, axis=-1), axis=-1) + steps * CDF_MIN_INCREMENT
+        cdf = np.where(overshoot, pinned, cdf)
+
+    return np.clip(cdf, min_cdf, max_cdf)
+
+
+def percentile_points(
     percentile_values: dict,
-    question_type: str,
     open_upper_bound: bool,
     open_lower_bound: bool,
     upper_bound: float,
     lower_bound: float,
-    zero_point: float | None,
-) -> list[float]:
+) -> tuple[list[float], list[float]]:
     """
-    Generate a 201-point CDF from percentile values.
+    (values, probabilities) sorted by value for fitting: percentiles are pulled
+    inside closed bounds and anchored at the range edges. Updates
+    percentile_values in place.
     """
     percentile_max = max(float(key) for key in percentile_values.keys())
     percentile_min = min(float(key) for key in percentile_values.keys())
@@ -244,158 +369,82 @@ def generate_continuous_cdf(
     value_percentiles = {
         value: key for key, value in normalized_percentile_values.items()
     }
+    sorted_pairs = sorted(value_percentiles.items())
+    return [pair[0] for pair in sorted_pairs], [pair[1] for pair in sorted_pairs]
 
-    def generate_cdf_locations(range_min, range_max, zero_point):
-        if zero_point is None:
-            scale = lambda x: range_min + (range_max - range_min) * x
-        else:
-            deriv_ratio = (range_max - zero_point) / (range_min - zero_point)
-            scale = lambda x: range_min + (range_max - range_min) * (
-                deriv_ratio**x - 1
-            ) / (deriv_ratio - 1)
-        return [scale(x) for x in np.linspace(0, 1, 201)]
-
-    cdf_xaxis = generate_cdf_locations(range_min, range_max, zero_point)
-
-    # FIT a SkewNormal distribution to the percentiles for naturally smooth CDFs
-    # This is much better than interpolating through sparse points
-    try:
-        from scipy.stats import skewnorm
-        from scipy.optimize import minimize
-        
-        # Get percentile data: (value, probability) pairs
-        sorted_pairs = sorted(value_percentiles.items())
-        target_values = np.array([pair[0] for pair in sorted_pairs])
-        target_probs = np.array([pair[1] for pair in sorted_pairs])
-        
-        # Estimate initial parameters from data
-        # Use median as loc, IQR-based scale, start with 0 skew
-        median_idx = len(target_values) // 2
-        initial_loc = target_values[median_idx]
-        
-        # Estimate scale from range (p25 to p75 if available, else full range)
-        if len(target_values) >= 4:
-            q1_idx = len(target_values) // 4
-            q3_idx = 3 * len(target_values) // 4
-            iqr = target_values[q3_idx] - target_values[q1_idx]
-            initial_scale = max(iqr / 1.35, 0.01)  # 1.35 ≈ IQR of standard normal
-        else:
-            initial_scale = max((target_values[-1] - target_values[0]) / 4, 0.01)
-        
-        def loss_fn(params):
-            """Minimize squared error between target and fitted CDF values."""
-            loc, scale, alpha = params
-            if scale <= 0:
-                return 1e10
+
+def generate_continuous_cdfs(
+    percentile_sets: list[dict],
+    question_type: str,
+    open_upper_bound: bool,
+    open_lower_bound: bool,
+    upper_bound: float,
+    lower_bound: float,
+    zero_point: float | None,
+    fit_method: str | None = None,
+    distributions: list[dict | None] | None = None,
+) -> np.ndarray:
+    """
+    Generate 201-point CDFs for many percentile dicts of one question (e.g.
+    every run of an ensemble) in one pass; returns shape (len(percentile_sets), 201).
+    fit_method overrides CDF_FIT_METHOD ("metalog" or "skewnorm").
+
+    distributions[i], when given, is the exact parametric distribution run i's
+    percentiles came from (see adopted_parametric_distribution); its CDF is
+    evaluated on the grid instead of fitting the percentiles.
+    """
+    cdf_xaxis = question_grid(lower_bound, upper_bound, zero_point).locations
+    continuous_cdfs = np.empty((len(percentile_sets), len(cdf_xaxis)))
+    to_fit = []
+    for i, distribution in enumerate(distributions or [None] * len(percentile_sets)):
+        if distribution is not None:
             try:
-                fitted_probs = skewnorm.cdf(target_values, alpha, loc=loc, scale=scale)
-                return np.sum((fitted_probs - target_probs) ** 2)
-            except:
-                return 1e10
-        
-        # Optimize to find best-fit parameters
-        result = minimize(
-            loss_fn,
-            x0=[initial_loc, initial_scale, 0.0],
-            method='Nelder-Mead',
-            options={'maxiter': 500, 'xatol': 1e-6}
+                continuous_cdfs[i] = distribution_cdf(distribution, cdf_xaxis)
+                continue
+            except (ValueError, KeyError) as e:
+                print(f"[CDF] Could not use parametric distribution ({e}), fitting percentiles instead")
+        to_fit.append(i)
+
+    if to_fit:
+        points = [
+            percentile_points(percentile_sets[i], open_upper_bound, open_lower_bound, upper_bound, lower_bound)
+            for i in to_fit
+        ]
+        # Fit a smooth distribution through each set of percentiles (see cdf_fitting.py)
+        continuous_cdfs[to_fit] = fit_cdfs(
+            points,
+            cdf_xaxis,
+            method=fit_method or CDF_FIT_METHOD,
+            lower=None if open_lower_bound else lower_bound,
+            upper=None if open_upper_bound else upper_bound,
         )
-        
-        fit_loc, fit_scale, fit_alpha = result.x
-        
-        # Generate smooth CDF from the fitted distribution
-        if result.success or result.fun < 0.1:  # Accept if error is small
-            continuous_cdf = skewnorm.cdf(cdf_xaxis, fit_alpha, loc=fit_loc, scale=max(fit_scale, 0.01)).tolist()
-        else:
-            # Fitting failed, fall back to PCHIP
-            raise ValueError("Distribution fitting did not converge well")
-            
-    except Exception as fit_error:
-        # Fallback: Use PCHIP interpolation
-        try:
-            from scipy.interpolate import PchipInterpolator
-            
-            sorted_pairs = sorted(value_percentiles.items())
-            known_x = np.array([pair[0] for pair in sorted_pairs])
-            known_y = np.array([pair[1] for pair in sorted_pairs])
-            
-            if len(known_x) >= 2:
-                pchip = PchipInterpolator(known_x, known_y, extrapolate=True)
-                continuous_cdf = pchip(cdf_xaxis).tolist()
-            else:
-                continuous_cdf = [known_y[0] if len(known_y) > 0 else 0.5] * len(cdf_xaxis)
-        except ImportError:
-            # Final fallback: linear interpolation
-            def linear_interpolation(x_values, xy_pairs):
-                sorted_pairs = sorted(xy_pairs.items())
-                known_x = [pair[0] for pair in sorted_pairs]
-                known_y = [pair[1] for pair in sorted_pairs]
-                y_values = []
-
-                for x in x_values:
-                    if x in known_x:
-                        y_values.append(known_y[known_x.index(x)])
-                    else:
-                        i = 0
-                        while i < len(known_x) and known_x[i] < x:
-                            i += 1
-
-                        if i == 0:
-                            y_values.append(known_y[0])
-                        elif i == len(known_x):
-                            y_values.append(known_y[-1])
-                        else:
-                            x0, x1 = known_x[i - 1], known_x[i]
-                            y0, y1 = known_y[i - 1], known_y[i]
-                            y = y0 + (x - x0) * (y1 - y0) / (x1 - x0)
-                            y_values.append(y)
-
-                return y_values
-            continuous_cdf = linear_interpolation(cdf_xaxis, value_percentiles)
-    
-    # Monotonicity fix: Ensure strictly increasing by at least 6e-5 (Metaculus requires 5e-05)
-    # and by no more than 0.2 (Metaculus max step constraint)
-    min_increment = 0.00006
-    max_increment = 0.2  # Metaculus requires CDF to increase by no more than 0.2 at each step
-    
-    # Boundary definitions
-    min_cdf = 0.001 if open_lower_bound else 0.0
-    max_cdf = 0.999 if open_upper_bound else 1.0
+    return enforce_cdf_constraints(continuous_cdfs, open_upper_bound, open_lower_bound)
 
-    # Scale the CDF to fit within bounds while preserving monotonicity
-    current_min = min(continuous_cdf)
-    current_max = max(continuous_cdf)
-    
-    if current_max > max_cdf or current_min < min_cdf:
-        # Need to scale - use linear scaling to preserve monotonicity
-        scale_factor = (max_cdf - min_cdf) / (current_max - current_min + 1e-10)
-        for i in range(len(continuous_cdf)):
-            continuous_cdf[i] = min_cdf + (continuous_cdf[i] - current_min) * scale_factor
 
-    # Pass 1: Forward pass - enforce MINIMUM increment (ensures strictly increasing)
-    for i in range(1, len(continuous_cdf)):
-        if continuous_cdf[i] < continuous_cdf[i-1] + min_increment:
-            continuous_cdf[i] = continuous_cdf[i-1] + min_increment
-    
-    # Pass 2: Forward pass - enforce MAXIMUM increment (smooths steep jumps)
-    # When a step is too large, spread the excess to subsequent steps
-    for i in range(1, len(continuous_cdf)):
-        if continuous_cdf[i] > continuous_cdf[i-1] + max_increment:
-            continuous_cdf[i] = continuous_cdf[i-1] + max_increment
-            
-    # Pass 3: Backward pass (ensures we stay under max_cdf and maintains monotonicity)
-    # Ensure the last point is exactly max_cdf if it was pushed over
-    if continuous_cdf[-1] > max_cdf:
-        continuous_cdf[-1] = max_cdf
-        for i in range(len(continuous_cdf) - 2, -1, -1):
-            if continuous_cdf[i] > continuous_cdf[i+1] - min_increment:
-                continuous_cdf[i] = continuous_cdf[i+1] - min_increment
-                
-    # Final safety clamp (should be unnecessary if passes worked)
-    for i in range(len(continuous_cdf)):
-        continuous_cdf[i] = max(min_cdf, min(max_cdf, continuous_cdf[i]))
-            
-    return continuous_cdf
+def generate_continuous_cdf(
+    percentile_values: dict,
+    question_type: str,
+    open_upper_bound: bool,
+    open_lower_bound: bool,
+    upper_bound: float,
+    lower_bound: float,
+    zero_point: float | None,
+    fit_method: str | None = None,
+) -> list[float]:
+    """
+    Generate a 201-point CDF from percentile values.
+    fit_method overrides CDF_FIT_METHOD ("metalog" or "skewnorm").
+    """
+    return generate_continuous_cdfs(
+        [percentile_values],
+        question_type,
+        open_upper_bound,
+        open_lower_bound,
+        upper_bound,
+        lower_bound,
+        zero_point,
+        fit_method,
+    )[0].tolist()
 
 
 def generate_multiple_choice_forecast(options, option_probabilities) -> dict:
@@ -468,15 +517,23 @@ async def get_binary_gpt_prediction(
         "research_data": summary_report
     }
 
-    async def get_rationale_and_probability(content: str) -> tuple[float, str]:
-        rationale = await call_llm(content, model=model or FORECAST_MODEL, temperature=FORECAST_TEMP, thinking=thinking)
+    def get_probability_and_comment(rationale: str) -> tuple[float, str]:
         probability = extract_probability_from_response_as_percentage_not_decimal(rationale)
         comment = f"Extracted Probability: {probability}%\n\nGPT's Answer: {rationale}\n\n\n"
         return probability, comment
 
-    probability_and_comment_pairs = await asyncio.gather(
-        *[get_rationale_and_probability(content) for _ in range(num_runs)]
-    )
+    async def draw(start_index: int, n: int) -> list[tuple[float, str]]:
+        rationales = await call_llm_samples(
+            content, n, model=model or FORECAST_MODEL, temperature=FORECAST_TEMP,
+            thinking=thinking, start_index=start_index
+        )
+        return [get_probability_and_comment(r) for r in rationales]
+
+    with llm_lane("forecast"):
+        probability_and_comment_pairs = await sample_until_converged(
+            draw, num_runs, "binary", lambda pair: [pair[0] / 100], np.median
+        )
+    trace["num_runs"] = len(probability_and_comment_pairs)
     comments = [pair[1] for pair in probability_and_comment_pairs]
     final_comment_sections = [
         f"## Rationale {i+1}\n{comment}" for i, comment in enumerate(comments)
@@ -552,67 +609,97 @@ async def get_numeric_gpt_prediction(
     metadata["research_data"] = summary_report
     metadata["forecaster_messages"] = [] # Default, will be updated in loop if used
 
-    async def ask_llm_to_get_cdf(content: str) -> tuple[list[float], str]:
-        # --- NEW LOGIC: USE TOOL LOOP IF AVAILABLE ---
-        if USE_TOOLS:
-            from tools import get_tool, run_tool_calling_loop
-            from prompts import FORECAST_SYSTEM_PROMPT
-            
-            # Initialize the parametric tool
-            tools = [get_tool("get_parametric_cdf")]
-            
-            # Run the tool loop
-            # thinking=True is CRITICAL for Gemini 3 to reason about mean/std before calling the tool
-            final_response, tool_calls, messages = await run_tool_calling_loop(
-                initial_prompt=content,
-                tools=tools,
-                model=model or FORECAST_MODEL,
-                temperature=FORECAST_TEMP,
-                max_iterations=3,
-                system_prompt=FORECAST_SYSTEM_PROMPT,
-                thinking=thinking
-            )
-            rationale = final_response
-            
-            # Capture tool inputs for specific logging
-            tool_summary = ""
-            for tc in tool_calls:
-                if tc["tool_name"] == "get_parametric_cdf":
-                    args = tc["arguments"]
-                    tool_summary += f"\n[Parametric Tool Used: Mean={args.get('mean')}, Std={args.get('std')}, Skew={args.get('skew', 0)}]\n"
-            
-            if tool_summary:
-                rationale += tool_summary
-                
-        else:
-            # Fallback for no tools
-            rationale = await call_llm(content, model=model or FORECAST_MODEL, temperature=FORECAST_TEMP, thinking=thinking)
+    async def get_rationale_with_tools(sample_index: int, cache_prompt: bool) -> tuple[str, list[dict]]:
+        from tools import get_tool, run_tool_calling_loop
+        from prompts import FORECAST_SYSTEM_PROMPT
+        
+        # Initialize the parametric tool
+        tools = [get_tool("get_parametric_cdf")]
+        
+        # Run the tool loop
+        # thinking=True is CRITICAL for Gemini 3 to reason about mean/std before calling the tool
+        final_response, tool_calls, messages = await run_tool_calling_loop(
+            initial_prompt=content,
+            tools=tools,
+            model=model or FORECAST_MODEL,
+            temperature=FORECAST_TEMP,
+            max_iterations=3,
+            system_prompt=FORECAST_SYSTEM_PROMPT,
+            thinking=thinking,
+            sample_index=sample_index,
+            cache_prompt=cache_prompt
+        )
+        rationale = final_response
+        
+        # Capture tool inputs for specific logging
+        tool_summary = ""
+        for tc in tool_calls:
+            if tc["tool_name"] == "get_parametric_cdf":
+                args = tc["arguments"]
+                tool_summary += f"\n[Parametric Tool Used: Mean={args.get('mean')}, Std={args.get('std')}, Skew={args.get('skew', 0)}]\n"
+        
+        if tool_summary:
+            rationale += tool_summary
+        return rationale, tool_calls
 
+    async def get_rationales(start_index: int, n: int) -> list[tuple[str, list[dict]]]:
+        """(rationale, tool calls) per run."""
+        if not USE_TOOLS:
+            # Fallback for no tools
+            rationales = await call_llm_samples(
+                content, n, model=model or FORECAST_MODEL, temperature=FORECAST_TEMP,
+                thinking=thinking, start_index=start_index
+            )
+            return [(rationale, []) for rationale in rationales]
+        # --- NEW LOGIC: USE TOOL LOOP IF AVAILABLE ---
+        # Tool loops diverge after the first turn, so `n` can't be used; instead
+        # the first run warms the provider's prompt cache for the others.
+        indices = range(start_index, start_index + n)
+        cache_prompt = num_runs > 1 and sample_mode_for(LLM_PROVIDER, model or FORECAST_MODEL) != "off"
+        if not cache_prompt or start_index > 0:
+            return list(await asyncio.gather(
+                *[get_rationale_with_tools(i, cache_prompt) for i in indices]
+            ))
+        first = await get_rationale_with_tools(indices[0], True)
+        rest = await asyncio.gather(*[get_rationale_with_tools(i, True) for i in indices[1:]])
+        return [first, *rest]
+
+    def get_percentiles_and_comment(rationale: str, tool_calls: list[dict]) -> tuple[dict, dict | None, str]:
         # Use date-specific extractor for date questions (converts to timestamps)
         if question_type == "date":
             percentile_values = extract_date_percentiles_from_response(rationale)
         else:
             percentile_values = extract_percentiles_from_response(rationale)
+        distribution = adopted_parametric_distribution(percentile_values, tool_calls)
 
         comment = (
             f"Extracted Percentile_values: {percentile_values}\n\nGPT's Answer: "
             f"{rationale}\n\n\n"
         )
-
-        cdf = generate_continuous_cdf(
-            percentile_values,
+        if distribution is not None:
+            comment = f"Parametric distribution used directly: {distribution}\n\n" + comment
+        return percentile_values, distribution, comment
+
+    async def draw(start_index: int, n: int) -> list[tuple[list[float], str]]:
+        parsed = [get_percentiles_and_comment(*run) for run in await get_rationales(start_index, n)]
+        # One batched pass for the whole wave of runs
+        cdfs = generate_continuous_cdfs(
+            [percentile_values for percentile_values, _, _ in parsed],
             question_type,
             open_upper_bound,
             open_lower_bound,
             upper_bound,
             lower_bound,
             zero_point,
+            distributions=[distribution for _, distribution, _ in parsed],
         )
-        return cdf, comment
+        return [(cdf.tolist(), comment) for cdf, (_, _, comment) in zip(cdfs, parsed)]
 
-    cdf_and_comment_pairs = await asyncio.gather(
-        *[ask_llm_to_get_cdf(content) for _ in range(num_runs)]
-    )
+    with llm_lane("forecast"):
+        cdf_and_comment_pairs = await sample_until_converged(
+            draw, num_runs, "numeric", lambda pair: pair[0], np.median
+        )
+    metadata["num_runs"] = len(cdf_and_comment_pairs)
     comments = [pair[1] for pair in cdf_and_comment_pairs]
     final_comment_sections = [
         f"## Rationale {i+1}\n{comment}" for i, comment in enumerate(comments)
@@ -667,11 +754,7 @@ async def get_multiple_choice_gpt_prediction(
         "research_data": summary_report
     }
 
-    async def ask_llm_for_multiple_choice_probabilities(
-        content: str,
-    ) -> tuple[dict[str, float], str]:
-        rationale = await call_llm(content, model=model or FORECAST_MODEL, temperature=FORECAST_TEMP, thinking=thinking)
-
+    def get_probabilities_and_comment(rationale: str) -> tuple[dict[str, float], str]:
         option_probabilities = extract_option_probabilities_from_response(
             rationale, options
         )
@@ -686,9 +769,18 @@ async def get_multiple_choice_gpt_prediction(
         )
         return probability_yes_per_category, comment
 
-    probability_yes_per_category_and_comment_pairs = await asyncio.gather(
-        *[ask_llm_for_multiple_choice_probabilities(content) for _ in range(num_runs)]
-    )
+    async def draw(start_index: int, n: int) -> list[tuple[dict[str, float], str]]:
+        rationales = await call_llm_samples(
+            content, n, model=model or FORECAST_MODEL, temperature=FORECAST_TEMP,
+            thinking=thinking, start_index=start_index
+        )
+        return [get_probabilities_and_comment(r) for r in rationales]
+
+    with llm_lane("forecast"):
+        probability_yes_per_category_and_comment_pairs = await sample_until_converged(
+            draw, num_runs, "multiple_choice", lambda pair: [pair[0][o] for o in options], np.mean
+        )
+    trace["num_runs"] = len(probability_yes_per_category_and_comment_pairs)
     comments = [pair[1] for pair in probability_yes_per_category_and_comment_pairs]
     final_comment_sections = [
         f"## Rationale {i+1}\n{comment}" for i, comment in enumerate(comments)
@@ -2,19 +2,30 @@
 LLM client wrappers for OpenRouter and OpenAI.
 These are stable once configured and rarely need changes.
 """
-from openai import AsyncOpenAI
+import asyncio
+
 from config import (
     OPENROUTER_API_KEY, 
-    METACULUS_TOKEN, 
-    llm_rate_limiter,
     LLM_PROVIDER,
     DEFAULT_MODEL,
     DEFAULT_TEMP,
     METACULUS_PROXY_MODEL,
     METACULUS_PROXY_TEMP,
     REASONING_EFFORT,
-    REASONING_MAX_TOKENS
+    REASONING_MAX_TOKENS,
+    MULTI_SAMPLE_MODE,
+    N_PARAM_MODEL_PREFIXES,
+    PROMPT_CACHE_CONTROL_PREFIXES,
+    LLM_CALL_DEADLINE,
+)
+from llm_cache import cached_llm_call
+from llm_scheduler import llm_scheduler, estimate_tokens, request_deadline
+from llm_clients import (
+    get_openrouter_client,
+    get_metaculus_proxy_client,
 )
+from cost_ledger import record_generation
+from llm_hedging import hedged, with_fallbacks
 
 
 async def call_llm(
@@ -23,45 +34,215 @@ async def call_llm(
     temperature: float = DEFAULT_TEMP,
     provider: str = LLM_PROVIDER,
     thinking: bool = False,
-    return_stats: bool = False
+    return_stats: bool = False,
+    sample_index: int = 0,
+    cache_prompt: bool = False
 ) -> str | tuple[str, dict]:
     """
     Unified entry point for LLM calls. Routes to OpenRouter or Metaculus Proxy.
     
-    If return_stats=True and using OpenRouter, returns (response, stats_dict).
+    If return_stats=True and using OpenRouter, returns (response, stats_dict)
+    with the generation_id to look up in the cost ledger.
+    Responses go through the on-disk LLM cache (see llm_cache.py); sample_index
+    keeps repeated runs of the same prompt as separate cache entries.
+    cache_prompt marks the prompt as a provider-side cacheable prefix.
+    """
+    if provider == "openrouter":
+        request_for = lambda m: lambda: call_llm_openrouter(prompt, m, temperature, thinking, return_stats, cache_prompt)
+    elif provider == "metaculus_proxy":
+        request_for = lambda m: lambda: call_llm_metaculus_proxy(prompt, m, temperature)
+    else:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+    async def call_model(m: str):
+        key_parts = {
+            "provider": provider,
+            "model": m,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "reasoning": {"max_tokens": REASONING_MAX_TOKENS} if thinking else None,
+            "sample_index": sample_index,
+        }
+        return await cached_llm_call(
+            key_parts,
+            lambda: hedged(request_for(m), m),
+            serialize=lambda r: r[0] if isinstance(r, tuple) else r,
+        )
+
+    # Deadline, hedging and fallback models: see llm_hedging.py
+    result, from_cache = await with_fallbacks(call_model, model, provider)
+    if from_cache and return_stats:
+        return result, {"generation_id": None, "cached": True}
+    return result
+
+
+def sample_mode_for(provider: str, model: str) -> str:
+    """Resolve MULTI_SAMPLE_MODE ("auto" included) for a provider/model."""
+    if MULTI_SAMPLE_MODE != "auto":
+        return MULTI_SAMPLE_MODE
+    if provider == "metaculus_proxy" or model.startswith(N_PARAM_MODEL_PREFIXES):
+        return "n"
+    return "prefix_cache"
+
+
+def apply_prompt_cache(messages: list[dict], model: str) -> list[dict]:
+    """
+    Mark the last system/user message as a cacheable prefix for providers that
+    need an explicit cache_control breakpoint. Other models are returned as-is
+    since they cache long prefixes on their own.
     """
+    if not model.startswith(PROMPT_CACHE_CONTROL_PREFIXES):
+        return messages
+    prefix_end = max(
+        (i for i, m in enumerate(messages) if m.get("role") in ("system", "user")),
+        default=None,
+    )
+    if prefix_end is None or not isinstance(messages[prefix_end].get("content"), str):
+        return messages
+    marked = dict(messages[prefix_end])
+    marked["content"] = [{
+        "type": "text",
+        "text": marked["content"],
+        "cache_control": {"type": "ephemeral"},
+    }]
+    return messages[:prefix_end] + [marked] + messages[prefix_end + 1:]
+
+
+async def call_llm_samples(
+    prompt: str,
+    n: int,
+    model: str = DEFAULT_MODEL,
+    temperature: float = DEFAULT_TEMP,
+    provider: str = LLM_PROVIDER,
+    thinking: bool = False,
+    start_index: int = 0
+) -> list[str]:
+    """
+    Draw n independent completions of the same prompt without paying for the
+    prompt n times (see MULTI_SAMPLE_MODE in config):
+    - "n": a single request with the `n` parameter
+    - "prefix_cache": one request warms the provider's prompt cache, the other
+      n-1 run concurrently and are billed at the cached-input rate
+    - "off": n independent requests
+
+    start_index offsets the per-sample cache keys, so callers drawing samples
+    in several batches get fresh samples each time.
+    """
+    if n <= 0:
+        return []
+    mode = sample_mode_for(provider, model) if n > 1 else "off"
+    indices = list(range(start_index, start_index + n))
+
+    if mode == "n":
+        key_parts = {
+            "provider": provider,
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "reasoning": {"max_tokens": REASONING_MAX_TOKENS} if thinking else None,
+            "n": n,
+            "start_index": start_index,
+        }
+        request = lambda: call_llm_n(prompt, n, model, temperature, provider, thinking, start_index)
+        # Deadline from admission; hedged() only records latency for n > 1
+        with request_deadline(LLM_CALL_DEADLINE):
+            results, _ = await cached_llm_call(key_parts, lambda: hedged(request, model, n=n))
+        return results
+
+    cache_prompt = mode == "prefix_cache"
+    sample = lambda i: call_llm(
+        prompt, model=model, temperature=temperature, provider=provider,
+        thinking=thinking, sample_index=i, cache_prompt=cache_prompt,
+    )
+    if cache_prompt:
+        first = await sample(indices[0])
+        rest = await asyncio.gather(*[sample(i) for i in indices[1:]])
+        return [first, *rest]
+    return list(await asyncio.gather(*[sample(i) for i in indices]))
+
+
+async def call_llm_n(
+    prompt: str,
+    n: int,
+    model: str,
+    temperature: float,
+    provider: str = LLM_PROVIDER,
+    thinking: bool = False,
+    start_index: int = 0
+) -> list[str]:
+    """One streaming request returning n completions (the `n` parameter)."""
+    extra_body = {}
     if provider == "openrouter":
-        return await call_llm_openrouter(prompt, model, temperature, thinking, return_stats)
+        client = get_openrouter_client()
+        if thinking:
+            extra_body["reasoning"] = {"max_tokens": REASONING_MAX_TOKENS}
     elif provider == "metaculus_proxy":
-        return await call_llm_metaculus_proxy(prompt, model, temperature)
+        client = get_metaculus_proxy_client()
     else:
         raise ValueError(f"Unknown LLM provider: {provider}")
 
+    generation_ids = []
+
+    async def stream_completions() -> list[str]:
+        collected = [[] for _ in range(n)]
+        print(f"Sending request to {provider} with model: {model} (n={n})")
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            n=n,
+            stream=True,
+            extra_body=extra_body or None
+        )
+        async with stream:
+            async for chunk in stream:
+                if not generation_ids and getattr(chunk, 'id', None):
+                    generation_ids.append(chunk.id)
+                for choice in chunk.choices:
+                    if choice.delta.content is not None and choice.index < n:
+                        collected[choice.index].append(choice.delta.content)
+        return ["".join(parts) for parts in collected]
+
+    try:
+        results = await llm_scheduler.run(
+            stream_completions, provider, model, estimate_tokens(prompt)
+        )
+    except Exception as e:
+        print(f"Error in call_llm_n: {str(e)}")
+        raise
+    record_generation(generation_ids[0] if generation_ids else None, model, provider)
+
+    if any(not r for r in results):
+        # Provider ignored `n`; top up with independent requests
+        missing = [i for i, r in enumerate(results) if not r]
+        print(f"[LLM] {model} returned {n - len(missing)}/{n} samples, requesting the rest separately")
+        extra = await asyncio.gather(*[
+            call_llm(prompt, model=model, temperature=temperature, provider=provider,
+                     thinking=thinking, sample_index=start_index + i)
+            for i in missing
+        ])
+        for i, r in zip(missing, extra):
+            results[i] = r
+    return results
+
 
 async def call_llm_openrouter(
     prompt: str, 
     model: str = "google/gemini-2.0-flash-001", 
     temperature: float = 0.9,
     thinking: bool = False,
-    return_stats: bool = False
+    return_stats: bool = False,
+    cache_prompt: bool = False
 ) -> str | tuple[str, dict]:
     """
-    Makes a streaming completion request to OpenRouter's API with rate limiting.
+    Makes a streaming completion request to OpenRouter's API, admitted by the
+    per-model rate limits in llm_scheduler.
     
-    If return_stats=True, returns (response, stats_dict) where stats_dict contains
-    generation_id, tokens, and cost info.
+    If return_stats=True, returns (response, stats_dict) where stats_dict holds
+    the generation_id; tokens and cost arrive in the cost ledger once the
+    background collector has fetched them.
     """
-    import httpx
-    
-    client = AsyncOpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=OPENROUTER_API_KEY,
-        default_headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        },
-        max_retries=2,
-    )
+    client = get_openrouter_client()
 
     extra_body = {}
     if thinking:
@@ -71,21 +252,26 @@ async def call_llm_openrouter(
             "max_tokens": REASONING_MAX_TOKENS
         }
 
-    async with llm_rate_limiter:
+    messages = [{"role": "user", "content": prompt}]
+    if cache_prompt:
+        messages = apply_prompt_cache(messages, model)
+
+    async def stream_completion() -> tuple[str, str | None]:
         collected_content = []
         generation_id = None
-        try:
-            print(f"Sending request to OpenRouter with model: {model} (Thinking: {thinking})")
-            stream = await client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                top_p=1.0,
-                stream=True,
-                extra_body=extra_body
-            )
-
-            print("Receiving streamed response...")
+        print(f"Sending request to OpenRouter with model: {model} (Thinking: {thinking})")
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            top_p=1.0,
+            stream=True,
+            extra_body=extra_body
+        )
+
+        print("Receiving streamed response...")
+        # `async with` closes the connection if a hedge or deadline cancels us
+        async with stream:
             async for chunk in stream:
                 # Capture the generation ID from first chunk
                 if generation_id is None and hasattr(chunk, 'id'):
@@ -93,54 +279,22 @@ async def call_llm_openrouter(
                 if chunk.choices and chunk.choices[0].delta.content is not None:
                     collected_content.append(chunk.choices[0].delta.content)
 
-            result = "".join(collected_content)
-            
-            if return_stats and generation_id:
-                stats = await fetch_generation_stats(generation_id)
-                return result, stats
-            
-            return result
+        return "".join(collected_content), generation_id
 
-        except Exception as e:
-            print(f"Error in call_llm_openrouter: {str(e)}")
-            raise
-
-
-async def fetch_generation_stats(generation_id: str) -> dict:
-    """
-    Fetch generation statistics (native tokens, cost) from OpenRouter.
-    
-    Uses the /api/v1/generation endpoint to get accurate token counts
-    and costs based on the model's native tokenizer.
-    """
-    import httpx
-    import asyncio
-    
-    url = f"https://openrouter.ai/api/v1/generation?id={generation_id}"
-    headers = {"Authorization": f"Bearer {OPENROUTER_API_KEY}"}
-    
-    # Wait a moment for OpenRouter to process the generation
-    await asyncio.sleep(0.5)
-    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=10.0)
-            if response.status_code == 200:
-                data = response.json().get("data", {})
-                return {
-                    "generation_id": generation_id,
-                    "native_tokens_prompt": data.get("native_tokens_prompt", 0),
-                    "native_tokens_completion": data.get("native_tokens_completion", 0),
-                    "total_cost": data.get("total_cost", 0.0),
-                    "model": data.get("model", ""),
-                    "usage": data.get("usage", {}),
-                }
-            else:
-                print(f"[Stats] Failed to fetch generation stats: {response.status_code}")
-                return {"generation_id": generation_id, "error": f"HTTP {response.status_code}"}
+        result, generation_id = await llm_scheduler.run(
+            stream_completion, "openrouter", model, estimate_tokens(prompt)
+        )
     except Exception as e:
-        print(f"[Stats] Error fetching generation stats: {e}")
-        return {"generation_id": generation_id, "error": str(e)}
+        print(f"Error in call_llm_openrouter: {str(e)}")
+        raise
+
+    # Token counts and cost are collected in the background (see cost_ledger.py)
+    record_generation(generation_id, model)
+    if return_stats:
+        return result, {"generation_id": generation_id, "pending": True}
+
+    return result
 
 
 async def call_llm_metaculus_proxy(
@@ -151,35 +305,32 @@ async def call_llm_metaculus_proxy(
     """
     Makes a streaming completion request to OpenAI via Metaculus proxy.
     """
-    client = AsyncOpenAI(
-        base_url="https://llm-proxy.metaculus.com/proxy/openai/v1",
-        default_headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Token {METACULUS_TOKEN}",
-        },
-        api_key="placeholder",  # Required by openai package but not used
-        max_retries=2,
-    )
+    client = get_metaculus_proxy_client()
 
-    async with llm_rate_limiter:
+    async def stream_completion() -> str:
         collected_content = []
-        try:
-            print(f"Sending request to Metaculus Proxy with model: {model}")
-            stream = await client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                stream=True,
-            )
+        print(f"Sending request to Metaculus Proxy with model: {model}")
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            stream=True,
+        )
 
+        async with stream:
             async for chunk in stream:
                 if chunk.choices and chunk.choices[0].delta.content is not None:
                     collected_content.append(chunk.choices[0].delta.content)
 
-            return "".join(collected_content)
-        except Exception as e:
-            print(f"Error in call_llm_metaculus_proxy: {str(e)}")
-            raise
+        return "".join(collected_content)
+
+    try:
+        return await llm_scheduler.run(
+            stream_completion, "metaculus_proxy", model, estimate_tokens(prompt)
+        )
+    except Exception as e:
+        print(f"Error in call_llm_metaculus_proxy: {str(e)}")
+        raise
 
 
 # Backward compatibility if needed
@@ -0,0 +1,159 @@
+"""
+Content-addressed on-disk cache for LLM responses.
+
+Keys are a SHA-256 over everything that determines a completion: provider,
+model, messages, tool schemas, temperature, reasoning settings and the sample
+index (so NUM_RUNS_PER_QUESTION > 1 still gets independent samples). Entries
+live in one SQLite file and are evicted least-recently-used once the stored
+responses exceed LLM_CACHE_MAX_BYTES.
+
+Modes (config.LLM_CACHE_MODE, the LLM_CACHE_MODE env var, or set_cache_mode()):
+    off           - never read or write the cache
+    read_through  - serve hits, call the API and store on a miss
+    record        - always call the API and overwrite the stored response
+    replay        - serve hits only; a miss raises LLMCacheMiss
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from config import LLM_CACHE_MODE, LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES
+
+CACHE_MODES = ("off", "read_through", "record", "replay")
+
+_mode = LLM_CACHE_MODE
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode when a request has no cached response."""
+
+
+def set_cache_mode(mode: str) -> None:
+    """Switch the cache mode for the rest of the process."""
+    global _mode
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown LLM cache mode: {mode}. Options: {CACHE_MODES}")
+    _mode = mode
+    print(f"[LLM Cache] Mode set to '{mode}' ({LLM_CACHE_PATH})")
+
+
+def get_cache_mode() -> str:
+    return _mode
+
+
+def get_cache_stats() -> dict:
+    return dict(_stats, mode=_mode)
+
+
+def make_cache_key(**parts: Any) -> str:
+    """Hash the request parts into a stable cache key."""
+    canonical = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        path = Path(LLM_CACHE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(path), check_same_thread=False)
+        _conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        _conn.commit()
+    return _conn
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """Return the cached value for key (and bump its LRU position), or None."""
+    with _lock:
+        conn = _get_conn()
+        row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+    return json.loads(row[0])
+
+
+def cache_put(key: str, value: Any, model: str = "") -> None:
+    """Store value under key, then evict least-recently-used rows if over budget."""
+    payload = json.dumps(value, default=str)
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, payload, len(payload), now, now),
+        )
+        _stats["writes"] += 1
+        _evict_if_needed(conn)
+        conn.commit()
+
+
+def _evict_if_needed(conn: sqlite3.Connection) -> None:
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    if total <= LLM_CACHE_MAX_BYTES:
+        return
+    # Trim to 90% of the budget so we don't evict on every write
+    target = int(LLM_CACHE_MAX_BYTES * 0.9)
+    rows = conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+    evicted = []
+    for key, size in rows:
+        if total <= target:
+            break
+        evicted.append((key,))
+        total -= size
+    conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+    _stats["evictions"] += len(evicted)
+
+
+async def cached_llm_call(
+    key_parts: dict,
+    call: Callable[[], Awaitable[Any]],
+    serialize: Callable[[Any], Any] = lambda v: v,
+    deserialize: Callable[[Any], Any] = lambda v: v,
+) -> tuple[Any, bool]:
+    """
+    Run an LLM call through the cache according to the current mode.
+
+    Returns (value, from_cache). serialize/deserialize convert the call's
+    return value to and from something JSON-serializable.
+    """
+    if _mode == "off":
+        return await call(), False
+
+    key = make_cache_key(**key_parts)
+    model = str(key_parts.get("model", ""))
+
+    if _mode in ("read_through", "replay"):
+        cached = cache_get(key)
+        if cached is not None:
+            _stats["hits"] += 1
+            print(f"[LLM Cache] Hit for {model} ({key[:12]})")
+            return deserialize(cached), True
+        _stats["misses"] += 1
+        if _mode == "replay":
+            raise LLMCacheMiss(f"No cached response for {model} (key {key[:12]}) in replay mode")
+
+    value = await call()
+    cache_put(key, serialize(value), model=model)
+    return value, False
@@ -0,0 +1,121 @@
+"""
+Process-wide registry of pooled LLM clients.
+
+Every LLM entry point (llm.call_llm_openrouter, llm.call_llm_metaculus_proxy,
+tools.executor.call_llm_with_tools) shares one AsyncOpenAI client per provider.
+The clients sit on a long-lived httpx connection pool with keep-alive and
+HTTP/2 multiplexing (h2 is locked via the httpx[http2] dependency; an install
+without it falls back to HTTP/1.1) - so a run pays for one TLS handshake per
+provider instead of one per call.
+
+Call close_llm_clients() once at the end of a run to release the connections.
+"""
+import asyncio
+
+import httpx
+from openai import AsyncOpenAI
+
+try:
+    import h2  # noqa: F401  (only needed so httpx can speak HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from config import (
+    OPENROUTER_API_KEY,
+    METACULUS_TOKEN,
+    LLM_HTTP2,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_CONNECT_TIMEOUT,
+    LLM_REQUEST_TIMEOUT,
+)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+METACULUS_PROXY_BASE_URL = "https://llm-proxy.metaculus.com/proxy/openai/v1"
+
+# name -> (event loop the client was created on, client)
+# httpx pools are bound to the loop that opened them, so a client is rebuilt
+# if a later asyncio.run() asks for it from a different loop.
+_clients: dict[str, tuple[asyncio.AbstractEventLoop, object]] = {}
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Create an httpx client with the configured pool limits."""
+    return httpx.AsyncClient(
+        http2=LLM_HTTP2 and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+    )
+
+
+def _get_or_create(name: str, factory):
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(name)
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+    client = factory()
+    _clients[name] = (loop, client)
+    return client
+
+
+def get_openrouter_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client for OpenRouter."""
+    return _get_or_create(
+        "openrouter",
+        lambda: AsyncOpenAI(
+            base_url=OPENROUTER_BASE_URL,
+            api_key=OPENROUTER_API_KEY,
+            default_headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            },
+            max_retries=0,  # Retries go through llm_scheduler
+            http_client=_build_http_client(),
+        ),
+    )
+
+
+def get_metaculus_proxy_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client for the Metaculus OpenAI proxy."""
+    return _get_or_create(
+        "metaculus_proxy",
+        lambda: AsyncOpenAI(
+            base_url=METACULUS_PROXY_BASE_URL,
+            default_headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Token {METACULUS_TOKEN}",
+            },
+            api_key="placeholder",  # Required by openai package but not used
+            max_retries=0,  # Retries go through llm_scheduler
+            http_client=_build_http_client(),
+        ),
+    )
+
+
+def get_openrouter_http_client() -> httpx.AsyncClient:
+    """Shared raw httpx client for OpenRouter REST endpoints (e.g. /generation)."""
+    return _get_or_create("openrouter_http", _build_http_client)
+
+
+async def close_llm_clients() -> None:
+    """Close every pooled client. Safe to call more than once."""
+    loop = asyncio.get_running_loop()
+    entries = list(_clients.items())
+    _clients.clear()
+    for name, (client_loop, client) in entries:
+        if client_loop is not loop:
+            # Created on a loop that is gone; its sockets died with it.
+            continue
+        try:
+            if isinstance(client, AsyncOpenAI):
+                await client.close()
+            else:
+                await client.aclose()
+        except Exception as e:
+            print(f"[LLM Clients] Error closing {name} client: {e}")
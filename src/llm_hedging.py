@@ -0,0 +1,164 @@
+"""
+Deadlines, request hedging and fallback models for LLM calls.
+
+OpenRouter streams occasionally stall for minutes. Two layers keep one slow
+call from holding up a whole run:
+
+- hedged(): if a request is still running HEDGE_PERCENTILE of the latency
+  recently seen for its (model, n) after the scheduler admitted it, a
+  duplicate is fired and whichever finishes first wins (the other is
+  cancelled). Latencies are measured from admission, so a backed-up queue
+  does not look like a slow model; no hedge is sent while the model's budget
+  is congested, and multi-sample (n > 1) requests are never hedged.
+- with_fallbacks(): each admitted request gets LLM_CALL_DEADLINE seconds
+  (time queued in the scheduler does not count). On a timeout, connection
+  error, 429 or 5xx the next model in FALLBACK_MODELS is tried, in order;
+  other 4xx errors are the request's fault and are raised as they are.
+
+get_hedging_stats() reports which path won (primary, hedge, fallback) so the
+percentile and cascade can be tuned from real runs.
+"""
+import asyncio
+from collections import Counter, defaultdict, deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import numpy as np
+import openai
+
+from config import (
+    LLM_CALL_DEADLINE,
+    LLM_HEDGING,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    FALLBACK_MODELS,
+)
+from llm_scheduler import ModelBudget, observe_requests, request_deadline
+
+T = TypeVar("T")
+
+# (model, n) -> recent post-admission latencies of successful requests
+_latencies: dict[tuple[str, int], deque] = defaultdict(lambda: deque(maxlen=200))
+_metrics: Counter = Counter()
+
+
+def falls_back(error: BaseException) -> bool:
+    """Whether error moves the cascade on to the next model."""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    # Connection errors and errors reported mid-stream
+    return isinstance(error, openai.APIError)
+
+
+def hedge_delay(model: str, n: int = 1) -> float | None:
+    """Seconds after admission to wait before hedging a call to model, or None to not hedge."""
+    samples = _latencies[(model, n)]
+    if not LLM_HEDGING or n > 1 or len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return max(HEDGE_MIN_DELAY, float(np.percentile(samples, HEDGE_PERCENTILE)))
+
+
+class _Attempt:
+    """Scheduler observer for one attempt: when it was admitted, and its latency."""
+
+    def __init__(self, key: tuple[str, int]):
+        self.key = key
+        self.admitted = asyncio.Event()
+        self.budget: Optional[ModelBudget] = None
+
+    def on_admitted(self, budget: ModelBudget) -> None:
+        self.budget = budget
+        self.admitted.set()
+
+    def on_success(self, seconds: float) -> None:
+        _latencies[self.key].append(seconds)
+
+
+async def _observed(request: Callable[[], Awaitable[T]], attempt: _Attempt) -> T:
+    with observe_requests(attempt):
+        return await request()
+
+
+async def hedged(request: Callable[[], Awaitable[T]], model: str, n: int = 1) -> T:
+    """Run request, firing one duplicate if it is slower than usual for (model, n) once admitted."""
+    delay = hedge_delay(model, n)
+    attempt = _Attempt((model, n))
+    primary = asyncio.ensure_future(_observed(request, attempt))
+    if delay is None:
+        result = await primary
+        _metrics["won:primary"] += 1
+        return result
+
+    tasks = {primary: "primary"}
+    admitted = asyncio.ensure_future(attempt.admitted.wait())
+    try:
+        # The hedge clock starts at admission; a queued primary is not slow
+        await asyncio.wait([primary, admitted], return_when=asyncio.FIRST_COMPLETED)
+        if not primary.done():
+            await asyncio.wait([primary], timeout=delay)
+        if not primary.done():
+            if attempt.budget is not None and attempt.budget.congested:
+                # A duplicate would only queue behind (or crowd out) other calls
+                _metrics["hedges_skipped:congested"] += 1
+            else:
+                print(f"[Hedging] {model} still running {delay:.1f}s after admission, sending a hedge request")
+                _metrics["hedges_sent"] += 1
+                tasks[asyncio.ensure_future(_observed(request, _Attempt((model, n))))] = "hedge"
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    _metrics[f"won:{tasks[task]}"] += 1
+                    return task.result()
+        # Every attempt failed; surface the primary's error
+        return primary.result()
+    finally:
+        admitted.cancel()
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def with_fallbacks(
+    call_for_model: Callable[[str], Awaitable[T]],
+    model: str,
+    provider: str = "openrouter",
+) -> T:
+    """
+    Call call_for_model(model) with each admitted request limited to
+    LLM_CALL_DEADLINE seconds, moving down the FALLBACK_MODELS cascade on
+    errors falls_back() accepts.
+    """
+    cascade = [model]
+    if provider == "openrouter":
+        cascade += FALLBACK_MODELS.get(model, [])
+
+    for position, candidate in enumerate(cascade):
+        try:
+            with request_deadline(LLM_CALL_DEADLINE):
+                result = await call_for_model(candidate)
+        except Exception as e:
+            if not falls_back(e):
+                raise
+            reason = "timeout" if isinstance(e, asyncio.TimeoutError) else type(e).__name__
+            _metrics[f"failed:{candidate}:{reason}"] += 1
+            if position == len(cascade) - 1:
+                raise
+            print(f"[Fallback] {candidate} failed ({reason}), falling back to {cascade[position + 1]}")
+            continue
+        if position:
+            _metrics[f"won:fallback:{candidate}"] += 1
+        return result
+    raise RuntimeError("unreachable")
+
+
+def get_hedging_stats() -> dict:
+    """Win/failure counters plus the current hedge delay per model."""
+    return {
+        "counts": dict(_metrics),
+        "hedge_delay": {f"{model} (n={n})": hedge_delay(model, n) for model, n in _latencies},
+    }
@@ -0,0 +1,346 @@
+"""
+Rate-aware scheduler for LLM calls.
+
+Replaces the old global asyncio.Semaphore with one budget per provider/model:
+- a requests-per-minute token bucket
+- a prompt-tokens-per-minute token bucket (prompt size estimated up front)
+- a cap on requests in flight
+
+Budgets are configured in config.LLM_RATE_LIMITS. Because each model has its
+own budget, a burst of Grok research calls can no longer starve Opus forecast
+calls. On a 429 the scheduler honours Retry-After, pauses that model, halves
+its effective rate and then recovers it gradually on success.
+
+Waiting requests are admitted in priority order rather than FIFO. Priority is
+(lane, question rank): the lane ranks the kind of work (final forecast above
+synthesis above the research tool loop above initial filtering) and the
+question rank - assigned in start order by question_scope() - breaks ties in
+favour of questions that started earlier. Both are carried in contextvars,
+so they follow the work into asyncio.gather()ed tasks without being threaded
+through every call signature:
+
+    with question_scope():
+        with llm_lane("forecast"):
+            await call_llm(...)
+
+Two more contextvars let llm_hedging see requests from admission onwards:
+request_deadline() bounds how long an admitted request may run, and
+observe_requests() is told when a request is admitted and how long it took.
+Time spent queued for a model's budget counts against neither.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+from config import LLM_RATE_LIMITS, LLM_MAX_RETRIES, CHARS_PER_TOKEN
+
+T = TypeVar("T")
+
+# Lower value = admitted first
+LANES = {
+    "forecast": 0,
+    "synthesis": 1,
+    "tool_loop": 2,
+    "filter": 3,
+}
+DEFAULT_LANE = "filter"
+
+_lane: contextvars.ContextVar[str] = contextvars.ContextVar("llm_lane", default=DEFAULT_LANE)
+_question_rank: contextvars.ContextVar[float] = contextvars.ContextVar(
+    "llm_question_rank", default=float("inf")
+)
+_question_label: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "llm_question_label", default=None
+)
+_question_counter = itertools.count()
+_request_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "llm_request_deadline", default=None
+)
+_request_observer: contextvars.ContextVar[Optional[Any]] = contextvars.ContextVar(
+    "llm_request_observer", default=None
+)
+
+# Errors worth retrying (the pooled clients run with max_retries=0 so that
+# every retry goes back through the scheduler)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+)
+
+
+def estimate_tokens(content: Any) -> int:
+    """Rough prompt-token estimate from a prompt string or a message list."""
+    if isinstance(content, str):
+        chars = len(content)
+    elif isinstance(content, list):
+        chars = 0
+        for message in content:
+            body = message.get("content") if isinstance(message, dict) else message
+            chars += len(body) if isinstance(body, str) else len(str(body or ""))
+    else:
+        chars = len(str(content))
+    return max(1, chars // CHARS_PER_TOKEN)
+
+
+@contextmanager
+def llm_lane(lane: str):
+    """Run the enclosed LLM calls in the given priority lane."""
+    if lane not in LANES:
+        raise ValueError(f"Unknown LLM lane: {lane}. Options: {list(LANES)}")
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+@contextmanager
+def question_scope(rank: Optional[int] = None, label: Optional[str] = None):
+    """
+    Tag the enclosed LLM calls as belonging to one question. Questions are
+    ranked in the order they enter their scope unless a rank is given; the
+    label (e.g. the post id) is what the cost ledger records.
+    """
+    rank_token = _question_rank.set(next(_question_counter) if rank is None else rank)
+    label_token = _question_label.set(label)
+    try:
+        yield
+    finally:
+        _question_label.reset(label_token)
+        _question_rank.reset(rank_token)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]):
+    """Time out each enclosed LLM request `seconds` after the scheduler admits it."""
+    token = _request_deadline.set(seconds)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+@contextmanager
+def observe_requests(observer):
+    """
+    Report the enclosed LLM requests to observer: observer.on_admitted(budget)
+    each time one is admitted, observer.on_success(seconds) with the latency
+    of each one that succeeds (from admission, so queueing is excluded).
+    """
+    token = _request_observer.set(observer)
+    try:
+        yield
+    finally:
+        _request_observer.reset(token)
+
+
+def current_priority() -> tuple:
+    """Priority of an LLM call made from the current context (lower runs first)."""
+    return (LANES[_lane.get()], _question_rank.get())
+
+
+def current_lane() -> str:
+    return _lane.get()
+
+
+def current_question_label() -> Optional[str]:
+    return _question_label.get()
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read Retry-After (seconds or HTTP date) from an API error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` tokens, refilled over one minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, rate_scale: float) -> None:
+        now = time.monotonic()
+        rate = self.capacity * rate_scale / 60.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+    def delay_for(self, amount: float, rate_scale: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill(rate_scale)
+        amount = min(amount, self.capacity)  # oversized requests wait for a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / (self.capacity * rate_scale / 60.0)
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+class ModelBudget:
+    """Request/token buckets, in-flight cap and waiting queue for one model."""
+
+    def __init__(self, name: str, rpm: int, tpm: int, max_concurrency: int):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.rate_scale = 1.0  # Shrinks on 429s, recovers on success
+        self.cooldown_until = 0.0
+        self._waiters: list[list] = []  # heap of [priority, seq, event]
+        self._seq = itertools.count()
+
+    def _delay(self, prompt_tokens: int) -> float:
+        cooldown = self.cooldown_until - time.monotonic()
+        return max(
+            cooldown,
+            self.requests.delay_for(1, self.rate_scale),
+            self.tokens.delay_for(prompt_tokens, self.rate_scale),
+        )
+
+    @property
+    def congested(self) -> bool:
+        """True when another request would have to queue."""
+        return bool(self._waiters) or self.in_flight >= self.max_concurrency
+
+    def _wake_next(self) -> None:
+        if self._waiters:
+            self._waiters[0][2].set()
+
+    async def acquire(self, prompt_tokens: int, priority: tuple) -> None:
+        entry = [priority, next(self._seq), asyncio.Event()]
+        heapq.heappush(self._waiters, entry)
+        try:
+            while True:
+                timeout = None
+                if self._waiters[0] is entry and self.in_flight < self.max_concurrency:
+                    timeout = self._delay(prompt_tokens)
+                    if timeout <= 0:
+                        break
+                entry[2].clear()
+                try:
+                    await asyncio.wait_for(entry[2].wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self._wake_next()
+            raise
+
+        heapq.heappop(self._waiters)
+        self.requests.consume(1)
+        self.tokens.consume(prompt_tokens)
+        self.in_flight += 1
+        self._wake_next()
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake_next()
+
+    def on_success(self) -> None:
+        self.rate_scale = min(1.0, self.rate_scale + 0.05)
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> float:
+        self.rate_scale = max(0.1, self.rate_scale * 0.5)
+        wait = retry_after if retry_after is not None else 5.0
+        self.cooldown_until = max(self.cooldown_until, time.monotonic() + wait)
+        return wait
+
+
+class LLMScheduler:
+    """Admits LLM requests against per-provider/model budgets."""
+
+    def __init__(self, limits: dict):
+        self.limits = limits
+        self._budgets: dict[str, ModelBudget] = {}
+
+    def _limits_for(self, key: str) -> dict:
+        # Longest configured prefix wins, e.g. "openrouter/anthropic/" beats "openrouter"
+        matches = [k for k in self.limits if k != "default" and key.startswith(k)]
+        if not matches:
+            return self.limits["default"]
+        return {**self.limits["default"], **self.limits[max(matches, key=len)]}
+
+    def budget(self, provider: str, model: str) -> ModelBudget:
+        key = f"{provider}/{model}"
+        if key not in self._budgets:
+            cfg = self._limits_for(key)
+            self._budgets[key] = ModelBudget(key, cfg["rpm"], cfg["tpm"], cfg["max_concurrency"])
+        return self._budgets[key]
+
+    async def run(
+        self,
+        request: Callable[[], Awaitable[T]],
+        provider: str,
+        model: str,
+        prompt_tokens: int,
+        priority: Optional[tuple] = None,
+        max_retries: int = LLM_MAX_RETRIES,
+    ) -> T:
+        """
+        Run `request` once admitted by the model's budget, retrying transient
+        errors (429s after their Retry-After, others with jittered backoff).
+        Priority defaults to the caller's lane and question (current_priority()).
+        Each attempt times out after the caller's request_deadline(), counted
+        from its admission.
+        """
+        budget = self.budget(provider, model)
+        if priority is None:
+            priority = current_priority()
+        deadline = _request_deadline.get()
+        observer = _request_observer.get()
+        for attempt in range(max_retries + 1):
+            await budget.acquire(prompt_tokens, priority)
+            if observer is not None:
+                observer.on_admitted(budget)
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(request(), timeout=deadline)
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, openai.RateLimitError):
+                    wait = budget.on_rate_limited(_retry_after_seconds(e))
+                    print(f"[LLM Scheduler] 429 from {budget.name}; pausing {wait:.1f}s "
+                          f"(rate scale now {budget.rate_scale:.2f})")
+                else:
+                    wait = min(30.0, 2 ** attempt) * (0.5 + random.random())
+                if attempt >= max_retries:
+                    raise
+                print(f"[LLM Scheduler] {type(e).__name__} on {budget.name}, "
+                      f"retry {attempt + 1}/{max_retries} in {wait:.1f}s")
+            else:
+                budget.on_success()
+                if observer is not None:
+                    observer.on_success(time.monotonic() - started)
+                return result
+            finally:
+                budget.release()
+            await asyncio.sleep(wait)
+        raise RuntimeError("unreachable")
+
+
+llm_scheduler = LLMScheduler(LLM_RATE_LIMITS)
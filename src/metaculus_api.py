@@ -1,53 +1,64 @@
 """
 Metaculus API interactions.
 All functions here are standardized and should rarely need modification.
+
+Requests go through the pooled async client in metaculus_client.py. The plain
+functions block (for scripts and backtests); async code should use the
+*_async variants.
 """
+import asyncio
 import json
-import requests
 import zipfile
 import io
 import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from config import AUTH_HEADERS, API_BASE_URL, TOURNAMENT_ID
+from typing import AsyncIterator, Iterator, Optional
+from config import API_BASE_URL, TOURNAMENT_ID, LISTING_PAGE_SIZE, LISTING_MAX_CONCURRENCY
+from post_store import PostStore
+from question_grid import grid_for_question
+import metaculus_client
+from metaculus_client import run_sync
 
 
-def post_question_comment(post_id: int, comment_text: str) -> None:
+async def post_question_comment_async(post_id: int, comment_text: str) -> None:
     """
     Post a comment on the question page as the bot user.
     """
-    response = requests.post(
-        f"{API_BASE_URL}/comments/create/",
-        json={
+    await metaculus_client.post_json(
+        "/comments/create/",
+        {
             "text": comment_text,
             "parent": None,
             "included_forecast": True,
             "is_private": True,
             "on_post": post_id,
         },
-        **AUTH_HEADERS,
     )
-    if not response.ok:
-        raise RuntimeError(response.text)
 
 
-def post_question_prediction(question_id: int, forecast_payload: dict) -> None:
+async def post_question_prediction_async(question_id: int, forecast_payload: dict) -> None:
     """
     Post a forecast on a question.
     """
-    url = f"{API_BASE_URL}/questions/forecast/"
-    response = requests.post(
-        url,
-        json=[
+    response = await metaculus_client.post_json(
+        "/questions/forecast/",
+        [
             {
                 "question": question_id,
                 **forecast_payload,
             },
         ],
-        **AUTH_HEADERS,
     )
     print(f"Prediction Post status code: {response.status_code}")
-    if not response.ok:
-        raise RuntimeError(response.text)
+
+
+def post_question_comment(post_id: int, comment_text: str) -> None:
+    run_sync(post_question_comment_async(post_id, comment_text))
+
+
+def post_question_prediction(question_id: int, forecast_payload: dict) -> None:
+    run_sync(post_question_prediction_async(question_id, forecast_payload))
 
 
 def create_forecast_payload(
@@ -100,27 +111,133 @@ def list_posts_from_tournament(
         "statuses": "open",
         "include_description": "true",
     }
-    url = f"{API_BASE_URL}/posts/"
-    response = requests.get(url, **AUTH_HEADERS, params=url_qparams)
-    if not response.ok:
-        raise Exception(response.text)
-    data = json.loads(response.content)
-    return data
+    return run_sync(metaculus_client.get_json("/posts/", params=url_qparams))
 
 
-def get_open_question_ids_from_tournament(tournament_id: str = TOURNAMENT_ID) -> list[tuple[int, int, str]]:
+def _listing_params(tournament_id: int | str, statuses: str, order_by: str, offset: int, count: int) -> dict:
+    return {
+        "limit": count,
+        "offset": offset,
+        "order_by": order_by,
+        "forecast_type": ",".join(["binary", "multiple_choice", "numeric"]),
+        "tournaments": [tournament_id],
+        "statuses": statuses,
+        "include_description": "true",
+    }
+
+
+def iter_tournament_posts(
+    tournament_id: int | str = TOURNAMENT_ID,
+    statuses: str = "open",
+    order_by: str = "-publish_time",
+    limit: Optional[int] = None,
+    page_size: int = LISTING_PAGE_SIZE,
+    max_concurrency: int = LISTING_MAX_CONCURRENCY,
+) -> Iterator[dict]:
     """
-    Get all open question IDs from the configured tournament.
-    Returns list of (question_id, post_id, title) tuples.
+    Yield every post of a tournament (up to limit), page by page.
+
+    The first page tells us the total count; the remaining offsets are then
+    fetched concurrently (at most max_concurrency at once) and their posts
+    yielded as each page arrives, so order across pages is not preserved.
+    If the response carries no count, pages are followed one by one instead.
+    """
+    def fetch_page(offset: int, count: int) -> dict:
+        params = _listing_params(tournament_id, statuses, order_by, offset, count)
+        return run_sync(metaculus_client.get_json("/posts/", params=params))
+
+    first_size = page_size if limit is None else min(page_size, limit)
+    first = fetch_page(0, first_size)
+    results = first.get("results", [])
+    yield from results
+    if len(results) < first_size:
+        return
+
+    total = first.get("count")
+    if total is None:
+        # No count to plan with: follow pages until one comes back short
+        offset = len(results)
+        while limit is None or offset < limit:
+            count = page_size if limit is None else min(page_size, limit - offset)
+            page = fetch_page(offset, count).get("results", [])
+            yield from page
+            offset += len(page)
+            if len(page) < count:
+                return
+        return
+
+    end = total if limit is None else min(total, limit)
+    offsets = range(len(results), end, page_size)
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        futures = [pool.submit(fetch_page, offset, min(page_size, end - offset)) for offset in offsets]
+        for future in as_completed(futures):
+            yield from future.result().get("results", [])
+
+
+async def iter_tournament_posts_async(
+    tournament_id: int | str = TOURNAMENT_ID,
+    statuses: str = "open",
+    order_by: str = "-publish_time",
+    limit: Optional[int] = None,
+    page_size: int = LISTING_PAGE_SIZE,
+    max_concurrency: int = LISTING_MAX_CONCURRENCY,
+) -> AsyncIterator[dict]:
+    """
+    iter_tournament_posts on the running loop: the remaining pages are
+    requested as tasks (at most max_concurrency at once) instead of threads.
     """
-    posts = list_posts_from_tournament(tournament_id=tournament_id)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_page(offset: int, count: int) -> dict:
+        params = _listing_params(tournament_id, statuses, order_by, offset, count)
+        async with semaphore:
+            return await metaculus_client.get_json("/posts/", params=params)
+
+    first_size = page_size if limit is None else min(page_size, limit)
+    first = await fetch_page(0, first_size)
+    results = first.get("results", [])
+    for post in results:
+        yield post
+    if len(results) < first_size:
+        return
+
+    total = first.get("count")
+    if total is None:
+        offset = len(results)
+        while limit is None or offset < limit:
+            count = page_size if limit is None else min(page_size, limit - offset)
+            page = (await fetch_page(offset, count)).get("results", [])
+            for post in page:
+                yield post
+            offset += len(page)
+            if len(page) < count:
+                return
+        return
+
+    end = total if limit is None else min(total, limit)
+    pages = [
+        asyncio.ensure_future(fetch_page(offset, min(page_size, end - offset)))
+        for offset in range(len(results), end, page_size)
+    ]
+    try:
+        for page in asyncio.as_completed(pages):
+            for post in (await page).get("results", []):
+                yield post
+    finally:
+        for page in pages:
+            page.cancel()
+
+
+def _open_questions(posts: list[dict]) -> list[dict]:
+    # Keep the full payloads so callers can skip a /posts/{id}/ request
+    post_store.add_posts(posts)
 
     post_dict = dict()
-    for post in posts["results"]:
+    for post in posts:
         if question := post.get("question"):
             post_dict[post["id"]] = [question]
 
-    open_question_id_post_id = []
+    open_questions = []
     for post_id, questions in post_dict.items():
         for question in questions:
             if question.get("status") == "open":
@@ -128,22 +245,73 @@ def get_open_question_ids_from_tournament(tournament_id: str = TOURNAMENT_ID) ->
                     f"ID: {question['id']}\nQ: {question['title']}\nCloses: "
                     f"{question['scheduled_close_time']}"
                 )
-                open_question_id_post_id.append((question["id"], post_id, question["title"]))
+                open_questions.append({
+                    "question_id": question["id"],
+                    "post_id": post_id,
+                    "title": question["title"],
+                    "scheduled_close_time": question.get("scheduled_close_time"),
+                })
 
-    return open_question_id_post_id
+    return open_questions
+
+
+def get_open_questions_from_tournament(tournament_id: str = TOURNAMENT_ID) -> list[dict]:
+    """
+    Get all open questions from the configured tournament (every page).
+    Returns dicts with question_id, post_id, title and scheduled_close_time.
+    """
+    return _open_questions(list(iter_tournament_posts(tournament_id=tournament_id, statuses="open")))
+
+
+async def get_open_questions_from_tournament_async(tournament_id: str = TOURNAMENT_ID) -> list[dict]:
+    posts = [post async for post in iter_tournament_posts_async(tournament_id=tournament_id, statuses="open")]
+    return _open_questions(posts)
+
+
+def get_open_question_ids_from_tournament(tournament_id: str = TOURNAMENT_ID) -> list[tuple[int, int, str]]:
+    """
+    Get all open question IDs from the configured tournament.
+    Returns list of (question_id, post_id, title) tuples.
+    """
+    return [
+        (q["question_id"], q["post_id"], q["title"])
+        for q in get_open_questions_from_tournament(tournament_id)
+    ]
+
+
+async def get_open_question_ids_from_tournament_async(tournament_id: str = TOURNAMENT_ID) -> list[tuple[int, int, str]]:
+    return [
+        (q["question_id"], q["post_id"], q["title"])
+        for q in await get_open_questions_from_tournament_async(tournament_id)
+    ]
 
 
 def get_post_details(post_id: int) -> dict:
     """
     Get all details about a post from the Metaculus API.
+    Conditional on the copy from the previous fetch, so unchanged posts are a 304.
     """
-    url = f"{API_BASE_URL}/posts/{post_id}/"
-    print(f"Getting details for {url}")
-    response = requests.get(url, **AUTH_HEADERS)
-    if not response.ok:
-        raise Exception(response.text)
-    details = json.loads(response.content)
-    return details
+    return run_sync(metaculus_client.get_post(post_id))
+
+
+async def get_post_details_async(post_id: int) -> dict:
+    return await metaculus_client.get_post(post_id)
+
+
+# Posts seen in listings this run; get_post() serves from here (see post_store.py)
+post_store = PostStore(get_post_details, get_post_details_async)
+
+
+def get_post(post_id: int) -> dict:
+    """
+    Post details, taken from this run's tournament listings when they have
+    every field the bot needs, otherwise fetched with get_post_details.
+    """
+    return post_store.get(post_id)
+
+
+async def get_post_async(post_id: int) -> dict:
+    return await post_store.aget(post_id)
 
 
 def forecast_is_already_made(post_details: dict) -> bool:
@@ -175,39 +343,21 @@ def get_resolved_questions_from_tournament(
     Returns:
         List of resolved question dicts with details
     """
-    url = f"{API_BASE_URL}/posts/"
-    
     all_results = []
-    offset = 0
-    
-    while len(all_results) < limit:
-        params = {
-            "limit": min(50, limit - len(all_results)),
-            "offset": offset,
-            "order_by": "publish_time",  # Oldest first for even sampling
-            "forecast_type": ",".join(["binary", "multiple_choice", "numeric"]),
-            "tournaments": tournament_id,
-            "statuses": "resolved",
-            "include_description": "true",
-        }
-        
-        response = requests.get(url, **AUTH_HEADERS, params=params)
-        
-        if not response.ok:
-            print(f"API Error: {response.status_code} - {response.text[:200]}")
-            break
-        
-        data = response.json()
-        results = data.get("results", [])
-        
-        if not results:
-            break
-        
-        all_results.extend(results)
-        offset += len(results)
-        
-        print(f"[Metaculus] Fetched {len(all_results)} resolved questions...")
-    
+    try:
+        for post in iter_tournament_posts(
+            tournament_id=tournament_id,
+            statuses="resolved",
+            order_by="publish_time",  # Oldest first for even sampling
+            limit=limit,
+        ):
+            all_results.append(post)
+            if len(all_results) % 50 == 0:
+                print(f"[Metaculus] Fetched {len(all_results)} resolved questions...")
+    except Exception as e:
+        print(f"API Error: {str(e)[:200]}")
+
+    print(f"[Metaculus] Fetched {len(all_results)} resolved questions")
     return all_results[:limit]
 
 
@@ -372,30 +522,9 @@ def get_community_forecast(post_id: int, at_time: str = None) -> dict:
                 r_min = scaling.get("range_min")
                 r_max = scaling.get("range_max")
                 
-                if r_min is not None and r_max is not None:
-                    # Normalize centers to 0-1 range
-                    normalized_centers = []
-                    range_size = r_max - r_min
-                    if range_size > 0:
-                        for c in centers:
-                            norm = (c - r_min) / range_size
-                            normalized_centers.append(max(0.0, min(1.0, norm)))
-                    
-                    if normalized_centers:
-                        normalized_centers.sort()
-                        # Create 201-point CDF
-                        constructed_cdf = []
-                        n_samples = len(normalized_centers)
-                        
-                        for i in range(201):
-                            x = i / 200.0
-                            # Count fraction of samples <= x
-                            # Using simple empirical CDF
-                            count = sum(1 for s in normalized_centers if s <= x)
-                            prob = count / n_samples
-                            constructed_cdf.append(prob)
-                        
-                        forecast_values = constructed_cdf
+                if r_min is not None and r_max is not None and r_max > r_min:
+                    # Empirical CDF of the centers (samples) on the question's grid
+                    forecast_values = grid_for_question(question).empirical_cdf(centers) or None
             except Exception as e:
                 print(f"Error constructing CDF from centers: {e}")
         
@@ -454,8 +583,8 @@ def get_community_forecast_from_csv(post_id: int, question_id: int) -> dict:
     def try_download(url):
         """Try to download and parse CSV from given URL."""
         try:
-            response = requests.get(url, **AUTH_HEADERS)
-            if not response.ok:
+            response = run_sync(metaculus_client.request("GET", url))
+            if not response.is_success:
                 return {"error": f"Download failed: {response.status_code}"}
                 
             with zipfile.ZipFile(io.BytesIO(response.content)) as z:
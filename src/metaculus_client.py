@@ -0,0 +1,226 @@
+"""
+Async Metaculus API client.
+
+Every Metaculus request goes through request(), which:
+
+- reuses one httpx.AsyncClient (keep-alive pool, auth header) per event loop
+- retries transient failures with jittered exponential backoff, honouring
+  Retry-After when the server sends it. GET requests retry 429s, 5xx and
+  any transport error. POSTs (forecasts, comments) are not idempotent, so
+  they retry only what cannot have reached the server twice: a 429 carrying
+  Retry-After, or an error raised while connecting. A read timeout or 5xx
+  after the server may have acted is returned or raised, not retried.
+- for get_post(), sends If-None-Match / If-Modified-Since from the previous
+  response and serves the stored body on a 304. Validators and bodies live
+  under METACULUS_HTTP_CACHE_DIR (logs/, kept on the bot-data branch), so
+  repeated detail fetches across cron runs are cheap.
+
+metaculus_api keeps its blocking functions for scripts and backtests; they
+call into this module through run_sync(), which runs the coroutine on a
+background event loop with its own pooled client. Async code awaits the
+coroutines here (or the *_async wrappers in metaculus_api) directly.
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Coroutine, Optional, TypeVar
+
+import httpx
+
+from config import (
+    API_BASE_URL,
+    METACULUS_TOKEN,
+    METACULUS_MAX_CONNECTIONS,
+    METACULUS_REQUEST_TIMEOUT,
+    METACULUS_MAX_RETRIES,
+    METACULUS_RETRY_BASE_DELAY,
+    METACULUS_HTTP_CACHE_DIR,
+)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Methods safe to send again after any transient failure
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Raised before the request was sent, so retrying cannot duplicate it
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# loop -> client; httpx pools are bound to the loop that opened them
+_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_lock = threading.Lock()
+_stats = {"requests": 0, "retries": 0, "not_modified": 0}
+
+
+class MetaculusPostError(RuntimeError):
+    """Raised by post_json for an error response; carries its status code."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(text)
+        self.status_code = status_code
+
+
+def get_metaculus_http_client() -> httpx.AsyncClient:
+    """Shared authenticated client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers={"Authorization": f"Token {METACULUS_TOKEN}"},
+            limits=httpx.Limits(
+                max_connections=METACULUS_MAX_CONNECTIONS,
+                max_keepalive_connections=METACULUS_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(METACULUS_REQUEST_TIMEOUT),
+            follow_redirects=True,
+        )
+        _clients[loop] = client
+    return client
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return METACULUS_RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def _should_retry(method: str, response: Optional[httpx.Response], error: Optional[Exception]) -> bool:
+    if method.upper() in IDEMPOTENT_METHODS:
+        return error is not None or response.status_code in RETRYABLE_STATUS
+    if error is not None:
+        return isinstance(error, NOT_SENT_ERRORS)
+    return response.status_code == 429 and "retry-after" in response.headers
+
+
+async def request(
+    method: str,
+    path: str,
+    max_retries: int = METACULUS_MAX_RETRIES,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Send a request to API_BASE_URL + path, retrying transient failures as
+    the method allows (see _should_retry). The final response is returned
+    whatever its status; callers check .is_success.
+    """
+    client = get_metaculus_http_client()
+    url = path if path.startswith("http") else f"{API_BASE_URL}{path}"
+    for attempt in range(max_retries + 1):
+        response = error = None
+        try:
+            response = await client.request(method, url, **kwargs)
+            _stats["requests"] += 1
+        except httpx.TransportError as e:
+            error = e
+        if attempt == max_retries or not _should_retry(method, response, error):
+            if error is not None:
+                raise error
+            return response
+        reason = type(error).__name__ if error is not None else f"HTTP {response.status_code}"
+        delay = _retry_delay(attempt, response)
+        _stats["retries"] += 1
+        print(f"[Metaculus] {method} {path} failed ({reason}), retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+        await asyncio.sleep(delay)
+    raise RuntimeError("unreachable")
+
+
+def _cache_path(post_id: int) -> Path:
+    return Path(METACULUS_HTTP_CACHE_DIR) / "posts" / f"{post_id}.json"
+
+
+def _load_cached(post_id: int) -> Optional[dict]:
+    try:
+        with open(_cache_path(post_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _store_cached(post_id: int, response: httpx.Response) -> None:
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if not etag and not last_modified:
+        return
+    path = _cache_path(post_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "etag": etag,
+            "last_modified": last_modified,
+            "saved_at": time.time(),
+            "body": response.text,
+        }, f)
+    os.replace(tmp, path)
+
+
+async def get_post(post_id: int) -> dict:
+    """GET /posts/{id}/ as a conditional request against the stored copy."""
+    cached = _load_cached(post_id)
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    path = f"/posts/{post_id}/"
+    print(f"Getting details for {API_BASE_URL}{path}")
+    response = await request("GET", path, headers=headers)
+    if response.status_code == 304 and cached:
+        _stats["not_modified"] += 1
+        return json.loads(cached["body"])
+    if not response.is_success:
+        raise Exception(response.text)
+    _store_cached(post_id, response)
+    return response.json()
+
+
+async def get_json(path: str, params: Optional[dict] = None) -> dict:
+    response = await request("GET", path, params=params)
+    if not response.is_success:
+        raise Exception(response.text)
+    return response.json()
+
+
+async def post_json(path: str, payload: Any) -> httpx.Response:
+    response = await request("POST", path, json=payload)
+    if not response.is_success:
+        raise MetaculusPostError(response.status_code, response.text)
+    return response
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="metaculus-client", daemon=True).start()
+        return _sync_loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine from this module to completion from blocking code, on a
+    background loop shared by all threads (so its connection pool is reused).
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_sync_loop()).result()
+
+
+def get_metaculus_client_stats() -> dict:
+    return dict(_stats)
+
+
+async def close_metaculus_client() -> None:
+    """Close the current loop's client. Safe to call more than once."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -10,9 +10,11 @@ except ImportError:
     HAS_FORECASTING_TOOLS = False
 
 from config import GET_NEWS, OPENAI_API_KEY, EXA_API_KEY, USE_SMART_SEARCHER
+from exa_client import exa_call
+from exa_cache import make_search_key, cache_get, cache_put, ttl_for
 
 
-def exa_search_raw(
+async def exa_search_raw(
     query: str, 
     num_results: int = 10,
     end_published_date: str = None,
@@ -22,6 +24,8 @@ def exa_search_raw(
     """
     Perform a search using Exa API and return raw results as list of dicts.
     This is used by the research agent to filter relevant results.
+    Goes through the shared async client (see exa_client.py); results are
+    served from the persistent search cache when fresh (see exa_cache.py).
     
     Args:
         query: Search query
@@ -33,8 +37,12 @@ def exa_search_raw(
     if not EXA_API_KEY:
         return ([], {"total": 0.0}) if return_cost else []
 
-    exa = Exa(api_key=EXA_API_KEY)
-    
+    cache_key = make_search_key(query, num_results, end_published_date, start_published_date)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        print(f"[Exa Cache] Hit for: {query[:60]}")
+        return (cached, {"total": 0.0, "cached": True}) if return_cost else cached
+
     # Build search parameters
     search_params = {
         "query": query,
@@ -49,7 +57,7 @@ def exa_search_raw(
     if start_published_date:
         search_params["start_published_date"] = start_published_date
     
-    result = exa.search_and_contents(**search_params)
+    result = await exa_call("search", lambda exa: exa.search_and_contents(**search_params))
 
     raw_results = []
     for i, res in enumerate(result.results):
@@ -62,6 +70,8 @@ def exa_search_raw(
             "text": res.text[:1000] if res.text else "",
             "highlights": res.highlights if res.highlights else [],
         })
+    if raw_results:
+        cache_put(cache_key, raw_results, query, ttl_for(end_published_date))
     
     if return_cost:
         # Extract cost from response if available
@@ -113,7 +123,7 @@ def exa_search_and_contents(query: str, num_results: int = 10) -> str:
     return combined_results
 
 
-def exa_crawl_urls(urls: list[str]) -> list[dict]:
+async def exa_crawl_urls(urls: list[str]) -> list[dict]:
     """
     Crawl URLs and return raw content as list of dicts.
     Used by the research agent to get full page content.
@@ -121,10 +131,8 @@ def exa_crawl_urls(urls: list[str]) -> list[dict]:
     if not EXA_API_KEY or not urls:
         return []
 
-    exa = Exa(api_key=EXA_API_KEY)
-    
     try:
-        result = exa.get_contents(urls, text=True)
+        result = await exa_call("crawl", lambda exa: exa.get_contents(urls, text=True))
         crawled = []
         for res in result.results:
             crawled.append({
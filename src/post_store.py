@@ -0,0 +1,96 @@
+"""
+In-run store of Metaculus post objects.
+
+The tournament listing (/posts/ with include_description) already returns the
+full post, so the bot keeps those payloads here instead of calling
+/posts/{id}/ again for every question. A post is only re-fetched when it was
+never listed or its question lacks a field the bot reads (my_forecasts,
+scaling for numeric questions, options for multiple choice, ...).
+
+metaculus_api owns the process-wide instance (metaculus_api.post_store) and
+fills it from every listing it makes.
+"""
+import asyncio
+import threading
+from typing import Awaitable, Callable, Optional
+
+# Question fields read by forecasting and forecast_is_already_made
+REQUIRED_QUESTION_FIELDS = {
+    "all": ("id", "title", "type", "resolution_criteria", "description", "fine_print", "my_forecasts"),
+    "numeric": ("scaling", "open_upper_bound", "open_lower_bound"),
+    "date": ("scaling", "open_upper_bound", "open_lower_bound"),
+    "multiple_choice": ("options",),
+}
+
+
+def missing_fields(post: dict) -> list[str]:
+    """Required question fields absent from post (all of them if there is no question)."""
+    question = post.get("question")
+    if not question:
+        return ["question"]
+    required = REQUIRED_QUESTION_FIELDS["all"] + REQUIRED_QUESTION_FIELDS.get(question.get("type"), ())
+    return [name for name in required if name not in question]
+
+
+class PostStore:
+    """
+    Post payloads keyed by post id, refreshed through fetch(post_id) (or
+    afetch(post_id) from async code) when incomplete.
+    """
+
+    def __init__(self, fetch: Callable[[int], dict], afetch: Optional[Callable[[int], Awaitable[dict]]] = None):
+        self._fetch = fetch
+        self._afetch = afetch
+        self._posts: dict[int, dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "fetches": 0}
+
+    def add_posts(self, posts: list[dict]) -> None:
+        """Keep posts from a listing response."""
+        with self._lock:
+            for post in posts:
+                if "id" in post:
+                    self._posts[post["id"]] = post
+
+    def _cached(self, post_id: int) -> Optional[dict]:
+        with self._lock:
+            post = self._posts.get(post_id)
+        if post is None:
+            return None
+        missing = missing_fields(post)
+        if missing:
+            print(f"[Post Store] Post {post_id} listing lacks {missing}, fetching details")
+            return None
+        self.stats["hits"] += 1
+        return post
+
+    def _store(self, post_id: int, post: dict) -> dict:
+        self.stats["fetches"] += 1
+        with self._lock:
+            self._posts[post_id] = post
+        return post
+
+    def get(self, post_id: int) -> dict:
+        """The stored post, fetching it first if it is missing or incomplete."""
+        post = self._cached(post_id)
+        if post is not None:
+            return post
+        return self._store(post_id, self._fetch(post_id))
+
+    async def aget(self, post_id: int) -> dict:
+        """get() for async callers; fetches without blocking the event loop."""
+        post = self._cached(post_id)
+        if post is not None:
+            return post
+        if self._afetch is None:
+            return self._store(post_id, await asyncio.to_thread(self._fetch, post_id))
+        return self._store(post_id, await self._afetch(post_id))
+
+    def invalidate(self, post_id: int) -> None:
+        """Drop a post so the next get() re-fetches it (e.g. after forecasting)."""
+        with self._lock:
+            self._posts.pop(post_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._posts.clear()
@@ -0,0 +1,119 @@
+"""
+The 201-point x-axis of a continuous question.
+
+Metaculus evaluates numeric and date CDFs at 201 locations between range_min
+and range_max, spaced linearly or, when the question has a zero_point,
+logarithmically. QuestionGrid computes those locations once and is shared by
+forecasting (building CDFs), grading (resolution index and density) and
+plotting, so they all agree on where each CDF point sits:
+
+    grid = grid_for_question(question_details)
+    grid.locations            # read-only (201,) array
+    grid.index_of(resolution) # CDF bin containing a value, O(1)
+
+question_grid() is memoized on (range_min, range_max, zero_point), the only
+inputs the locations depend on, so every caller asking for the same scaling
+gets the same object however it passes the arguments.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+GRID_POINTS = 201
+
+
+@dataclass(frozen=True)
+class QuestionGrid:
+    """Immutable grid; locations and positions are read-only arrays."""
+    range_min: float
+    range_max: float
+    zero_point: Optional[float] = None
+    # Fraction of the way along the axis (0..1) of each point, and its value
+    positions: np.ndarray = field(init=False, repr=False, compare=False)
+    locations: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        positions = np.linspace(0, 1, GRID_POINTS)
+        span = self.range_max - self.range_min
+        if self.zero_point is None:
+            locations = self.range_min + span * positions
+        else:
+            ratio = self.deriv_ratio
+            locations = self.range_min + span * (ratio**positions - 1) / (ratio - 1)
+        positions.setflags(write=False)
+        locations.setflags(write=False)
+        object.__setattr__(self, "positions", positions)
+        object.__setattr__(self, "locations", locations)
+
+    @property
+    def is_log_scaled(self) -> bool:
+        return self.zero_point is not None
+
+    @property
+    def deriv_ratio(self) -> float:
+        """Ratio of the last to the first step width on a log-scaled grid."""
+        return (self.range_max - self.zero_point) / (self.range_min - self.zero_point)
+
+    def position_of(self, values):
+        """Where values fall along the axis, as a 0..1 fraction (clamped)."""
+        values = np.asarray(values, dtype=float)
+        span = self.range_max - self.range_min
+        if span <= 0:
+            return np.zeros_like(values)[()]
+        if self.zero_point is None:
+            position = (values - self.range_min) / span
+        else:
+            ratio = self.deriv_ratio
+            with np.errstate(divide="ignore", invalid="ignore"):
+                position = np.log1p((values - self.range_min) * (ratio - 1) / span) / np.log(ratio)
+            position = np.nan_to_num(position, nan=0.0)
+        return np.clip(position, 0.0, 1.0)[()]
+
+    def index_of(self, value: float) -> int:
+        """Index of the CDF bin containing value: 0 at or below range_min, 200 at or above range_max."""
+        # Inverting the spacing is O(1); searching locations is not. Floors the
+        # clamped position, so a value on a grid point lands in that point's bin
+        return int(float(self.position_of(value)) * (GRID_POINTS - 1))
+
+    def normalized_density(self, cdf, value: float) -> float:
+        """
+        PDF height at value in grid-position space (uniform = 1.0, max = 200),
+        from a 3-point window of the CDF around it.
+        """
+        if cdf is None or len(cdf) != GRID_POINTS or value is None:
+            return 0.0
+        if self.range_max <= self.range_min:
+            return 0.0
+        i = int(round(float(self.position_of(value)) * (GRID_POINTS - 1)))
+        low = max(0, i - 1)
+        high = min(GRID_POINTS - 1, i + 1)
+        if high == low:
+            return 0.0
+        dx_norm = (high - low) / (GRID_POINTS - 1)
+        return (cdf[high] - cdf[low]) / dx_norm
+
+    def empirical_cdf(self, samples) -> list[float]:
+        """Fraction of samples at or below each grid point (samples outside the range count at the ends)."""
+        samples = np.sort(np.atleast_1d(self.position_of(samples)))
+        if not len(samples):
+            return []
+        return (np.searchsorted(samples, self.positions, side="right") / len(samples)).tolist()
+
+
+def question_grid(range_min: float, range_max: float, zero_point: Optional[float] = None) -> QuestionGrid:
+    """The shared grid for these scaling parameters."""
+    return _cached_grid(float(range_min), float(range_max), None if zero_point is None else float(zero_point))
+
+
+@lru_cache(maxsize=1024)
+def _cached_grid(range_min: float, range_max: float, zero_point: Optional[float]) -> QuestionGrid:
+    # Always called positionally with floats, so equal scalings share one cache entry
+    return QuestionGrid(range_min, range_max, zero_point)
+
+
+def grid_for_question(question_details: dict) -> QuestionGrid:
+    """Grid for a Metaculus question dict (its scaling)."""
+    scaling = question_details.get("scaling", {})
+    return question_grid(scaling["range_min"], scaling["range_max"], scaling.get("zero_point"))
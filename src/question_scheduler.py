@@ -0,0 +1,106 @@
+"""
+Deadline-ordered question scheduler for run_bot.
+
+Questions from every tournament are listed concurrently and pushed into one
+priority queue ordered by scheduled_close_time (soonest first). A fixed pool
+of QUESTION_WORKERS workers pulls from the queue, so the number of questions
+in flight stays constant, tournaments overlap, and urgent questions are
+forecast first. Results are yielded as each question finishes.
+
+    async for question, result in schedule_questions(ACTIVE_TOURNAMENTS, list_fn, forecast_fn):
+        ...
+
+result is forecast_fn's return value, or the exception it raised.
+"""
+import asyncio
+import itertools
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from config import QUESTION_WORKERS
+
+
+@dataclass
+class ScheduledQuestion:
+    """One open question waiting for a worker."""
+    question_id: int
+    post_id: int
+    title: str
+    tournament_id: str
+    scheduled_close_time: Optional[str] = None
+
+
+def close_timestamp(scheduled_close_time: Optional[str]) -> float:
+    """Seconds since the epoch; questions without a close time go last."""
+    if not scheduled_close_time:
+        return float("inf")
+    try:
+        return datetime.fromisoformat(scheduled_close_time.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return float("inf")
+
+
+async def schedule_questions(
+    tournament_ids: Iterable[str | int],
+    list_questions: Callable[[str | int], list[dict]],
+    forecast: Callable[[ScheduledQuestion], Awaitable[dict]],
+    workers: int = QUESTION_WORKERS,
+) -> AsyncIterator[tuple[ScheduledQuestion, object]]:
+    """
+    Forecast every open question across tournament_ids, soonest deadline first.
+
+    list_questions(tournament_id) is a blocking call returning dicts with
+    question_id, post_id, title and scheduled_close_time (see
+    metaculus_api.get_open_questions_from_tournament); it runs in a thread
+    for each tournament at once. Yields (question, result) as they complete.
+    """
+    # Entries are (close timestamp, arrival order, question); None stops a worker
+    queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+    results: asyncio.Queue = asyncio.Queue()
+    sequence = itertools.count()
+
+    async def produce(tournament_id) -> None:
+        try:
+            questions = await asyncio.to_thread(list_questions, tournament_id)
+        except Exception as e:
+            print(f"[Scheduler] Failed to list tournament {tournament_id}: {e}")
+            return
+        print(f"[Scheduler] Found {len(questions)} open questions in {tournament_id}")
+        for q in questions:
+            question = ScheduledQuestion(
+                q["question_id"], q["post_id"], q["title"], str(tournament_id), q.get("scheduled_close_time")
+            )
+            queue.put_nowait((close_timestamp(question.scheduled_close_time), next(sequence), question))
+
+    async def finish_listing(producers: list[asyncio.Task]) -> None:
+        await asyncio.gather(*producers)
+        for _ in range(workers):
+            # Sorts after every question, so workers drain the queue first
+            queue.put_nowait((float("inf"), next(sequence), None))
+
+    async def work() -> None:
+        while (question := (await queue.get())[2]) is not None:
+            try:
+                result = await forecast(question)
+            except Exception as e:
+                result = e
+            results.put_nowait((question, result))
+        results.put_nowait(None)
+
+    producers = [asyncio.create_task(produce(t)) for t in tournament_ids]
+    tasks = [*producers, asyncio.create_task(finish_listing(producers))]
+    tasks += [asyncio.create_task(work()) for _ in range(workers)]
+
+    try:
+        running = workers
+        while running:
+            item = await results.get()
+            if item is None:
+                running -= 1
+                continue
+            yield item
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -13,6 +13,8 @@ import json
 import re
 
 from llm import call_llm
+from llm_scheduler import llm_lane
+from checkpoints import checkpoint_stage
 from news import exa_search_raw, exa_crawl_urls
 from config import RESEARCH_MODEL, RESEARCH_TEMP, RESEARCH_THINKING, GET_NEWS
 
@@ -54,7 +56,7 @@ async def run_research_agent(
         raw_results = existing_results
     else:
         print(f"[Research Agent] Searching for: {question}")
-        raw_results = exa_search_raw(question)
+        raw_results = await exa_search_raw(question)
     
     if not raw_results:
         return [], "No search results found."
@@ -69,12 +71,13 @@ async def run_research_agent(
         results_json=results_json
     )
     
-    filter_response = await call_llm(
-        filter_prompt, 
-        model=RESEARCH_MODEL, 
-        temperature=RESEARCH_TEMP,
-        thinking=thinking
-    )
+    with llm_lane("filter"):
+        filter_response = await call_llm(
+            filter_prompt, 
+            model=RESEARCH_MODEL, 
+            temperature=RESEARCH_TEMP,
+            thinking=thinking
+        )
     
     relevant_results, summary = parse_research_agent_response(filter_response, raw_results)
     print(f"[Research Agent] Selected {len(relevant_results)} relevant results")
@@ -128,12 +131,13 @@ async def analyze_and_crawl_links(
         results_content=results_content
     )
     
-    link_response = await call_llm(
-        link_prompt,
-        model=RESEARCH_MODEL,
-        temperature=RESEARCH_TEMP,
-        thinking=thinking
-    )
+    with llm_lane("filter"):
+        link_response = await call_llm(
+            link_prompt,
+            model=RESEARCH_MODEL,
+            temperature=RESEARCH_TEMP,
+            thinking=thinking
+        )
     
     # Parse the URLs to crawl
     urls_to_crawl = parse_urls_from_response(link_response)
@@ -145,7 +149,7 @@ async def analyze_and_crawl_links(
     print(f"[Research Agent] Identified {len(urls_to_crawl)} links to crawl: {urls_to_crawl}")
     
     # Crawl the URLs
-    crawled = exa_crawl_urls(urls_to_crawl)
+    crawled = await exa_crawl_urls(urls_to_crawl)
     
     return crawled
 
@@ -312,14 +316,15 @@ After tool calls, synthesize your findings into a clear research report.
 """
     
     # Run the tool calling loop
-    final_response, tool_calls, messages = await run_tool_calling_loop(
-        initial_prompt=research_prompt,
-        tools=tools,
-        model=RESEARCH_MODEL,
-        temperature=RESEARCH_TEMP,
-        max_iterations=5,
-        system_prompt=TOOL_RESEARCH_SYSTEM_PROMPT
-    )
+    with llm_lane("tool_loop"):
+        final_response, tool_calls, messages = await run_tool_calling_loop(
+            initial_prompt=research_prompt,
+            tools=tools,
+            model=RESEARCH_MODEL,
+            temperature=RESEARCH_TEMP,
+            max_iterations=5,
+            system_prompt=TOOL_RESEARCH_SYSTEM_PROMPT
+        )
     
     print(f"[Research Agent] Tool calling complete. Made {len(tool_calls)} tool calls.")
     
@@ -462,19 +467,25 @@ async def run_research_pipeline(
     print(f"[Research Pipeline] Starting for: {question[:60]}...")
     
     # Step 1: Initial web search (with cost tracking)
-    search_results = []
-    exa_cost = 0.0
-    if question_type != "market":
-        # For general questions, always search first
-        print("[Research Pipeline] Step 1: Web search")
-        search_result = exa_search_raw(question, num_results=10, return_cost=True)
-        if isinstance(search_result, tuple):
-            search_results, cost_info = search_result
-            exa_cost += cost_info.get("total", 0.0)
-            print(f"[Research Pipeline] Found {len(search_results)} search results (Exa cost: ${exa_cost:.4f})")
-        else:
-            search_results = search_result
-            print(f"[Research Pipeline] Found {len(search_results)} search results")
+    async def search() -> dict:
+        search_results = []
+        exa_cost = 0.0
+        if question_type != "market":
+            # For general questions, always search first
+            print("[Research Pipeline] Step 1: Web search")
+            search_result = await exa_search_raw(question, num_results=10, return_cost=True)
+            if isinstance(search_result, tuple):
+                search_results, cost_info = search_result
+                exa_cost += cost_info.get("total", 0.0)
+                print(f"[Research Pipeline] Found {len(search_results)} search results (Exa cost: ${exa_cost:.4f})")
+            else:
+                search_results = search_result
+                print(f"[Research Pipeline] Found {len(search_results)} search results")
+        return {"search_results": search_results, "exa_cost": exa_cost}
+
+    # Each step is resumable when a checkpoint is active (see checkpoints.py)
+    searched = await checkpoint_stage("search", search)
+    search_results, exa_cost = searched["search_results"], searched["exa_cost"]
     
     # Step 2: Select tools based on question type
     if question_type == "market":
@@ -514,14 +525,20 @@ When done, write a PRELIMINARY summary. After this, I will ask you for a deeper
 """
     
     # Run tool calling loop
-    final_response, tool_calls, messages = await run_tool_calling_loop(
-        initial_prompt=research_prompt,
-        tools=tools,
-        model=RESEARCH_MODEL,
-        temperature=RESEARCH_TEMP,
-        max_iterations=2,  # Reduced from 5 - model should get data in 1-2 rounds
-        system_prompt=TOOL_RESEARCH_SYSTEM_PROMPT
-    )
+    async def tool_loop() -> dict:
+        with llm_lane("tool_loop"):
+            final_response, tool_calls, messages = await run_tool_calling_loop(
+                initial_prompt=research_prompt,
+                tools=tools,
+                model=RESEARCH_MODEL,
+                temperature=RESEARCH_TEMP,
+                max_iterations=2,  # Reduced from 5 - model should get data in 1-2 rounds
+                system_prompt=TOOL_RESEARCH_SYSTEM_PROMPT
+            )
+        return {"final_response": final_response, "tool_calls": tool_calls, "messages": messages}
+
+    looped = await checkpoint_stage("tool_loop", tool_loop)
+    tool_calls, messages = looped["tool_calls"], looped["messages"]
     
     print(f"[Research Pipeline] Step 3: Made {len(tool_calls)} tool calls")
     
@@ -542,12 +559,16 @@ When done, write a PRELIMINARY summary. After this, I will ask you for a deeper
     )
     
     # Call Grok for the deep synthesis
-    deep_synthesis = await call_llm(
-        synthesis_prompt,
-        model=RESEARCH_MODEL,
-        temperature=0.4, # Lower temp for factual synthesis
-        thinking=True # Thinking is very helpful for cross-referencing data
-    )
+    async def synthesize() -> str:
+        with llm_lane("synthesis"):
+            return await call_llm(
+                synthesis_prompt,
+                model=RESEARCH_MODEL,
+                temperature=0.4, # Lower temp for factual synthesis
+                thinking=True # Thinking is very helpful for cross-referencing data
+            )
+
+    deep_synthesis = await checkpoint_stage("synthesis", synthesize)
     
     # Count tool usage
     tool_usage = {}
@@ -0,0 +1,217 @@
+"""
+Batched forecast submission and concurrent comment posting.
+
+/questions/forecast/ accepts a list of forecasts, so finished forecasts are
+queued and a background worker posts them together, flushing once
+SUBMIT_BATCH_SIZE are waiting or SUBMIT_BATCH_DELAY seconds after the first
+one arrived. If a batch is rejected, its forecasts are posted one by one so
+a single bad forecast only fails itself. Comments go through a separate
+queue drained by COMMENT_MAX_CONCURRENCY workers.
+
+metaculus_client.request() retries a POST only when it cannot have reached
+the server twice. On top of that, a single forecast is retried here up to
+SUBMIT_MAX_RETRIES times on a 5xx or timeout, since posting it twice just
+restates the same prediction. A comment is posted once, so it is never
+duplicated.
+
+submit_forecast() and submit_comment() return once that item has been posted
+and raise if it failed (or the queue was closed before it was posted), so
+callers (and the checkpoint stages in main) still know exactly what made it
+to Metaculus.
+"""
+import asyncio
+import random
+from collections import Counter
+from typing import Optional
+
+import httpx
+
+from config import (
+    SUBMIT_BATCH_SIZE,
+    SUBMIT_BATCH_DELAY,
+    SUBMIT_MAX_RETRIES,
+    SUBMIT_RETRY_BASE_DELAY,
+    COMMENT_MAX_CONCURRENCY,
+)
+from metaculus_client import MetaculusPostError, post_json
+
+# Workers and queues, bound to the event loop that started them
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_forecast_queue: Optional[asyncio.Queue] = None
+_comment_queue: Optional[asyncio.Queue] = None
+_workers: list[asyncio.Task] = []
+_stats: Counter = Counter()
+_failures: list[dict] = []
+
+
+def _ensure_workers() -> None:
+    global _loop, _forecast_queue, _comment_queue, _workers
+    loop = asyncio.get_running_loop()
+    if _loop is loop and _workers and not any(w.done() for w in _workers):
+        return
+    _loop = loop
+    _forecast_queue = asyncio.Queue()
+    _comment_queue = asyncio.Queue()
+    _workers = [loop.create_task(_run_forecast_worker(_forecast_queue))]
+    _workers += [loop.create_task(_run_comment_worker(_comment_queue)) for _ in range(COMMENT_MAX_CONCURRENCY)]
+
+
+async def submit_forecast(question_id: int, forecast_payload: dict) -> None:
+    """Queue a forecast for the next batch and wait until it is posted."""
+    _ensure_workers()
+    item = {"question": question_id, "payload": forecast_payload, "future": _loop.create_future()}
+    _forecast_queue.put_nowait(item)
+    await item["future"]
+
+
+async def submit_comment(post_id: int, comment_text: str) -> None:
+    """Queue a private comment and wait until it is posted."""
+    _ensure_workers()
+    item = {"post": post_id, "text": comment_text, "future": _loop.create_future()}
+    _comment_queue.put_nowait(item)
+    await item["future"]
+
+
+async def _run_forecast_worker(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        # Flush when the batch is full or SUBMIT_BATCH_DELAY after its first item
+        deadline = loop.time() + SUBMIT_BATCH_DELAY
+        while len(batch) < SUBMIT_BATCH_SIZE and (remaining := deadline - loop.time()) > 0:
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await _post_forecasts(batch)
+        finally:
+            _fail_unsettled(batch)
+            for _ in batch:
+                queue.task_done()
+
+
+async def _post_forecasts(batch: list[dict]) -> None:
+    if len(batch) > 1:
+        try:
+            response = await post_json(
+                "/questions/forecast/",
+                [{"question": item["question"], **item["payload"]} for item in batch],
+            )
+        except Exception as e:
+            print(f"[Submission] Batch of {len(batch)} forecasts rejected ({str(e)[:200]}), posting individually")
+            _stats["batches_failed"] += 1
+        else:
+            print(f"[Submission] Posted {len(batch)} forecasts in one batch (status {response.status_code})")
+            _stats["batches"] += 1
+            _stats["forecasts_posted"] += len(batch)
+            for item in batch:
+                _resolve(item)
+            return
+    await asyncio.gather(*[_post_forecast(item) for item in batch])
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, MetaculusPostError):
+        return error.status_code >= 500
+    return isinstance(error, httpx.TimeoutException)
+
+
+async def _post_forecast(item: dict) -> None:
+    async def post() -> None:
+        for attempt in range(SUBMIT_MAX_RETRIES + 1):
+            try:
+                response = await post_json("/questions/forecast/", [{"question": item["question"], **item["payload"]}])
+            except Exception as e:
+                if attempt == SUBMIT_MAX_RETRIES or not _is_transient(e):
+                    raise
+                delay = SUBMIT_RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5)
+                _stats["forecast_retries"] += 1
+                print(f"[Submission] Forecast for question {item['question']} failed ({str(e)[:100]}), "
+                      f"retrying in {delay:.1f}s ({attempt + 1}/{SUBMIT_MAX_RETRIES})")
+                await asyncio.sleep(delay)
+            else:
+                print(f"Prediction Post status code: {response.status_code}")
+                return
+    await _post_item(item, post, "forecast", f"question {item['question']}")
+
+
+async def _run_comment_worker(queue: asyncio.Queue) -> None:
+    while True:
+        item = await queue.get()
+        try:
+            await _post_item(
+                item,
+                lambda: post_json("/comments/create/", {
+                    "text": item["text"],
+                    "parent": None,
+                    "included_forecast": True,
+                    "is_private": True,
+                    "on_post": item["post"],
+                }),
+                "comment",
+                f"post {item['post']}",
+            )
+        finally:
+            _fail_unsettled([item])
+            queue.task_done()
+
+
+async def _post_item(item: dict, post, kind: str, target: str) -> None:
+    """Post one item; settles the item's future either way."""
+    try:
+        await post()
+    except Exception as e:
+        _stats[f"{kind}s_failed"] += 1
+        _failures.append({"kind": kind, "target": target, "error": str(e)[:500]})
+        print(f"[Submission] Failed to post {kind} for {target}: {str(e)[:200]}")
+        if not item["future"].done():
+            item["future"].set_exception(e)
+        return
+    _stats[f"{kind}s_posted"] += 1
+    _resolve(item)
+
+
+def _resolve(item: dict) -> None:
+    if not item["future"].done():
+        item["future"].set_result(None)
+
+
+def _fail_unsettled(items) -> None:
+    """Fail the futures of items a stopped worker never got to (or was cancelled while posting)."""
+    for item in items:
+        if not item["future"].done():
+            item["future"].set_exception(RuntimeError("Submission queue closed before this was posted"))
+
+
+async def flush_submissions(timeout: float = 120.0) -> None:
+    """Wait for queued forecasts and comments to be posted (up to timeout seconds)."""
+    if _loop is not asyncio.get_running_loop():
+        return
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(_forecast_queue.join(), _comment_queue.join()), timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        print(f"[Submission] Flush timed out with {_forecast_queue.qsize()} forecasts "
+              f"and {_comment_queue.qsize()} comments still queued")
+
+
+async def close_submission_queue(timeout: float = 120.0) -> None:
+    """Flush, then stop the workers."""
+    global _workers
+    await flush_submissions(timeout)
+    if _loop is asyncio.get_running_loop():
+        for worker in _workers:
+            worker.cancel()
+        await asyncio.gather(*_workers, return_exceptions=True)
+        for queue in (_forecast_queue, _comment_queue):
+            while not queue.empty():
+                _fail_unsettled([queue.get_nowait()])
+                queue.task_done()
+    _workers = []
+
+
+def get_submission_stats() -> dict:
+    """Posted/failed counts per kind and batches, plus each failure."""
+    return dict(_stats, failures=list(_failures))
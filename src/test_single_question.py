@@ -22,8 +22,9 @@ sys.path.append(str(ROOT_DIR / "src"))
 
 from src.config import RESEARCH_MODEL, FORECAST_MODEL, USE_TOOLS
 from src.metaculus_api import (
-    get_post_details, 
-    post_question_prediction,
+    get_post_details_async,
+    post_question_prediction_async,
+    post_question_comment_async,
     create_forecast_payload
 )
 from src.research_agent import run_research_pipeline
@@ -31,6 +32,12 @@ from src.forecasting import (
     detect_question_type
 )
 from src.llm import call_llm
+# Imported without the src. prefix so they are the same registries llm.py populates
+from llm_clients import close_llm_clients
+from exa_client import close_exa_client
+from metaculus_client import close_metaculus_client
+from cost_ledger import flush_cost_ledger, close_cost_ledger, get_ledger_entries
+from llm_scheduler import llm_lane
 from src.prompts import (
     BINARY_PROMPT_TEMPLATE,
     NUMERIC_PROMPT_TEMPLATE,
@@ -143,6 +150,15 @@ class QuestionTestLogger:
         if details:
             details["phase"] = phase
             self.data["costs"]["details"].append(details)
+
+    def log_ledger_costs(self, entries: list[dict]):
+        """Log costs from the cost ledger (forecast lane = forecast phase, rest = research)."""
+        for entry in entries:
+            if entry["status"] != "ok":
+                continue
+            phase = "forecast" if entry["lane"] == "forecast" else "research"
+            tokens = entry["native_tokens_prompt"] + entry["native_tokens_completion"]
+            self.log_cost(phase, tokens, entry["total_cost"], entry)
         
     def save(self) -> str:
         """Saves JSON log and raw text log."""
@@ -285,7 +301,7 @@ async def run_forecast_with_logging(
         extract_percentiles_from_response,
         extract_date_percentiles_from_response,
         extract_option_probabilities_from_response,
-        generate_continuous_cdf,
+        generate_continuous_cdfs,
         generate_multiple_choice_forecast
     )
     from src.config import FORECAST_TEMP, FORECAST_THINKING, USE_TOOLS
@@ -340,37 +356,36 @@ async def run_forecast_with_logging(
             forecast_tools = [get_tool("get_parametric_cdf")]
             
             # Use the tool loop
-            response, tool_calls, _ = await run_tool_calling_loop(
-                initial_prompt=content,
-                tools=forecast_tools,
-                model=FORECAST_MODEL,
-                temperature=FORECAST_TEMP,
-                max_iterations=3,
-                system_prompt=FORECAST_SYSTEM_PROMPT,
-                thinking=FORECAST_THINKING
-            )
+            with llm_lane("forecast"):
+                response, tool_calls, _ = await run_tool_calling_loop(
+                    initial_prompt=content,
+                    tools=forecast_tools,
+                    model=FORECAST_MODEL,
+                    temperature=FORECAST_TEMP,
+                    max_iterations=3,
+                    system_prompt=FORECAST_SYSTEM_PROMPT,
+                    thinking=FORECAST_THINKING,
+                    sample_index=run_idx
+                )
             # For simplicity in this test logger, we don't return stats for tool loop yet
             # but we record that it happened
             stats = {"tool_calls": len(tool_calls)}
             result = (response, stats)
         else:
             print(f"[Forecast] Run {run_idx + 1}/{num_runs}...")
-            result = await call_llm(
-                content, 
-                model=FORECAST_MODEL, 
-                temperature=FORECAST_TEMP, 
-                thinking=FORECAST_THINKING,
-                return_stats=True
-            )
-        
-        # Handle both return types
+            with llm_lane("forecast"):
+                result = await call_llm(
+                    content, 
+                    model=FORECAST_MODEL, 
+                    temperature=FORECAST_TEMP, 
+                    thinking=FORECAST_THINKING,
+                    return_stats=True,
+                    sample_index=run_idx
+                )
+        
+        # Handle both return types (costs are logged from the cost ledger at the end)
         if isinstance(result, tuple):
             response, stats = result
-            # Log cost info
-            tokens = stats.get("native_tokens_prompt", 0) + stats.get("native_tokens_completion", 0)
-            cost = stats.get("total_cost", 0.0)
-            logger.log_cost("forecast", tokens, cost, stats)
-            print(f"[Forecast] Cost: ${cost:.6f} ({tokens:,} tokens)")
         else:
             response = result
         
@@ -393,7 +408,7 @@ async def run_forecast_with_logging(
         return median_prob, final_comment
     
     elif q_type in ["numeric", "date"]:
-        cdfs = []
+        percentile_sets = []
         comments = []
         scaling = question_details.get("scaling", {})
         
@@ -435,20 +450,20 @@ async def run_forecast_with_logging(
                 print(f"[Forecast] ERROR: Could not extract percentiles from Run {i+1}")
                 continue
 
-            cdf = generate_continuous_cdf(
-                percentiles,
-                q_type,
-                question_details.get("open_upper_bound", True),
-                question_details.get("open_lower_bound", True),
-                scaling.get("range_max", 1.0),
-                scaling.get("range_min", 0.0),
-                scaling.get("zero_point"),
-            )
-            cdfs.append(cdf)
+            percentile_sets.append(percentiles)
             comments.append(f"## Rationale {i+1}\nExtracted Percentile_values: {percentiles}\n\nGPT's Answer: {resp}\n\n")
-        
-        # Average CDFs
-        median_cdf = [float(np.median([cdfs[j][i] for j in range(len(cdfs))])) for i in range(len(cdfs[0]))]
+
+        # One batched fit for every run, then the median CDF
+        cdfs = generate_continuous_cdfs(
+            percentile_sets,
+            q_type,
+            question_details.get("open_upper_bound", True),
+            question_details.get("open_lower_bound", True),
+            scaling.get("range_max", 1.0),
+            scaling.get("range_min", 0.0),
+            scaling.get("zero_point"),
+        )
+        median_cdf = np.median(cdfs, axis=0).tolist()
         final_comment = f"Median CDF: `{str(median_cdf[:5])}...`\n\n" + "\n".join(comments)
         return median_cdf, final_comment
     
@@ -491,7 +506,7 @@ async def run_test(
     # 1. Setup identifier and fetch question details
     if post_id:
         print(f"\n[Test] Fetching Metaculus post {post_id}...")
-        post_details = get_post_details(post_id)
+        post_details = await get_post_details_async(post_id)
         question_details = post_details["question"]
         question_id = question_details.get("id")
         title = question_details["title"]
@@ -555,11 +570,10 @@ async def run_test(
             print(f"\n[Test] Submitting forecast to Metaculus...")
             try:
                 payload = create_forecast_payload(forecast, q_type_metaculus)
-                post_question_prediction(question_id, payload)
+                await post_question_prediction_async(question_id, payload)
                 
                 # Also post the rationale as a comment
-                from src.metaculus_api import post_question_comment
-                post_question_comment(post_id, comment)
+                await post_question_comment_async(post_id, comment)
                 
                 logger.log_submission(True, "Success")
                 print(f"[Test] [SUCCESS] Forecast and comment submitted successfully to question {question_id}")
@@ -577,6 +591,12 @@ async def run_test(
         logger.data["final_result"] = {"success": False, "error": str(e)}
 
     # 5. Save and finish
+    await flush_cost_ledger()
+    logger.log_ledger_costs(get_ledger_entries())
+    await close_cost_ledger()
+    await close_llm_clients()
+    await close_exa_client()
+    await close_metaculus_client()
     log_path = logger.save()
     print(f"\n{'='*60}")
     print(f"TEST COMPLETE")
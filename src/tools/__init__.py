@@ -8,7 +8,8 @@ This module provides:
 """
 
 from .base import BaseTool, ToolResult
-from .executor import run_tool_calling_loop, call_llm_with_tools
+from .executor import run_tool_calling_loop, call_llm_with_tools, get_tool_stats, shutdown_tool_pools
+from .result_cache import get_tool_cache_stats, clear_tool_cache
 
 # Import tool classes
 from .market import BondsForecastTool, SpreadsForecastTool, VIXForecastTool, PolyMarketSearchTool
@@ -37,11 +37,31 @@ class BaseTool(ABC):
     - description: What the tool does (shown to the model)
     - parameters: JSON Schema for tool parameters
     - execute(): Async method to run the tool
+    
+    Subclasses may override:
+    - max_concurrency: Executions of this tool allowed at once across all
+      questions (the executor runs one turn's tool calls concurrently)
+    - timeout_seconds: Time budget for one execution; the executor gives up on
+      the call after this and returns a timeout ToolResult instead (a
+      "thread" worker keeps its max_concurrency slot until it returns, a
+      "process" worker is killed)
+    - cache_ttl_seconds: How long a successful result is reused for identical
+      arguments within a run (0 = never cached; see result_cache.py)
+    - execution: How the executor runs execute():
+        "async"   - awaited on the event loop; only for tools that never block
+        "thread"  - on a private event loop in the bounded tool thread pool,
+                    for tools doing synchronous I/O (the default)
+        "process" - in the tool process pool, for CPU-heavy tools; the tool
+                    instance, arguments and ToolResult must be picklable
     """
     
     name: str
     description: str
     parameters: dict  # JSON Schema
+    max_concurrency: int = 4
+    timeout_seconds: float = 60.0
+    cache_ttl_seconds: float = 0.0
+    execution: str = "thread"
     
     def to_openrouter_schema(self) -> dict:
         """
@@ -18,6 +18,9 @@ class CrawlTool(DataTool):
     """
     
     name = "crawl_urls"
+    timeout_seconds = 90.0  # Crawls fetch several full pages
+    cache_ttl_seconds = 3600.0
+    execution = "async"  # Exa calls go through the shared async client
     description = """
 Fetch full page content from one or more URLs.
 
@@ -63,7 +66,7 @@ Returns the full text content of each page (up to 3000 chars each).
             urls = urls[:5]
             
             # Execute crawl
-            results = exa_crawl_urls(urls)
+            results = await exa_crawl_urls(urls)
             
             if not results:
                 return ToolResult(
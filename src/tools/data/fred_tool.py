@@ -21,6 +21,7 @@ class FREDDataTool(DataTool):
     """
     
     name = "get_fred_data"
+    cache_ttl_seconds = 3600.0
     description = """
 Fetch economic data series from FRED (Federal Reserve Economic Data).
 
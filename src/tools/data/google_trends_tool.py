@@ -21,6 +21,9 @@ class GoogleTrendsTool(DataTool):
     """
     
     name = "get_google_trends"
+    max_concurrency = 1  # Google rate-limits pytrends aggressively
+    timeout_seconds = 45.0
+    cache_ttl_seconds = 3600.0
     description = """
 Fetch Google Trends interest data for one or more keywords.
 
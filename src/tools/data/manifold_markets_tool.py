@@ -14,6 +14,8 @@ class ManifoldMarketsTool(DataTool):
     """
     
     name = "search_manifold"
+    cache_ttl_seconds = 600.0
+    execution = "async"  # requests already run via run_in_executor
     description = """
 Search for high-signal prediction markets on Manifold Markets.
 Retrieves probabilities for binary markets and top outcomes for multi-choice markets.
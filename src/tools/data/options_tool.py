@@ -18,6 +18,7 @@ class OptionsDataTool(DataTool):
     """
     
     name = "get_options_data"
+    cache_ttl_seconds = 300.0
     description = """
 Fetch options chain data and extract implied volatility for a ticker.
 
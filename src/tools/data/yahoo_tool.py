@@ -20,6 +20,7 @@ class YahooDataTool(DataTool):
     """
     
     name = "get_yahoo_data"
+    cache_ttl_seconds = 300.0
     description = """
 Fetch price data, historical prices, or basic info for any ticker via Yahoo Finance.
 
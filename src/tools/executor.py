@@ -11,10 +11,12 @@ Handles the model → tool → model cycle:
 """
 import json
 import asyncio
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional
 from dataclasses import dataclass
 
-from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessage
 
 import sys
@@ -22,12 +24,21 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import (
-    OPENROUTER_API_KEY,
     RESEARCH_MODEL,
     RESEARCH_TEMP,
-    llm_rate_limiter
+    REASONING_MAX_TOKENS,
+    TOOL_ITERATION_BUDGET,
+    TOOL_THREAD_POOL_SIZE,
+    TOOL_PROCESS_POOL_SIZE,
 )
+from llm import apply_prompt_cache
+from llm_cache import cached_llm_call
+from llm_clients import get_openrouter_client
+from llm_scheduler import llm_scheduler, estimate_tokens
+from cost_ledger import record_generation
+from llm_hedging import hedged, with_fallbacks
 from .base import BaseTool, ToolResult
+from .result_cache import cached_tool_call
 
 
 @dataclass
@@ -44,7 +55,9 @@ async def call_llm_with_tools(
     model: str = RESEARCH_MODEL,
     temperature: float = RESEARCH_TEMP,
     tool_choice: str = "auto",
-    thinking: bool = False
+    thinking: bool = False,
+    sample_index: int = 0,
+    cache_prompt: bool = False
 ) -> ChatCompletionMessage:
     """
     Call LLM with tool definitions via OpenRouter.
@@ -55,62 +68,93 @@ async def call_llm_with_tools(
         model: Model to use
         temperature: Sampling temperature
         tool_choice: "auto", "none", or specific tool
+        sample_index: Distinguishes repeated runs of the same conversation in the LLM cache
+        cache_prompt: Mark the system/user prefix as cacheable on the provider side
     
     Returns:
         ChatCompletionMessage with potential tool_calls
     """
-    client = AsyncOpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=OPENROUTER_API_KEY,
-        default_headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        },
-        max_retries=2,
-    )
-    
-    async with llm_rate_limiter:
-        try:
-            print(f"[Tool Executor] Calling {model} with {len(tools)} tools available (Thinking: {thinking})")
-            
-            # Prepare extra_body for thinking if requested
-            extra_body = {}
-            if thinking:
-                from config import REASONING_MAX_TOKENS
-                extra_body["reasoning"] = {
-                    "max_tokens": REASONING_MAX_TOKENS
-                }
+    client = get_openrouter_client()
 
-            response = await client.chat.completions.create(
-                model=model,
-                messages=messages,
-                tools=tools if tools else None,
-                tool_choice=tool_choice if tools else None,
-                temperature=temperature,
-                extra_body=extra_body if extra_body else None
-                # Thinking enabled if requested (essential for Gemini 3 forecast/tool use)
-            )
-            
-            message = response.choices[0].message
-            generation_id = response.id if hasattr(response, 'id') else None
-            usage = response.usage if hasattr(response, 'usage') else None
-            
-            if message.tool_calls:
-                print(f"[Tool Executor] Model requested {len(message.tool_calls)} tool call(s)")
-                for tc in message.tool_calls:
-                    print(f"  - {tc.function.name}({tc.function.arguments[:100]}...)")
-            else:
-                print(f"[Tool Executor] Model finished (no tool calls)")
-            
-            # Attach usage info to message for cost tracking
-            message._generation_id = generation_id
-            message._usage = usage
-            
-            return message
-            
-        except Exception as e:
-            print(f"[Tool Executor] Error calling LLM: {str(e)}")
-            raise
+    # Prepare extra_body for thinking if requested
+    extra_body = {}
+    if thinking:
+        extra_body["reasoning"] = {
+            "max_tokens": REASONING_MAX_TOKENS
+        }
+
+    async def send(model: str) -> ChatCompletionMessage:
+        print(f"[Tool Executor] Calling {model} with {len(tools)} tools available (Thinking: {thinking})")
+
+        response = await client.chat.completions.create(
+            model=model,
+            messages=apply_prompt_cache(messages, model) if cache_prompt else messages,
+            tools=tools if tools else None,
+            tool_choice=tool_choice if tools else None,
+            temperature=temperature,
+            extra_body=extra_body if extra_body else None
+            # Thinking enabled if requested (essential for Gemini 3 forecast/tool use)
+        )
+
+        message = response.choices[0].message
+        # Attach usage info to message for cost tracking
+        message._generation_id = response.id if hasattr(response, 'id') else None
+        message._usage = response.usage if hasattr(response, 'usage') else None
+        record_generation(message._generation_id, model)
+        return message
+
+    prompt_tokens = estimate_tokens(messages) + estimate_tokens(json.dumps(tools or []))
+
+    async def call_model(model: str) -> tuple[ChatCompletionMessage, bool]:
+        request = lambda: llm_scheduler.run(lambda: send(model), "openrouter", model, prompt_tokens)
+        key_parts = {
+            "provider": "openrouter",
+            "model": model,
+            "messages": _messages_for_cache_key(messages),
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "temperature": temperature,
+            "reasoning": extra_body.get("reasoning"),
+            "sample_index": sample_index,
+        }
+        return await cached_llm_call(
+            key_parts,
+            lambda: hedged(request, model),
+            serialize=lambda m: m.model_dump(exclude_unset=True),
+            deserialize=ChatCompletionMessage.model_validate,
+        )
+
+    try:
+        # Deadline, hedging and fallback models: see llm_hedging.py
+        message, from_cache = await with_fallbacks(call_model, model)
+    except Exception as e:
+        print(f"[Tool Executor] Error calling LLM: {str(e)}")
+        raise
+
+    if from_cache:
+        message._generation_id = None
+        message._usage = None
+
+    if message.tool_calls:
+        print(f"[Tool Executor] Model requested {len(message.tool_calls)} tool call(s)")
+        for tc in message.tool_calls:
+            print(f"  - {tc.function.name}({tc.function.arguments[:100]}...)")
+    else:
+        print(f"[Tool Executor] Model finished (no tool calls)")
+
+    return message
+
+
+def _messages_for_cache_key(messages: list[dict]) -> list[dict]:
+    """
+    Tool outputs carry fetch timestamps and live market data, so they are keyed
+    by tool_call_id alone. The ids come from the preceding (cached) assistant
+    turn, which keeps replayed tool loops on the same cache path.
+    """
+    return [
+        {"role": "tool", "tool_call_id": m.get("tool_call_id")} if m.get("role") == "tool" else m
+        for m in messages
+    ]
 
 
 def parse_tool_calls(message: ChatCompletionMessage) -> list[ToolCall]:
@@ -134,14 +178,217 @@ def parse_tool_calls(message: ChatCompletionMessage) -> list[ToolCall]:
     return calls
 
 
-async def execute_tool(tool: BaseTool, arguments: dict) -> ToolResult:
-    """Execute a single tool with given arguments."""
-    try:
+# tool name -> semaphore enforcing BaseTool.max_concurrency.
+# Semaphores are bound to an event loop, so they are rebuilt for a new loop.
+_tool_semaphores: dict[str, asyncio.Semaphore] = {}
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+# Thread jobs still running after their caller gave up, per tool name and per
+# thread pool (bound to the semaphores' event loop). Threads cannot be
+# stopped, so these are what the recovery in _track_overrun works around.
+_overrunning: Counter = Counter()
+_overrunning_by_pool: Counter = Counter()
+
+
+def _tool_semaphore(tool: BaseTool) -> asyncio.Semaphore:
+    global _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore_loop is not loop:
+        _tool_semaphores.clear()
+        _overrunning.clear()
+        _overrunning_by_pool.clear()
+        _semaphore_loop = loop
+    if tool.name not in _tool_semaphores:
+        _tool_semaphores[tool.name] = asyncio.Semaphore(tool.max_concurrency)
+    return _tool_semaphores[tool.name]
+
+
+# Worker pools for BaseTool.execution = "thread" / "process", created on first use
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _run_tool_to_completion(tool: BaseTool, arguments: dict) -> ToolResult:
+    """Worker entry point: run a tool's execute() on the worker's own event loop."""
+    return asyncio.run(tool.execute(**arguments))
+
+
+def _worker_pool(execution: str) -> Executor:
+    global _thread_pool, _process_pool
+    if execution == "thread":
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(TOOL_THREAD_POOL_SIZE, thread_name_prefix="tool")
+        return _thread_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(TOOL_PROCESS_POOL_SIZE)
+    return _process_pool
+
+
+def _track_overrun(tool: BaseTool, pool: ThreadPoolExecutor, future: asyncio.Future) -> None:
+    """
+    Count a thread job that outlived its caller until it returns. Once such
+    jobs occupy half the thread pool, new jobs go to a fresh pool so other
+    tools are not starved; the old pool's threads exit as they finish.
+    """
+    global _thread_pool
+    loop = asyncio.get_running_loop()
+    _overrunning[tool.name] += 1
+    _overrunning_by_pool[pool] += 1
+
+    def finished(_) -> None:
+        if _semaphore_loop is not loop:
+            return  # the counters were reset for a new loop
+        _overrunning[tool.name] -= 1
+        _overrunning_by_pool[pool] -= 1
+        if not _overrunning_by_pool[pool]:
+            del _overrunning_by_pool[pool]
+    future.add_done_callback(finished)
+
+    if _thread_pool is pool and _overrunning_by_pool[pool] >= max(1, TOOL_THREAD_POOL_SIZE // 2):
+        print(f"[Tool Executor] {_overrunning_by_pool[pool]} overrunning tool threads, replacing the tool thread pool")
+        _thread_pool = None
+        pool.shutdown(wait=False)
+
+
+def _recycle_process_pool(pool: ProcessPoolExecutor, future: asyncio.Future) -> None:
+    """Kill pool if future's job is still running; the next process job starts a fresh pool."""
+    global _process_pool
+    if future.done():
+        return
+    print("[Tool Executor] Process job overran its timeout, replacing the tool process pool")
+    if _process_pool is pool:
+        _process_pool = None
+    # ProcessPoolExecutor has no public way to stop a running job
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _dispatch_tool(tool: BaseTool, arguments: dict) -> ToolResult:
+    """
+    Run tool.execute() according to its execution policy, in one of the
+    tool's max_concurrency slots, timing out after tool.timeout_seconds.
+
+    A worker thread cannot be stopped, so one that outlives its timeout (or
+    its caller) keeps the slot until it returns: a hung data source ties up
+    its own tool's slots, not an unbounded share of the thread pool. While
+    all of a tool's slots are held that way, calls to it fail immediately,
+    and the thread pool is replaced once overrunning jobs fill half of it
+    (see _track_overrun). A process job still running at its timeout has
+    its pool killed and replaced; other jobs lost with that pool are
+    resubmitted.
+    """
+    global _process_pool
+    semaphore = _tool_semaphore(tool)
+    if tool.execution == "async":
+        async with semaphore:
+            return await asyncio.wait_for(tool.execute(**arguments), timeout=tool.timeout_seconds)
+    if tool.execution not in ("thread", "process"):
+        raise ValueError(f"Unknown execution policy for {tool.name}: {tool.execution}")
+    if _overrunning[tool.name] >= tool.max_concurrency:
+        # Every slot is held by a hung worker; fail now rather than queue for the whole budget
+        raise RuntimeError(f"{_overrunning[tool.name]} earlier {tool.name} calls are still running; tool unavailable")
+
+    loop = asyncio.get_running_loop()
+    await semaphore.acquire()
+    deadline = loop.time() + tool.timeout_seconds
+    while True:
+        try:
+            pool = _worker_pool(tool.execution)
+            future = loop.run_in_executor(pool, _run_tool_to_completion, tool, arguments)
+        except BaseException:
+            semaphore.release()
+            raise
+        # The slot is freed when the worker is, not when the caller stops waiting
+        future.add_done_callback(lambda _: semaphore.release())
+        if tool.execution == "process":
+            # Armed on the loop so it also fires if the caller is cancelled first
+            loop.call_at(deadline, _recycle_process_pool, pool, future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=max(0.0, deadline - loop.time()))
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if tool.execution == "thread" and not future.done():
+                _track_overrun(tool, pool, future)
+            raise
+        except BrokenProcessPool:
+            recycled = pool is not _process_pool
+            if not recycled:
+                _process_pool = None  # A worker died on its own; start fresh next time
+            if not recycled or loop.time() >= deadline:
+                raise
+            print(f"[Tool Executor] {tool.name} lost its worker to a pool replacement, resubmitting")
+            await semaphore.acquire()
+
+
+def shutdown_tool_pools() -> None:
+    """Stop the tool worker pools (call once at the end of a run)."""
+    global _thread_pool, _process_pool
+    for pool in (_thread_pool, _process_pool):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    _thread_pool = _process_pool = None
+
+
+# Per-tool execution counters, so slow data sources show up in run logs
+_tool_stats: dict[str, dict] = {}
+
+
+def _record_tool_stat(name: str, seconds: float, timed_out: bool) -> None:
+    stats = _tool_stats.setdefault(name, {"calls": 0, "timeouts": 0, "total_seconds": 0.0})
+    stats["calls"] += 1
+    stats["timeouts"] += int(timed_out)
+    stats["total_seconds"] += seconds
+
+
+def get_tool_stats() -> dict:
+    """Calls, timeouts, total wall time and still-running overruns per tool name for this process."""
+    return {name: dict(stats, overrunning=_overrunning[name]) for name, stats in _tool_stats.items()}
+
+
+async def execute_tool(
+    tool: BaseTool,
+    arguments: dict,
+    budget: Optional[float] = None
+) -> ToolResult:
+    """
+    Execute a single tool with given arguments.
+
+    Results are served from the run-scoped tool cache where the tool allows it.
+    Blocking tools run in the tool thread/process pools (tool.execution).
+    Runs at most tool.max_concurrency executions at once (see _dispatch_tool
+    for workers that overrun) and gives up on the call after
+    tool.timeout_seconds, or after `budget` seconds (queueing included) if
+    that is sooner. A timeout returns a failed ToolResult with
+    metadata["timed_out"] set, so the model can carry on without it.
+    """
+    async def fetch() -> ToolResult:
         print(f"[Tool Executor] Executing {tool.name} with args: {arguments}")
-        result = await tool.execute(**arguments)
+        return await _dispatch_tool(tool, arguments)
+
+    async def run() -> ToolResult:
+        # Identical calls share one execution and reuse its result for the tool's TTL
+        return await cached_tool_call(tool, arguments, fetch)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        result = await asyncio.wait_for(run(), timeout=None if budget is None else max(0.0, budget))
+        _record_tool_stat(tool.name, loop.time() - start, timed_out=False)
         print(f"[Tool Executor] {tool.name} completed: success={result.success}")
         return result
+    except asyncio.TimeoutError:
+        elapsed = loop.time() - start
+        _record_tool_stat(tool.name, elapsed, timed_out=True)
+        print(f"[Tool Executor] {tool.name} timed out after {elapsed:.1f}s")
+        return ToolResult(
+            success=False,
+            data=None,
+            error=f"Timed out after {elapsed:.0f}s; continue without this data",
+            metadata={"timed_out": True, "elapsed_seconds": elapsed}
+        )
     except Exception as e:
+        _record_tool_stat(tool.name, loop.time() - start, timed_out=False)
         print(f"[Tool Executor] {tool.name} failed with error: {str(e)}")
         return ToolResult(
             success=False,
@@ -157,7 +404,10 @@ async def run_tool_calling_loop(
     temperature: float = RESEARCH_TEMP,
     max_iterations: int = 5,
     system_prompt: Optional[str] = None,
-    thinking: bool = False
+    thinking: bool = False,
+    sample_index: int = 0,
+    cache_prompt: bool = False,
+    iteration_budget: Optional[float] = TOOL_ITERATION_BUDGET
 ) -> tuple[str, list[dict], list[dict]]:
     """
     Run the complete tool calling loop until the model stops calling tools.
@@ -169,12 +419,14 @@ async def run_tool_calling_loop(
         temperature: Sampling temperature
         max_iterations: Max number of tool-calling rounds
         system_prompt: Optional system prompt
+        sample_index: Distinguishes repeated runs of the same prompt in the LLM cache
+        cache_prompt: Mark the system prompt and initial prompt as a cacheable prefix
+        iteration_budget: Seconds all tool calls of one turn may take (None = no limit)
     
     Returns:
         Tuple of (final_response_text, list_of_all_tool_results, list_of_all_messages)
     """
-    # Build tool registry and schemas
-    tool_registry = {t.name: t for t in tools}
+    # Build tool schemas
     tool_schemas = [t.to_openrouter_schema() for t in tools]
     
     # Initialize messages
@@ -194,7 +446,9 @@ async def run_tool_calling_loop(
             tools=tool_schemas,
             model=model,
             temperature=temperature,
-            thinking=thinking
+            thinking=thinking,
+            sample_index=sample_index,
+            cache_prompt=cache_prompt
         )
         
         # Parse tool calls
@@ -223,26 +477,19 @@ async def run_tool_calling_loop(
             ]
         })
         
-        # Execute each tool call
-        for tc in tool_calls:
-            tool = tool_registry.get(tc.name)
-            
-            if not tool:
-                result = ToolResult(
-                    success=False,
-                    data=None,
-                    error=f"Unknown tool: {tc.name}"
-                )
-            else:
-                result = await execute_tool(tool, tc.arguments)
-            
+        # Execute this turn's tool calls concurrently; results come back in
+        # call order so the message history stays deterministic
+        results = await execute_tools_parallel(tools, tool_calls, iteration_budget)
+        
+        for tc, result in zip(tool_calls, results):
             # Store result
             all_tool_results.append({
                 "tool_call_id": tc.id,
                 "tool_name": tc.name,
                 "arguments": tc.arguments,
                 "result": result.data if result.success else None,
-                "error": result.error
+                "error": result.error,
+                "timed_out": result.metadata.get("timed_out", False)
             })
             
             # Add tool result message
@@ -258,19 +505,22 @@ async def run_tool_calling_loop(
     return last_content, all_tool_results, messages
 
 
-# Convenience function for running tools in parallel
 async def execute_tools_parallel(
     tools: list[BaseTool],
-    tool_calls: list[ToolCall]
+    tool_calls: list[ToolCall],
+    budget: Optional[float] = None
 ) -> list[ToolResult]:
-    """Execute multiple tool calls in parallel."""
+    """
+    Execute multiple tool calls in parallel within an optional shared time
+    budget. Results are in tool_calls order.
+    """
     tool_registry = {t.name: t for t in tools}
     
     async def run_one(tc: ToolCall) -> ToolResult:
         tool = tool_registry.get(tc.name)
         if not tool:
             return ToolResult(success=False, data=None, error=f"Unknown tool: {tc.name}")
-        return await execute_tool(tool, tc.arguments)
+        return await execute_tool(tool, tc.arguments, budget)
     
     results = await asyncio.gather(*[run_one(tc) for tc in tool_calls])
     return list(results)
@@ -12,6 +12,7 @@ class GetParametricDistributionCDF(BaseTool):
     """
     
     name = "get_parametric_cdf"
+    execution = "async"
     description = (
         "Returns a smooth CDF (percentiles) for a distribution with the given Mean, "
         "Standard Deviation, and Skew. Use this to generate a baseline forecast."
@@ -80,23 +81,19 @@ class GetParametricDistributionCDF(BaseTool):
             
             # 2. Generate percentiles
             # We want p1, p5, p10...p99
-            percentiles = {}
             probs = [1, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 99]
-            
-            for p in probs:
-                q = p / 100.0
-                if alpha == 0:
-                    val = norm.ppf(q, loc=mean, scale=std)
-                else:
-                    val = skewnorm.ppf(q, alpha, loc=loc, scale=scale)
-                
-                # Clip if bounds provided
-                if lower_bound is not None:
-                    val = max(val, lower_bound)
-                if upper_bound is not None:
-                    val = min(val, upper_bound)
-                    
-                percentiles[f"p{p}"] = float(val)
+            if alpha == 0:
+                values = norm.ppf(np.array(probs) / 100.0, loc=mean, scale=std)
+            else:
+                values = skewnorm.ppf(np.array(probs) / 100.0, alpha, loc=loc, scale=scale)
+
+            # Clip if bounds provided
+            values = np.clip(
+                values,
+                lower_bound if lower_bound is not None else -np.inf,
+                upper_bound if upper_bound is not None else np.inf,
+            )
+            percentiles = {f"p{p}": float(val) for p, val in zip(probs, values)}
             
             data = {
                 "percentiles": percentiles,
@@ -108,6 +105,14 @@ class GetParametricDistributionCDF(BaseTool):
                     "fitted_scale": float(scale),
                     "fitted_alpha": float(alpha)
                 },
+                # Exact distribution behind the percentiles; forecasting evaluates
+                # its CDF directly when the final answer keeps these percentiles
+                "distribution": {
+                    "family": "skewnorm",
+                    "alpha": float(alpha),
+                    "loc": float(loc),
+                    "scale": float(scale),
+                },
                 "explanation": (
                     f"Generated {('Normal' if skew==0 else 'SkewNormal')} distribution "
                     f"with Mean={mean}, Std={std}. "
@@ -24,6 +24,7 @@ class DistributionGeneratorTool(MarketForecastTool):
     """
     
     name = "generate_distribution"
+    execution = "async"
     description = """
 Generate a probability distribution and return CDF percentiles.
 
@@ -28,6 +28,9 @@ class BondsForecastTool(MarketForecastTool):
     """
     
     name = "forecast_bonds"
+    timeout_seconds = 90.0  # Data fetch plus Monte Carlo simulation
+    cache_ttl_seconds = 1800.0
+    execution = "process"
     description = """
 Simulate 10Y Treasury Yield and/or High Yield OAS (Option-Adjusted Spread) distributions.
 Uses FRED historical data for calibration, options implied volatility from HYG ETF, 
@@ -16,6 +16,7 @@ class PolyMarketSearchTool(DataTool):
     """
     
     name = "search_polymarket"
+    cache_ttl_seconds = 600.0
     description = """
 Search PolyMarket for active events and markets matching specific terms.
 
@@ -25,6 +25,9 @@ class SpreadsForecastTool(MarketForecastTool):
     """
     
     name = "forecast_spread"
+    timeout_seconds = 90.0  # Data fetch plus Monte Carlo simulation
+    cache_ttl_seconds = 1800.0
+    execution = "process"
     description = """
 Simulate the return spread between two assets using correlated Geometric Brownian Motion.
 Uses implied volatility from options (for stocks) or historical volatility (for futures).
@@ -27,6 +27,9 @@ class VIXForecastTool(MarketForecastTool):
     """
     
     name = "forecast_vix_max"
+    timeout_seconds = 90.0  # Data fetch plus Monte Carlo simulation
+    cache_ttl_seconds = 1800.0
+    execution = "process"
     description = """
 Simulate the MAXIMUM intraday VIX reading over a time window.
 Uses Ornstein-Uhlenbeck + jump diffusion model with fat tails.
@@ -0,0 +1,96 @@
+"""
+Run-scoped cache for tool results.
+
+Concurrent questions in a sweep often make the same tool call, e.g.
+get_fred_data(DGS10) or forecast_vix_max. Results are cached in memory keyed
+on tool name plus normalized arguments for the tool's cache_ttl_seconds, and
+identical calls that are already in flight are coalesced onto one execution
+(singleflight). Only successful results are cached.
+"""
+import asyncio
+import dataclasses
+import json
+import time
+from typing import Awaitable, Callable, Optional
+
+from .base import BaseTool, ToolResult
+
+# key -> (expires_at, result)
+_results: dict[str, tuple[float, ToolResult]] = {}
+# key -> [task, number of callers waiting on it]; bound to one event loop
+_inflight: dict[str, list] = {}
+_inflight_loop: Optional[asyncio.AbstractEventLoop] = None
+_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+
+def make_tool_cache_key(tool_name: str, arguments: dict) -> str:
+    """Tool name plus arguments in a canonical form (sorted keys, trimmed strings)."""
+    def normalize(value):
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [normalize(v) for v in value]
+        return value
+    return tool_name + ":" + json.dumps(normalize(arguments), sort_keys=True, default=str)
+
+
+async def cached_tool_call(
+    tool: BaseTool,
+    arguments: dict,
+    fetch: Callable[[], Awaitable[ToolResult]],
+) -> ToolResult:
+    """Return a fresh cached result, join an identical in-flight call, or run fetch()."""
+    global _inflight_loop
+    if not tool.cache_ttl_seconds:
+        return await fetch()
+
+    key = make_tool_cache_key(tool.name, arguments)
+    cached = _results.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _stats["hits"] += 1
+        print(f"[Tool Cache] Hit for {tool.name}")
+        return dataclasses.replace(cached[1], metadata={**cached[1].metadata, "cached": True})
+
+    loop = asyncio.get_running_loop()
+    if _inflight_loop is not loop:
+        _inflight.clear()
+        _inflight_loop = loop
+
+    entry = _inflight.get(key)
+    if entry is None:
+        _stats["misses"] += 1
+        entry = [loop.create_task(_fetch_and_store(key, tool, fetch)), 0]
+        _inflight[key] = entry
+    else:
+        _stats["coalesced"] += 1
+        print(f"[Tool Cache] Joining in-flight {tool.name} call")
+
+    task = entry[0]
+    entry[1] += 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        entry[1] -= 1
+        # The last caller to give up (e.g. a timeout) cancels the shared call
+        if entry[1] == 0 and not task.done():
+            task.cancel()
+
+
+async def _fetch_and_store(key: str, tool: BaseTool, fetch: Callable[[], Awaitable[ToolResult]]) -> ToolResult:
+    try:
+        result = await fetch()
+        if result.success:
+            _results[key] = (time.monotonic() + tool.cache_ttl_seconds, result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+def get_tool_cache_stats() -> dict:
+    return dict(_stats, entries=len(_results))
+
+
+def clear_tool_cache() -> None:
+    _results.clear()
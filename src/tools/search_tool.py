@@ -19,6 +19,8 @@ class SearchTool(DataTool):
     """
     
     name = "search_web"
+    cache_ttl_seconds = 1800.0
+    execution = "async"  # Exa calls go through the shared async client
     description = """
 Search the web for news, articles, and context relevant to a forecasting question.
 
@@ -71,7 +73,7 @@ Returns search results with titles, URLs, and content snippets.
                 end_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
             
             # Execute search
-            results = exa_search_raw(
+            results = await exa_search_raw(
                 query, 
                 num_results=min(num_results, 20),
                 end_published_date=end_date
@@ -0,0 +1,189 @@
+"""
+Golden-output regression tests for CDF construction.
+
+tests/data/cdf_golden.json holds CDFs produced by the original loop-based,
+skew-normal-fitting generate_continuous_cdf for synthetic percentile sets (centered, skewed, near
+and beyond the bounds, very narrow, very wide) on the ranges of the numeric
+questions in backtesting/data/cache, with every open/closed bound combination,
+plus raw noisy/steep/out-of-range curves for the post-processing passes alone.
+The golden comparisons pin fit_method="skewnorm"; the metalog default is
+checked for validity and for passing close to the forecast percentiles.
+
+Run from the repo root:
+    python -m pytest -q tests/test_cdf_regression.py
+"""
+import asyncio
+import copy
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+import cdf_fitting  # noqa: E402
+from forecasting import (  # noqa: E402
+    adopted_parametric_distribution,
+    enforce_cdf_constraints,
+    extract_percentiles_from_response,
+    generate_cdf_locations,
+    generate_continuous_cdf,
+    generate_continuous_cdfs,
+)
+from question_grid import grid_for_question, question_grid  # noqa: E402
+from tools.forecast_tools import GetParametricDistributionCDF  # noqa: E402
+
+GOLDEN = json.loads((Path(__file__).parent / "data" / "cdf_golden.json").read_text())
+TOLERANCE = 1e-9
+
+
+def _case_id(case: dict) -> str:
+    return f"q{case['question_id']}-{case['shape']}-u{int(case['open_upper_bound'])}l{int(case['open_lower_bound'])}"
+
+
+def _build(case: dict, fit_method: str = "skewnorm") -> list[float]:
+    percentile_values = {int(k): v for k, v in case["percentile_values"].items()}
+    return generate_continuous_cdf(
+        copy.deepcopy(percentile_values),
+        case["question_type"],
+        case["open_upper_bound"],
+        case["open_lower_bound"],
+        case["upper_bound"],
+        case["lower_bound"],
+        case["zero_point"],
+        fit_method=fit_method,
+    )
+
+
+def _assert_metaculus_valid(cdf, open_upper_bound: bool, open_lower_bound: bool) -> None:
+    cdf = np.asarray(cdf)
+    steps = np.diff(cdf)
+    assert len(cdf) == 201
+    assert steps.min() >= 5e-05
+    assert steps.max() <= 0.2 + 1e-12
+    assert cdf[0] >= (0.001 if open_lower_bound else 0.0)
+    assert cdf[-1] <= (0.999 if open_upper_bound else 1.0)
+
+
+@pytest.mark.parametrize("case", GOLDEN["generate_continuous_cdf"], ids=_case_id)
+def test_generate_continuous_cdf_matches_golden(case):
+    cdf = _build(case)
+    assert isinstance(cdf, list)
+    np.testing.assert_allclose(cdf, case["cdf"], rtol=0, atol=TOLERANCE)
+    _assert_metaculus_valid(cdf, case["open_upper_bound"], case["open_lower_bound"])
+
+
+@pytest.mark.parametrize("case", GOLDEN["generate_continuous_cdf"], ids=_case_id)
+def test_linear_fallback_matches_golden(case, monkeypatch):
+    # Without scipy, both the distribution fit and PCHIP fall through to linear interpolation
+    for name in ("skewnorm", "minimize", "PchipInterpolator"):
+        monkeypatch.setattr(cdf_fitting, name, None)
+    cdf = _build(case)
+    np.testing.assert_allclose(cdf, case["cdf_linear"], rtol=0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize("case", GOLDEN["generate_continuous_cdf"], ids=_case_id)
+def test_metalog_cdf_is_valid_and_fits_percentiles(case):
+    cdf = _build(case, fit_method="metalog")
+    _assert_metaculus_valid(cdf, case["open_upper_bound"], case["open_lower_bound"])
+    if case["shape"] == "narrow":
+        return  # The 0.2 max step spreads a distribution this narrow whatever the fit
+
+    lower, upper = case["lower_bound"], case["upper_bound"]
+    xaxis = generate_cdf_locations(lower, upper, case["zero_point"])
+    for percentile, value in case["percentile_values"].items():
+        # Percentiles moved or squeezed by the bounds handling are not fit targets
+        if lower < value < upper and (upper - lower) * 0.05 < value - lower < (upper - lower) * 0.95:
+            assert abs(np.interp(value, xaxis, cdf) - int(percentile) / 100) < 0.05
+
+
+@pytest.mark.parametrize("fit_method", ["metalog", "skewnorm"])
+def test_batched_cdfs_match_single_calls(fit_method):
+    # Every shape for each question is one "ensemble" of percentile sets on a shared grid
+    by_question: dict = {}
+    for case in GOLDEN["generate_continuous_cdf"]:
+        key = (case["question_id"], case["open_upper_bound"], case["open_lower_bound"])
+        by_question.setdefault(key, []).append(case)
+    for group in list(by_question.values())[:8]:
+        first = group[0]
+        percentile_sets = [{int(k): v for k, v in case["percentile_values"].items()} for case in group]
+        cdfs = generate_continuous_cdfs(
+            copy.deepcopy(percentile_sets),
+            "numeric",
+            first["open_upper_bound"],
+            first["open_lower_bound"],
+            first["upper_bound"],
+            first["lower_bound"],
+            first["zero_point"],
+            fit_method=fit_method,
+        )
+        assert cdfs.shape == (len(group), 201)
+        for cdf, case in zip(cdfs, group):
+            np.testing.assert_allclose(cdf, _build(case, fit_method), rtol=0, atol=TOLERANCE)
+
+
+def test_enforce_cdf_constraints_rows_match_single_rows():
+    cases = GOLDEN["post_processing"][::4]  # one bound combination, open on both sides
+    batch = enforce_cdf_constraints([case["input"] for case in cases], True, True)
+    for row, case in zip(batch, cases):
+        np.testing.assert_allclose(row, enforce_cdf_constraints(case["input"], True, True), rtol=0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize(
+    "case",
+    GOLDEN["post_processing"],
+    ids=lambda c: f"{c['kind']}-u{int(c['open_upper_bound'])}l{int(c['open_lower_bound'])}",
+)
+def test_enforce_cdf_constraints_matches_golden(case):
+    cdf = enforce_cdf_constraints(case["input"], case["open_upper_bound"], case["open_lower_bound"])
+    np.testing.assert_allclose(cdf, case["output"], rtol=0, atol=TOLERANCE)
+
+
+def test_enforce_cdf_constraints_accepts_arrays():
+    cdf = enforce_cdf_constraints(np.linspace(-0.5, 1.5, 201), True, True)
+    _assert_metaculus_valid(cdf, True, True)
+
+
+def test_parametric_tool_distribution_is_used_exactly():
+    result = asyncio.run(GetParametricDistributionCDF().execute(mean=40.0, std=6.0, skew=2.0))
+    tool_calls = [{"tool_name": "get_parametric_cdf", "arguments": {}, "result": result.data, "error": None}]
+    answer = "\n".join(
+        f"Percentile {key[1:]}: {value:.2f}" for key, value in result.data["percentiles"].items()
+    )
+    percentile_values = extract_percentiles_from_response(answer)
+
+    distribution = adopted_parametric_distribution(percentile_values, tool_calls)
+    assert distribution == result.data["distribution"]
+    cdf = generate_continuous_cdfs(
+        [percentile_values], "numeric", True, True, 70.0, 10.0, None, distributions=[distribution]
+    )[0]
+    xaxis = generate_cdf_locations(10.0, 70.0, None)
+    expected = enforce_cdf_constraints(cdf_fitting.distribution_cdf(distribution, xaxis), True, True)
+    np.testing.assert_allclose(cdf, expected, rtol=0, atol=TOLERANCE)
+
+    # A forecaster that moved its percentiles away from the tool's gets the usual fit
+    shifted = {p: v + 3.0 for p, v in percentile_values.items()}
+    assert adopted_parametric_distribution(shifted, tool_calls) is None
+
+
+def test_question_grid_is_shared_and_matches_linear_indexing():
+    grid = question_grid(10.0, 70.0, None)
+    assert question_grid(10.0, 70.0, None) is grid
+    assert question_grid(10, 70) is grid
+    assert question_grid(range_min=10.0, range_max=70.0, zero_point=None) is grid
+    assert grid_for_question({"scaling": {"range_min": 10, "range_max": 70, "zero_point": None},
+                              "open_upper_bound": False, "open_lower_bound": True}) is grid
+    assert generate_cdf_locations(10.0, 70.0, None) is grid.locations
+    with pytest.raises(ValueError):
+        grid.locations[0] = 0.0
+    for value in np.linspace(0.0, 80.0, 161):
+        expected = min(200, max(0, int((value - 10.0) / 60.0 * 200)))
+        assert grid.index_of(value) == expected
+
+    log_grid = question_grid(1.0, 1000.0, 0.0)
+    np.testing.assert_allclose(log_grid.position_of(log_grid.locations), log_grid.positions, atol=1e-12)
+    assert log_grid.index_of(float(log_grid.locations[37]) + 1e-9) == 37
@@ -0,0 +1,85 @@
+"""
+Tests for resumable question checkpoints, including the completed tombstone
+that keeps a finished question from being resumed when the bot-data sync
+brings its old stage artifacts back.
+
+Run from the repo root:
+    python -m pytest -q tests/test_checkpoints.py
+"""
+import asyncio
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+import checkpoints  # noqa: E402
+from checkpoints import QuestionCheckpoint  # noqa: E402
+
+QUESTION = {"title": "Will it rain?", "type": "binary", "resolution_criteria": "Rain"}
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_ENABLED", True)
+    return tmp_path
+
+
+def test_completed_stages_are_resumed():
+    checkpoint = QuestionCheckpoint(1, QUESTION)
+    checkpoint.save("forecast", [0.4, "comment", {}])
+    calls = []
+
+    async def recompute():
+        calls.append(1)
+        return [0.9, "other", {}]
+
+    resumed = asyncio.run(QuestionCheckpoint(1, QUESTION).run("forecast", recompute))
+    assert resumed == [0.4, "comment", {}]
+    assert not calls
+    assert QuestionCheckpoint(1, QUESTION).has_pending_work()
+
+
+def test_restored_artifacts_after_completion_are_ignored(checkpoint_dir, tmp_path_factory):
+    checkpoint = QuestionCheckpoint(1, QUESTION)
+    checkpoint.save("forecast", [0.4, "comment", {}])
+    checkpoint.save("submit", True)
+    # What the bot-data branch still holds if the deletion is not synced
+    backup = tmp_path_factory.mktemp("bot-data")
+    shutil.copytree(checkpoint.path, backup, dirs_exist_ok=True)
+
+    checkpoint.complete()
+    assert not checkpoint.has_pending_work()
+    shutil.copytree(backup, checkpoint.path, dirs_exist_ok=True)
+
+    restored = QuestionCheckpoint(1, QUESTION)
+    assert restored.load("forecast") is None
+    assert not restored.has_pending_work()
+
+
+def test_work_after_completion_counts_again():
+    checkpoint = QuestionCheckpoint(1, QUESTION)
+    checkpoint.complete()
+    checkpoint.save("forecast", [0.6, "comment", {}])
+    assert checkpoint.load("forecast") == [0.6, "comment", {}]
+    assert checkpoint.has_pending_work()
+
+
+def test_edited_question_starts_over():
+    QuestionCheckpoint(1, QUESTION).save("forecast", [0.4, "comment", {}])
+    edited = QuestionCheckpoint(1, {**QUESTION, "resolution_criteria": "Heavy rain"})
+    assert not edited.has_pending_work()
+
+
+def test_prune_removes_stale_versions(monkeypatch):
+    checkpoint = QuestionCheckpoint(1, QUESTION)
+    checkpoint.complete()
+    assert checkpoints.prune_checkpoints() == 0
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_MAX_AGE_HOURS", -1)
+    assert checkpoints.prune_checkpoints() == 1
+    assert not checkpoint.path.parent.exists()
@@ -0,0 +1,165 @@
+"""
+Tests for LLM deadlines, hedging and the fallback cascade, run against a
+local LLMScheduler so admission and queueing are real.
+
+Run from the repo root:
+    python -m pytest -q tests/test_llm_hedging.py
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import openai
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+import llm_hedging  # noqa: E402
+from llm_scheduler import LLMScheduler  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(llm_hedging, "_latencies", llm_hedging.defaultdict(lambda: llm_hedging.deque(maxlen=200)))
+    monkeypatch.setattr(llm_hedging, "_metrics", llm_hedging.Counter())
+    monkeypatch.setattr(llm_hedging, "FALLBACK_MODELS", {"primary/model": ["fallback/model"]})
+    monkeypatch.setattr(llm_hedging, "LLM_CALL_DEADLINE", 0.2)
+    monkeypatch.setattr(llm_hedging, "HEDGE_MIN_DELAY", 0.05)
+    monkeypatch.setattr(llm_hedging, "HEDGE_MIN_SAMPLES", 3)
+
+
+def _scheduler(max_concurrency: int = 1) -> LLMScheduler:
+    return LLMScheduler({"default": {"rpm": 6000, "tpm": 10_000_000, "max_concurrency": max_concurrency}})
+
+
+def _status_error(cls, status: int) -> openai.APIStatusError:
+    response = httpx.Response(status, request=httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions"))
+    return cls("error", response=response, body=None)
+
+
+def test_deadline_starts_at_admission():
+    scheduler = _scheduler()
+    called = []
+
+    async def scenario() -> str:
+        budget = scheduler.budget("openrouter", "primary/model")
+        await budget.acquire(1, (0, 0))  # another call holds the only slot for longer than the deadline
+        asyncio.get_running_loop().call_later(0.4, budget.release)
+
+        async def call_for_model(model: str) -> str:
+            called.append(model)
+
+            async def request() -> str:
+                await asyncio.sleep(0.05)
+                return model
+            return await scheduler.run(request, "openrouter", model, 1, priority=(0, 0))
+
+        return await llm_hedging.with_fallbacks(call_for_model, "primary/model")
+
+    assert asyncio.run(scenario()) == "primary/model"
+    assert called == ["primary/model"]
+
+
+def test_slow_admitted_request_falls_back():
+    scheduler = _scheduler()
+
+    async def call_for_model(model: str) -> str:
+        async def request() -> str:
+            await asyncio.sleep(1.0 if model == "primary/model" else 0.0)
+            return model
+        return await scheduler.run(request, "openrouter", model, 1, priority=(0, 0))
+
+    assert asyncio.run(llm_hedging.with_fallbacks(call_for_model, "primary/model")) == "fallback/model"
+    assert llm_hedging._metrics["failed:primary/model:timeout"] == 1
+
+
+@pytest.mark.parametrize(
+    "error, falls_back",
+    [
+        (_status_error(openai.BadRequestError, 400), False),
+        (_status_error(openai.NotFoundError, 404), False),
+        (_status_error(openai.RateLimitError, 429), True),
+        (_status_error(openai.InternalServerError, 502), True),
+    ],
+)
+def test_only_transient_errors_fall_back(error, falls_back):
+    called = []
+
+    async def call_for_model(model: str) -> str:
+        called.append(model)
+        if model == "primary/model":
+            raise error
+        return model
+
+    if falls_back:
+        assert asyncio.run(llm_hedging.with_fallbacks(call_for_model, "primary/model")) == "fallback/model"
+        assert called == ["primary/model", "fallback/model"]
+    else:
+        with pytest.raises(type(error)):
+            asyncio.run(llm_hedging.with_fallbacks(call_for_model, "primary/model"))
+        assert called == ["primary/model"]
+
+
+def test_latency_excludes_queueing_and_is_keyed_by_n():
+    scheduler = _scheduler()
+
+    async def scenario() -> None:
+        budget = scheduler.budget("openrouter", "primary/model")
+        await budget.acquire(1, (0, 0))
+        asyncio.get_running_loop().call_later(0.3, budget.release)
+
+        async def request() -> str:
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        await llm_hedging.hedged(
+            lambda: scheduler.run(request, "openrouter", "primary/model", 1, priority=(0, 0)),
+            "primary/model",
+            n=4,
+        )
+
+    asyncio.run(scenario())
+    [latency] = llm_hedging._latencies[("primary/model", 4)]
+    assert 0.02 <= latency < 0.2
+    assert not llm_hedging._latencies[("primary/model", 1)]
+    llm_hedging._latencies[("primary/model", 4)].extend([0.01] * 10)
+    assert llm_hedging.hedge_delay("primary/model", n=4) is None  # multi-sample calls are never hedged
+
+
+def test_hedge_fires_after_admission_and_wins():
+    scheduler = _scheduler(max_concurrency=2)
+    llm_hedging._latencies[("primary/model", 1)].extend([0.01] * 5)
+    sleeps = iter([1.0, 0.0])
+
+    async def request() -> str:
+        seconds = next(sleeps)
+        await asyncio.sleep(seconds)
+        return "slow" if seconds else "fast"
+
+    result = asyncio.run(llm_hedging.hedged(
+        lambda: scheduler.run(request, "openrouter", "primary/model", 1, priority=(0, 0)),
+        "primary/model",
+    ))
+    assert result == "fast"
+    assert llm_hedging._metrics["hedges_sent"] == 1
+    assert llm_hedging._metrics["won:hedge"] == 1
+
+
+def test_no_hedge_while_budget_is_congested():
+    scheduler = _scheduler(max_concurrency=1)
+    llm_hedging._latencies[("primary/model", 1)].extend([0.01] * 5)
+
+    async def request() -> str:
+        await asyncio.sleep(0.2)
+        return "slow"
+
+    result = asyncio.run(llm_hedging.hedged(
+        lambda: scheduler.run(request, "openrouter", "primary/model", 1, priority=(0, 0)),
+        "primary/model",
+    ))
+    assert result == "slow"
+    assert llm_hedging._metrics["hedges_sent"] == 0
+    assert llm_hedging._metrics["hedges_skipped:congested"] == 1
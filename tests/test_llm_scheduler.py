@@ -0,0 +1,191 @@
+"""
+Tests for the per-model LLM scheduler: token-bucket refill, priority
+admission and 429 / Retry-After handling.
+
+Run from the repo root:
+    python -m pytest -q tests/test_llm_scheduler.py
+"""
+import asyncio
+import os
+import sys
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+import httpx
+import openai
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+import llm_scheduler  # noqa: E402
+from llm_scheduler import LLMScheduler, ModelBudget, TokenBucket  # noqa: E402
+
+LIMITS = {"default": {"rpm": 6000, "tpm": 10_000_000, "max_concurrency": 1}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_scheduler.time, "monotonic", clock)
+    return clock
+
+
+def _rate_limit_error(retry_after: str) -> openai.RateLimitError:
+    response = httpx.Response(
+        429,
+        headers={"retry-after": retry_after},
+        request=httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions"),
+    )
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def test_token_bucket_refills_over_one_minute(clock):
+    bucket = TokenBucket(60)
+    assert bucket.delay_for(60, 1.0) == 0.0
+    bucket.consume(60)
+    assert bucket.delay_for(1, 1.0) == pytest.approx(1.0)
+
+    clock.now += 30
+    assert bucket.delay_for(30, 1.0) == 0.0
+    assert bucket.delay_for(31, 1.0) == pytest.approx(1.0)
+
+    # At half rate the same shortfall takes twice as long
+    assert bucket.delay_for(31, 0.5) == pytest.approx(2.0)
+
+    clock.now += 3600
+    bucket.delay_for(1, 1.0)
+    assert bucket.tokens == 60  # never above capacity
+
+
+def test_token_bucket_oversized_request_waits_for_full_bucket(clock):
+    bucket = TokenBucket(100)
+    bucket.consume(50)
+    assert bucket.delay_for(500, 1.0) == pytest.approx(30.0)
+    clock.now += 30
+    assert bucket.delay_for(500, 1.0) == 0.0
+
+
+def test_waiters_are_admitted_in_priority_order():
+    async def scenario() -> list[str]:
+        budget = ModelBudget("test/model", rpm=6000, tpm=10_000_000, max_concurrency=1)
+        await budget.acquire(1, (0, 0))  # hold the only slot while the others queue
+        admitted = []
+
+        async def waiter(name: str, priority: tuple) -> None:
+            await budget.acquire(1, priority)
+            admitted.append(name)
+            budget.release()
+
+        tasks = [
+            asyncio.create_task(waiter("filter", (3, 0))),
+            asyncio.create_task(waiter("forecast-q2", (0, 2))),
+            asyncio.create_task(waiter("tool_loop", (2, 0))),
+            asyncio.create_task(waiter("forecast-q1", (0, 1))),
+        ]
+        await asyncio.sleep(0)
+        budget.release()
+        await asyncio.gather(*tasks)
+        return admitted
+
+    assert asyncio.run(scenario()) == ["forecast-q1", "forecast-q2", "tool_loop", "filter"]
+
+
+def test_cancelled_waiter_does_not_block_the_queue():
+    async def scenario() -> list[str]:
+        budget = ModelBudget("test/model", rpm=6000, tpm=10_000_000, max_concurrency=1)
+        await budget.acquire(1, (0, 0))
+        admitted = []
+
+        async def waiter(name: str, priority: tuple) -> None:
+            await budget.acquire(1, priority)
+            admitted.append(name)
+            budget.release()
+
+        first = asyncio.create_task(waiter("first", (0, 1)))
+        second = asyncio.create_task(waiter("second", (1, 1)))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        budget.release()
+        await asyncio.wait_for(second, timeout=1.0)
+        return admitted
+
+    assert asyncio.run(scenario()) == ["second"]
+
+
+def test_run_retries_429_after_retry_after_and_slows_the_model():
+    scheduler = LLMScheduler(LIMITS)
+    calls = []
+
+    async def request() -> str:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise _rate_limit_error("0.2")
+        return "ok"
+
+    async def scenario() -> str:
+        return await scheduler.run(request, "openrouter", "test/model", 10, priority=(0, 0))
+
+    assert asyncio.run(scenario()) == "ok"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+    budget = scheduler.budget("openrouter", "test/model")
+    assert budget.rate_scale == pytest.approx(0.55)  # halved by the 429, then one success
+    assert budget.in_flight == 0
+
+
+def test_run_gives_up_after_max_retries():
+    scheduler = LLMScheduler(LIMITS)
+    calls = []
+
+    async def request() -> str:
+        calls.append(1)
+        raise _rate_limit_error("0")
+
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(scheduler.run(request, "openrouter", "test/model", 10, priority=(0, 0), max_retries=2))
+    assert len(calls) == 3
+    assert scheduler.budget("openrouter", "test/model").in_flight == 0
+
+
+def test_run_does_not_retry_other_errors():
+    scheduler = LLMScheduler(LIMITS)
+    calls = []
+
+    async def request() -> str:
+        calls.append(1)
+        raise ValueError("bad response")
+
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.run(request, "openrouter", "test/model", 10, priority=(0, 0)))
+    assert len(calls) == 1
+
+
+def test_retry_after_seconds_and_http_date():
+    assert llm_scheduler._retry_after_seconds(_rate_limit_error("7")) == 7.0
+    in_a_minute = formatdate(time.time() + 60, usegmt=True)
+    assert llm_scheduler._retry_after_seconds(_rate_limit_error(in_a_minute)) == pytest.approx(60, abs=2)
+    assert llm_scheduler._retry_after_seconds(_rate_limit_error("soon")) is None
+    assert llm_scheduler._retry_after_seconds(ValueError("no response")) is None
+
+
+def test_budgets_use_longest_matching_prefix():
+    scheduler = LLMScheduler({
+        "default": {"rpm": 60, "tpm": 1000, "max_concurrency": 5},
+        "openrouter": {"rpm": 100},
+        "openrouter/anthropic/": {"max_concurrency": 2},
+    })
+    budget = scheduler.budget("openrouter", "anthropic/claude")
+    assert budget.max_concurrency == 2
+    assert budget.requests.capacity == 60  # the longest prefix is merged over default only
+    assert scheduler.budget("openrouter", "anthropic/claude") is budget
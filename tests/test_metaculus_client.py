@@ -0,0 +1,97 @@
+"""
+Tests for the Metaculus client's retry policy: GETs retry any transient
+failure, POSTs only failures that cannot have reached the server twice.
+
+Run from the repo root:
+    python -m pytest -q tests/test_metaculus_client.py
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+import metaculus_client  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(metaculus_client, "METACULUS_RETRY_BASE_DELAY", 0.0)
+
+
+def _send(method: str, outcomes: list) -> tuple[list, object]:
+    """request() against a transport that plays outcomes (status, headers) or exceptions in order."""
+    sent = []
+
+    def handler(http_request: httpx.Request) -> httpx.Response:
+        outcome = outcomes[min(len(sent), len(outcomes) - 1)]
+        sent.append(http_request)
+        if isinstance(outcome, Exception):
+            raise outcome
+        status, headers = outcome
+        return httpx.Response(status, headers=headers, json={})
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        metaculus_client._clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await metaculus_client.request(method, "/questions/forecast/", max_retries=3)
+        except Exception as e:
+            return e
+        finally:
+            await metaculus_client.close_metaculus_client()
+
+    return sent, asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "outcomes",
+    [
+        [(502, {}), (200, {})],
+        [(429, {}), (200, {})],
+        [httpx.ReadTimeout("read timed out"), (200, {})],
+        [httpx.ConnectError("refused"), (200, {})],
+    ],
+)
+def test_get_retries_any_transient_failure(outcomes):
+    sent, response = _send("GET", outcomes)
+    assert len(sent) == 2
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "outcomes",
+    [
+        [(429, {"retry-after": "0"}), (200, {})],
+        [httpx.ConnectError("refused"), (200, {})],
+        [httpx.ConnectTimeout("connect timed out"), (200, {})],
+    ],
+)
+def test_post_retries_failures_before_the_server_acted(outcomes):
+    sent, response = _send("POST", outcomes)
+    assert len(sent) == 2
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("status, headers", [(502, {}), (500, {}), (429, {})])
+def test_post_does_not_retry_responses_the_server_may_have_acted_on(status, headers):
+    sent, response = _send("POST", [(status, headers), (200, {})])
+    assert len(sent) == 1
+    assert response.status_code == status
+
+
+def test_post_does_not_retry_read_timeouts():
+    sent, error = _send("POST", [httpx.ReadTimeout("read timed out"), (200, {})])
+    assert len(sent) == 1
+    assert isinstance(error, httpx.ReadTimeout)
+
+
+def test_retries_stop_at_max_retries():
+    sent, response = _send("GET", [(503, {})])
+    assert len(sent) == 4
+    assert response.status_code == 503
@@ -0,0 +1,136 @@
+"""
+Tests for batched forecast submission and the comment queue, with
+metaculus_client.post_json replaced by a recorder.
+
+Run from the repo root:
+    python -m pytest -q tests/test_submission_queue.py
+"""
+import asyncio
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+import submission_queue  # noqa: E402
+from metaculus_client import MetaculusPostError  # noqa: E402
+from submission_queue import close_submission_queue, submit_comment, submit_forecast  # noqa: E402
+
+
+class FakeMetaculus:
+    """
+    Records each POST; rejects payloads containing a rejected question or any
+    comment if told to, and answers a flaky question's single post with one 503.
+    """
+
+    def __init__(self, rejected_questions=(), flaky_questions=(), reject_comments=False, hang=False):
+        self.posts = []
+        self.rejected_questions = set(rejected_questions)
+        self.flaky_questions = set(flaky_questions)
+        self.reject_comments = reject_comments
+        self.hang = hang
+
+    async def post_json(self, path, payload):
+        self.posts.append((path, payload))
+        if self.hang:
+            await asyncio.Event().wait()
+        if path == "/comments/create/" and self.reject_comments:
+            raise MetaculusPostError(503, "comment rejected")
+        if path == "/questions/forecast/" and any(f["question"] in self.rejected_questions for f in payload):
+            raise MetaculusPostError(400, "invalid forecast")
+        if path == "/questions/forecast/" and len(payload) == 1 and payload[0]["question"] in self.flaky_questions:
+            self.flaky_questions.discard(payload[0]["question"])
+            raise MetaculusPostError(503, "service unavailable")
+        return httpx.Response(201)
+
+    def forecast_posts(self):
+        return [payload for path, payload in self.posts if path == "/questions/forecast/"]
+
+
+@pytest.fixture
+def metaculus(monkeypatch):
+    def install(**kwargs) -> FakeMetaculus:
+        fake = FakeMetaculus(**kwargs)
+        monkeypatch.setattr(submission_queue, "post_json", fake.post_json)
+        return fake
+    monkeypatch.setattr(submission_queue, "SUBMIT_BATCH_DELAY", 0.05)
+    monkeypatch.setattr(submission_queue, "SUBMIT_RETRY_BASE_DELAY", 0.0)
+    monkeypatch.setattr(submission_queue, "_stats", Counter())
+    monkeypatch.setattr(submission_queue, "_failures", [])
+    return install
+
+
+async def _submit_all(question_ids):
+    results = await asyncio.gather(
+        *[submit_forecast(q, {"probability_yes": 0.5}) for q in question_ids], return_exceptions=True
+    )
+    await close_submission_queue(timeout=1.0)
+    return results
+
+
+def test_forecasts_are_posted_in_one_batch(metaculus):
+    fake = metaculus()
+    results = asyncio.run(_submit_all([1, 2, 3]))
+    assert results == [None, None, None]
+    assert [[f["question"] for f in payload] for payload in fake.forecast_posts()] == [[1, 2, 3]]
+    assert submission_queue.get_submission_stats()["batches"] == 1
+
+
+def test_rejected_batch_falls_back_to_single_posts(metaculus):
+    fake = metaculus(rejected_questions={2})
+    results = asyncio.run(_submit_all([1, 2, 3]))
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RuntimeError)
+    assert [[f["question"] for f in payload] for payload in fake.forecast_posts()] == [[1, 2, 3], [1], [2], [3]]
+    stats = submission_queue.get_submission_stats()
+    assert stats["batches_failed"] == 1
+    assert stats["forecasts_posted"] == 2 and stats["forecasts_failed"] == 1
+    assert stats["failures"][0]["target"] == "question 2"
+
+
+def test_single_forecast_is_retried_after_a_server_error(metaculus):
+    fake = metaculus(rejected_questions={2}, flaky_questions={3})
+    results = asyncio.run(_submit_all([1, 2, 3]))
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], MetaculusPostError)  # a 400 is not retried
+    posted = [[f["question"] for f in payload] for payload in fake.forecast_posts()]
+    assert posted[0] == [1, 2, 3]
+    assert sorted(posted[1:]) == [[1], [2], [3], [3]]
+    stats = submission_queue.get_submission_stats()
+    assert stats["forecast_retries"] == 1
+    assert stats["forecasts_posted"] == 2 and stats["forecasts_failed"] == 1
+
+
+def test_failed_comment_is_posted_once_and_raises(metaculus):
+    fake = metaculus(reject_comments=True)
+
+    async def scenario():
+        try:
+            await submit_comment(10, "rationale")
+        finally:
+            await close_submission_queue(timeout=1.0)
+
+    with pytest.raises(RuntimeError, match="comment rejected"):
+        asyncio.run(scenario())
+    assert len(fake.posts) == 1  # comments are never retried, not even on a 503
+
+
+def test_closing_the_queue_settles_pending_futures(metaculus, monkeypatch):
+    monkeypatch.setattr(submission_queue, "COMMENT_MAX_CONCURRENCY", 1)
+    metaculus(hang=True)
+
+    async def scenario():
+        comments = [asyncio.ensure_future(submit_comment(post_id, "text")) for post_id in (1, 2)]
+        forecast = asyncio.ensure_future(submit_forecast(3, {"probability_yes": 0.5}))
+        await asyncio.sleep(0.1)
+        await close_submission_queue(timeout=0.1)
+        return await asyncio.wait_for(asyncio.gather(*comments, forecast, return_exceptions=True), timeout=1.0)
+
+    results = asyncio.run(scenario())
+    # One comment and the forecast were mid-post, the other comment still queued
+    assert all(isinstance(r, RuntimeError) and "closed" in str(r) for r in results)
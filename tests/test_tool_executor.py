@@ -0,0 +1,123 @@
+"""
+Tests for tool timeouts under the thread and process execution policies:
+workers that overrun must not leak pool capacity.
+
+Run from the repo root:
+    python -m pytest -q tests/test_tool_executor.py
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+from tools import executor  # noqa: E402
+from tools.base import BaseTool, ToolResult  # noqa: E402
+
+
+class SleepTool(BaseTool):
+    """Blocks its worker for `seconds` (a stand-in for a hung data source)."""
+
+    name = "sleep"
+    description = "Sleep"
+    parameters = {"type": "object", "properties": {"seconds": {"type": "number"}}}
+    max_concurrency = 1
+    timeout_seconds = 0.2
+
+    def __init__(self, execution: str = "thread"):
+        self.execution = execution
+
+    async def execute(self, seconds: float) -> ToolResult:
+        time.sleep(seconds)
+        return ToolResult(success=True, data={"slept": seconds, "pid": os.getpid()})
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    executor.shutdown_tool_pools()
+    yield
+    executor.shutdown_tool_pools()
+
+
+def test_overrunning_thread_keeps_its_slot_until_it_returns():
+    tool = SleepTool("thread")
+
+    async def scenario():
+        hung = await executor.execute_tool(tool, {"seconds": 0.6})
+        refused = await executor.execute_tool(tool, {"seconds": 0.0})
+        await asyncio.sleep(0.6)
+        recovered = await executor.execute_tool(tool, {"seconds": 0.0})
+        return hung, refused, recovered
+
+    hung, refused, recovered = asyncio.run(scenario())
+    assert hung.metadata.get("timed_out")
+    # The only slot is still held by the hung worker, so the call fails fast
+    assert not refused.success and "still running" in refused.error
+    assert recovered.success
+    assert executor._overrunning["sleep"] == 0
+
+
+def test_cancelled_caller_does_not_free_a_busy_slot():
+    tool = SleepTool("thread")
+
+    async def scenario():
+        await executor.execute_tool(tool, {"seconds": 0.5}, budget=0.05)
+        return await executor.execute_tool(tool, {"seconds": 0.0})
+
+    refused = asyncio.run(scenario())
+    assert not refused.success and "still running" in refused.error
+
+
+def test_thread_pool_is_replaced_once_overruns_fill_half_of_it(monkeypatch):
+    monkeypatch.setattr(executor, "TOOL_THREAD_POOL_SIZE", 2)
+    tool = SleepTool("thread")
+
+    async def scenario():
+        await executor.execute_tool(tool, {"seconds": 0.0})
+        first_pool = executor._thread_pool
+        hung = await executor.execute_tool(tool, {"seconds": 0.5})
+        return first_pool, hung
+
+    first_pool, hung = asyncio.run(scenario())
+    assert hung.metadata.get("timed_out")
+    assert first_pool is not None and executor._thread_pool is None
+
+
+def test_overrunning_process_job_replaces_the_pool():
+    tool = SleepTool("process")
+
+    async def scenario():
+        hung = await executor.execute_tool(tool, {"seconds": 30.0})
+        hung_pool = executor._process_pool
+        quick = await asyncio.wait_for(executor.execute_tool(tool, {"seconds": 0.0}), timeout=10)
+        return hung, hung_pool, quick
+
+    hung, hung_pool, quick = asyncio.run(scenario())
+    assert hung.metadata.get("timed_out")
+    assert hung_pool is None  # the pool was killed at the timeout
+    assert quick.success
+
+
+class PatientSleepTool(SleepTool):
+    name = "patient_sleep"
+    timeout_seconds = 10.0
+
+
+def test_jobs_lost_with_a_replaced_pool_are_resubmitted():
+    hanging, patient = SleepTool("process"), PatientSleepTool("process")
+
+    async def scenario():
+        hung = asyncio.ensure_future(executor.execute_tool(hanging, {"seconds": 30.0}))
+        await asyncio.sleep(0.1)
+        # Still running when the hung job's pool is killed at 0.2s
+        survivor = await executor.execute_tool(patient, {"seconds": 0.5})
+        return await hung, survivor
+
+    hung, survivor = asyncio.run(scenario())
+    assert hung.metadata.get("timed_out")
+    assert survivor.success
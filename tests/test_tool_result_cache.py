@@ -0,0 +1,160 @@
+"""
+Tests for the run-scoped tool result cache: TTLs, singleflight and what
+happens when callers give up.
+
+Run from the repo root:
+    python -m pytest -q tests/test_tool_result_cache.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tools import result_cache  # noqa: E402
+from tools.base import BaseTool, ToolResult  # noqa: E402
+from tools.result_cache import cached_tool_call, make_tool_cache_key  # noqa: E402
+
+
+class CachedTool(BaseTool):
+    name = "fred"
+    description = "FRED series"
+    parameters = {"type": "object", "properties": {}}
+    cache_ttl_seconds = 60.0
+
+    async def execute(self, **kwargs) -> ToolResult:
+        raise NotImplementedError
+
+
+class Fetcher:
+    """fetch() stand-in that blocks until released and counts its runs."""
+
+    def __init__(self, result: ToolResult = None):
+        self.result = result or ToolResult(success=True, data={"value": 4.2})
+        self.calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> ToolResult:
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.result
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    result_cache.clear_tool_cache()
+    monkeypatch.setattr(result_cache, "_stats", {"hits": 0, "misses": 0, "coalesced": 0})
+    yield
+    result_cache.clear_tool_cache()
+
+
+def test_identical_calls_share_one_execution():
+    tool = CachedTool()
+
+    async def scenario():
+        fetch = Fetcher()
+        calls = [asyncio.ensure_future(cached_tool_call(tool, {"series": "DGS10"}, fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        fetch.release.set()
+        results = await asyncio.gather(*calls)
+        again = await cached_tool_call(tool, {"series": " DGS10 "}, fetch)
+        return fetch, results, again
+
+    fetch, results, again = asyncio.run(scenario())
+    assert fetch.calls == 1
+    assert all(r.data == {"value": 4.2} for r in results)
+    assert again.metadata.get("cached") is True
+    assert result_cache.get_tool_cache_stats() == {"hits": 1, "misses": 1, "coalesced": 2, "entries": 1}
+
+
+def test_cancelling_one_waiter_leaves_the_shared_call_running():
+    tool = CachedTool()
+
+    async def scenario():
+        fetch = Fetcher()
+        first = asyncio.ensure_future(cached_tool_call(tool, {"series": "DGS10"}, fetch))
+        second = asyncio.ensure_future(cached_tool_call(tool, {"series": "DGS10"}, fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        fetch.release.set()
+        return fetch, first, await second
+
+    fetch, first, result = asyncio.run(scenario())
+    assert first.cancelled()
+    assert fetch.calls == 1 and fetch.cancelled == 0
+    assert result.success
+
+
+def test_last_waiter_giving_up_cancels_the_shared_call():
+    tool = CachedTool()
+
+    async def scenario():
+        fetch = Fetcher()
+        calls = [asyncio.ensure_future(cached_tool_call(tool, {"series": "DGS10"}, fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for call in calls:
+            call.cancel()
+        await asyncio.gather(*calls, return_exceptions=True)
+        await asyncio.sleep(0)
+        return fetch
+
+    fetch = asyncio.run(scenario())
+    assert fetch.cancelled == 1
+    assert not result_cache._inflight
+    assert not result_cache._results
+
+
+def test_failures_are_not_cached():
+    tool = CachedTool()
+
+    async def scenario():
+        failing = Fetcher(ToolResult(success=False, data=None, error="FRED down"))
+        failing.release.set()
+        first = await cached_tool_call(tool, {"series": "DGS10"}, failing)
+        second = await cached_tool_call(tool, {"series": "DGS10"}, failing)
+        return failing, first, second
+
+    failing, first, second = asyncio.run(scenario())
+    assert not first.success and not second.success
+    assert failing.calls == 2
+
+
+def test_expired_results_are_fetched_again():
+    tool = CachedTool()
+    tool.cache_ttl_seconds = 0.05
+
+    async def scenario():
+        fetch = Fetcher()
+        fetch.release.set()
+        await cached_tool_call(tool, {"series": "DGS10"}, fetch)
+        await asyncio.sleep(0.1)
+        await cached_tool_call(tool, {"series": "DGS10"}, fetch)
+        return fetch
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_uncached_tools_always_run():
+    tool = CachedTool()
+    tool.cache_ttl_seconds = 0.0
+
+    async def scenario():
+        fetch = Fetcher()
+        fetch.release.set()
+        await asyncio.gather(*[cached_tool_call(tool, {"series": "DGS10"}, fetch) for _ in range(2)])
+        return fetch
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_cache_key_normalizes_arguments():
+    assert make_tool_cache_key("fred", {"b": 1, "a": " x "}) == make_tool_cache_key("fred", {"a": "x", "b": 1})
+    assert make_tool_cache_key("fred", {"a": "x"}) != make_tool_cache_key("crawl", {"a": "x"})